@@ -0,0 +1,125 @@
+"""
+Import-time budget check
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each checked module and fails if the cumulative import time exceeds its
+budget or if a heavy dependency was imported eagerly.
+
+Usage:
+    python benchmarks/check_import_time.py [--scale 2.0]
+
+tests/test_import_time.py runs the same check under pytest; set
+IMPORT_TIME_SCALE there to loosen the budgets on slow machines.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module -> cumulative import budget in milliseconds
+BUDGETS_MS = {
+    'src': 50,
+    'src.grammar_scorer': 400,
+    'src.text_processor': 400,
+    'src.pipeline': 450,
+    'src.server': 450,
+    'inference': 450,
+}
+
+# Heavy dependencies that must only load when a feature is used
+FORBIDDEN_MODULES = (
+    'librosa',
+    'matplotlib',
+    'nltk',
+    'pandas',
+    'pyarrow',
+    'torch',
+    'whisper',
+)
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_import(module: str, repeats: int = 3) -> Tuple[float, List[str]]:
+    """
+    Measure the cold import time of a module
+
+    Args:
+        module: Dotted module name
+        repeats: Fresh interpreters to run; the fastest run is reported
+
+    Returns:
+        Tuple of (cumulative import time in ms, modules imported)
+    """
+    best_ms = None
+    imported: List[str] = []
+    for _ in range(repeats):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+        cumulative_us = None
+        names = []
+        for line in proc.stderr.splitlines():
+            match = _IMPORTTIME_LINE.match(line)
+            if match is None:
+                continue
+            names.append(match.group(4))
+            if match.group(4) == module and not match.group(3).strip(' '):
+                cumulative_us = int(match.group(2))
+        if cumulative_us is None:
+            raise RuntimeError(f"No importtime entry for {module}")
+        if best_ms is None or cumulative_us / 1000 < best_ms:
+            best_ms = cumulative_us / 1000
+            imported = names
+    return best_ms, imported
+
+
+def check(budgets: Dict[str, float], scale: float = 1.0) -> List[str]:
+    """
+    Check every module against its budget
+
+    Args:
+        budgets: Module -> budget in ms
+        scale: Multiplier applied to every budget (for slow machines)
+
+    Returns:
+        List of failure messages (empty if all checks pass)
+    """
+    failures = []
+    for module, budget_ms in budgets.items():
+        budget_ms *= scale
+        elapsed_ms, imported = measure_import(module)
+        heavy = sorted({name for name in imported
+                        if name.split('.')[0] in FORBIDDEN_MODULES})
+        status = 'ok' if elapsed_ms <= budget_ms and not heavy else 'FAIL'
+        print(f"{module:<24}{elapsed_ms:>10.1f} ms  (budget {budget_ms:.0f} ms)  {status}")
+
+        if elapsed_ms > budget_ms:
+            failures.append(f"import {module} took {elapsed_ms:.1f} ms "
+                            f"(budget {budget_ms:.0f} ms)")
+        if heavy:
+            roots = sorted({name.split('.')[0] for name in heavy})
+            failures.append(f"import {module} eagerly loads {', '.join(roots)}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check the import-time budget')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply every budget by this factor')
+    args = parser.parse_args()
+
+    failures = check(BUDGETS_MS, args.scale)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
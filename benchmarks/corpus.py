@@ -0,0 +1,134 @@
+"""
+Synthetic benchmark corpus
+
+Deterministic speech-like clips (voiced harmonic syllables, fricative
+noise bursts and silent pauses) with canned transcripts, so benchmarks
+run offline and produce the same inputs on every machine.
+"""
+
+import os
+from typing import Dict, List
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Clip lengths in seconds; the short clip matches typical scoring inputs
+CLIP_SECONDS = (10, 30, 120)
+
+# Canned transcripts with a mix of correct and ungrammatical sentences
+TRANSCRIPT_SENTENCES = (
+    "I went to the store yesterday because we needed some bread.",
+    "He go to school every day and they is always late.",
+    "The weather was nice, so we decided to walk to the park.",
+    "She have a apple and an banana in her bag.",
+    "When I was young, I will play football with my friends.",
+    "Although it was raining, the team finished the match on time.",
+    "They was happy when the results were announced.",
+    "My brother and I are planning a trip to the mountains next month.",
+    "If you study hard, you will pass the exam.",
+    "He don't like coffee but he drinks tea in the morning.",
+)
+
+# Roughly conversational speaking rate used to size transcripts
+WORDS_PER_SECOND = 2.3
+
+
+def speech_like_clip(seconds: float, seed: int, sr: int = SAMPLE_RATE,
+                     broadband: bool = False) -> np.ndarray:
+    """
+    Generate a deterministic speech-like signal
+
+    Args:
+        seconds: Clip length
+        seed: Random seed
+        sr: Sample rate
+        broadband: Use steady noise bursts only (both pause detectors
+                   agree on these); otherwise voiced harmonic syllables
+                   with occasional fricatives
+
+    Returns:
+        Float32 signal in [-1, 1]
+    """
+    rng = np.random.default_rng(seed)
+    n_samples = int(seconds * sr)
+    audio = np.zeros(n_samples, dtype=np.float64)
+
+    position = int(0.2 * sr)
+    while position < n_samples:
+        # A phrase of a few syllables followed by a pause
+        phrase = int(rng.uniform(0.8, 2.5) * sr)
+        end = min(n_samples, position + phrase)
+        t = np.arange(end - position) / sr
+
+        if broadband:
+            audio[position:end] = rng.normal(0, 0.1, len(t))
+            position = end + int(rng.uniform(0.3, 1.0) * sr)
+            continue
+
+        f0 = rng.uniform(100, 200) * (1 + 0.03 * np.sin(2 * np.pi * 5 * t))
+        phase = 2 * np.pi * np.cumsum(f0) / sr
+        segment = sum(np.sin(k * phase) / k for k in range(1, 9))
+        fricative = np.zeros(len(t), dtype=bool)
+        if rng.random() < 0.3:
+            start = rng.integers(0, max(1, len(t) - sr // 10))
+            fricative[start:start + sr // 10] = True
+        segment = np.where(fricative, rng.normal(0, 0.4, len(t)), segment)
+
+        # About four syllables per second
+        envelope = np.clip(np.sin(2 * np.pi * 4 * t + rng.uniform(0, np.pi)), 0, 1) ** 0.5
+        audio[position:end] = 0.3 * segment * envelope
+        position = end + int(rng.uniform(0.3, 1.0) * sr)
+
+    audio += rng.normal(0, 1e-4, n_samples)
+    return np.clip(audio, -1, 1).astype(np.float32)
+
+
+def canned_transcript(seconds: float, seed: int) -> str:
+    """
+    Build a transcript sized for a clip
+
+    Args:
+        seconds: Clip length
+        seed: Random seed
+
+    Returns:
+        Transcript text
+    """
+    rng = np.random.default_rng(seed)
+    target_words = int(seconds * WORDS_PER_SECOND)
+    sentences = []
+    words = 0
+    while words < max(target_words, 1):
+        sentence = TRANSCRIPT_SENTENCES[rng.integers(len(TRANSCRIPT_SENTENCES))]
+        sentences.append(sentence)
+        words += len(sentence.split())
+    return ' '.join(sentences)
+
+
+def build_corpus(directory: str, clip_seconds=CLIP_SECONDS,
+                 sr: int = SAMPLE_RATE) -> List[Dict]:
+    """
+    Write the corpus WAV files
+
+    Args:
+        directory: Output directory
+        clip_seconds: Clip lengths to generate
+        sr: Sample rate
+
+    Returns:
+        List of {'path', 'seconds', 'transcript'} per clip
+    """
+    import soundfile as sf
+
+    os.makedirs(directory, exist_ok=True)
+    corpus = []
+    for seed, seconds in enumerate(clip_seconds):
+        path = os.path.join(directory, f'clip_{seconds:04d}s.wav')
+        sf.write(path, speech_like_clip(seconds, seed, sr), sr, subtype='PCM_16')
+        corpus.append({
+            'path': path,
+            'seconds': float(seconds),
+            'transcript': canned_transcript(seconds, seed),
+        })
+    return corpus
@@ -0,0 +1,281 @@
+"""
+Stage-level benchmark suite
+
+Times each scoring stage on the synthetic corpus, reports throughput and
+peak traced memory, and compares against a stored baseline. Runs offline
+on CPU: ASR is replaced by the corpus's canned transcripts.
+
+Usage:
+    python benchmarks/run_benchmarks.py                    # compare to baseline
+    python benchmarks/run_benchmarks.py --update-baseline  # record a new baseline
+    python benchmarks/run_benchmarks.py --quick            # short clips only
+
+Exits non-zero if any stage is slower or uses more memory than the
+baseline allows, or if a correctness check fails.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCHMARK_DIR)
+
+import numpy as np
+
+from corpus import CLIP_SECONDS, SAMPLE_RATE, build_corpus, speech_like_clip
+from check_import_time import BUDGETS_MS, check as check_import_time
+
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+# Allowed slowdown / memory growth relative to the baseline
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.25
+
+# Baseline entries below these are too small to compare reliably
+MIN_COMPARED_SECONDS = 0.005
+MIN_COMPARED_MB = 1.0
+
+
+def measure(func: Callable, repeats: int) -> Dict:
+    """
+    Time a call and trace its peak memory
+
+    Args:
+        func: Zero-argument callable
+        repeats: Timed runs (after one warm-up run)
+
+    Returns:
+        Dictionary with median/min seconds and peak traced MB
+    """
+    func()
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+
+    # Memory is traced in a separate run so tracing does not skew timings
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'seconds': statistics.median(times),
+        'min_seconds': min(times),
+        'peak_mb': peak / (1024 * 1024),
+    }
+
+
+def run_stages(corpus: List[Dict], repeats: int) -> Dict[str, Dict]:
+    """
+    Benchmark every stage on every clip
+
+    Args:
+        corpus: Output of build_corpus()
+        repeats: Timed runs per measurement
+
+    Returns:
+        Dictionary mapping '<stage>/<clip>' to its measurement
+    """
+    from src.config import CACHE_CONFIG
+    CACHE_CONFIG['transcript_cache'] = False
+
+    from src.audio_processor import AudioProcessor
+    from src.text_processor import TextProcessor
+    from src.grammar_scorer import GrammarScorer
+    from src.pipeline import ScoringPipeline
+
+    audio_processor = AudioProcessor(SAMPLE_RATE)
+    text_processor = TextProcessor(cache=None)
+    grammar_scorer = GrammarScorer()
+    transcripts = {item['path']: item['transcript'] for item in corpus}
+
+    class StubASRPipeline(ScoringPipeline):
+        """Pipeline whose ASR step returns the canned transcript"""
+
+        def transcribe(self, item):
+            item['transcript'] = transcripts[item['audio_path']]
+            return item
+
+    pipeline = StubASRPipeline(audio_processor, text_processor, grammar_scorer)
+    pipeline.logger.disabled = True
+
+    results = {}
+    for item in corpus:
+        clip = f"{int(item['seconds'])}s"
+        audio, sr = audio_processor.preprocess_audio(item['path'])
+        text_data = text_processor.preprocess_text(item['transcript'])
+        words = len(item['transcript'].split())
+
+        stages = {
+            'preprocess_audio': (lambda: audio_processor.preprocess_audio(item['path']),
+                                 item['seconds'], 'audio_s'),
+            'extract_features': (lambda: audio_processor.extract_all_features(audio, sr),
+                                 item['seconds'], 'audio_s'),
+            'pause_count_mel': (lambda: audio_processor.get_pause_count(audio, sr, detector='mel'),
+                                item['seconds'], 'audio_s'),
+            'pause_count_rms': (lambda: audio_processor.get_pause_count(audio, sr, detector='rms'),
+                                item['seconds'], 'audio_s'),
+            'preprocess_text': (lambda: text_processor.preprocess_text(item['transcript']),
+                                words, 'words'),
+            'score_grammar': (lambda: grammar_scorer.score_grammar(
+                                  item['transcript'], item['seconds'], 5,
+                                  text_data['pos_tags'],
+                                  document=text_data['transcript_document']),
+                              words, 'words'),
+            'end_to_end': (lambda: pipeline.score_file(item['path']),
+                           item['seconds'], 'audio_s'),
+        }
+
+        for stage, (func, units, unit_name) in stages.items():
+            measurement = measure(func, repeats)
+            measurement['throughput'] = units / measurement['seconds']
+            measurement['throughput_unit'] = f'{unit_name}/s'
+            results[f'{stage}/{clip}'] = measurement
+            print(f"{stage + '/' + clip:<28}{measurement['seconds'] * 1000:>10.2f} ms"
+                  f"{measurement['throughput']:>12.1f} {unit_name}/s"
+                  f"{measurement['peak_mb']:>10.1f} MB")
+    return results
+
+
+def check_pause_detectors(seconds: float = 30.0) -> Dict:
+    """
+    Check that the mel and RMS pause detectors agree on broadband bursts
+
+    Args:
+        seconds: Length of each check clip
+
+    Returns:
+        Dictionary with counts per clip and whether they all agree
+    """
+    from src.audio_processor import AudioProcessor
+
+    audio_processor = AudioProcessor(SAMPLE_RATE)
+    clips = []
+    for seed in range(3):
+        audio = speech_like_clip(seconds, 100 + seed, broadband=True)
+        clips.append({
+            'mel': int(audio_processor.get_pause_count(audio, SAMPLE_RATE, detector='mel')),
+            'rms': int(audio_processor.get_pause_count(audio, SAMPLE_RATE, detector='rms')),
+        })
+    agree = all(clip['mel'] == clip['rms'] for clip in clips)
+    print(f"pause detector agreement: {'ok' if agree else 'FAIL'} {clips}")
+    return {'clips': clips, 'ok': agree}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            time_tolerance: float, memory_tolerance: float) -> List[str]:
+    """
+    Compare measurements against a baseline
+
+    Args:
+        results: Current stage measurements
+        baseline: Stored stage measurements
+        time_tolerance: Allowed relative slowdown
+        memory_tolerance: Allowed relative memory growth
+
+    Returns:
+        List of regression messages
+    """
+    regressions = []
+    for name, expected in baseline.items():
+        actual = results.get(name)
+        if actual is None:
+            continue
+        if expected['seconds'] >= MIN_COMPARED_SECONDS:
+            limit = expected['seconds'] * (1 + time_tolerance)
+            if actual['seconds'] > limit:
+                regressions.append(
+                    f"{name}: {actual['seconds'] * 1000:.2f} ms vs baseline "
+                    f"{expected['seconds'] * 1000:.2f} ms (+{time_tolerance:.0%} allowed)"
+                )
+        if expected['peak_mb'] >= MIN_COMPARED_MB:
+            limit = expected['peak_mb'] * (1 + memory_tolerance)
+            if actual['peak_mb'] > limit:
+                regressions.append(
+                    f"{name}: {actual['peak_mb']:.1f} MB vs baseline "
+                    f"{expected['peak_mb']:.1f} MB (+{memory_tolerance:.0%} allowed)"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Run the stage benchmarks')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='Baseline JSON to compare against or update')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Write the results as the new baseline')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    parser.add_argument('--quick', action='store_true',
+                        help='Only benchmark the clips shorter than a minute')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per stage')
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE)
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument('--skip-import-check', action='store_true')
+    args = parser.parse_args()
+
+    failures = []
+
+    # Import cost is measured in fresh interpreters, before anything loads here
+    if not args.skip_import_check:
+        failures += check_import_time(BUDGETS_MS)
+
+    clip_seconds = [s for s in CLIP_SECONDS if not args.quick or s < 60]
+    with tempfile.TemporaryDirectory(prefix='bench_corpus_') as corpus_dir:
+        corpus = build_corpus(corpus_dir, clip_seconds)
+        results = run_stages(corpus, args.repeats)
+
+    pause_check = check_pause_detectors()
+    if not pause_check['ok']:
+        failures.append("mel and rms pause detectors disagree on broadband clips")
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+        },
+        'stages': results,
+        'checks': {'pause_detector_agreement': pause_check},
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures += compare(results, baseline['stages'],
+                            args.time_tolerance, args.memory_tolerance)
+    else:
+        print(f"No baseline at {args.baseline}; run with --update-baseline")
+
+    if failures:
+        print("\nREGRESSIONS:")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1
+    print("\nAll benchmarks within baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
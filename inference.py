@@ -5,87 +5,49 @@ Demonstrates how to use the engine on new audio files
 
 import sys
 import os
+import threading
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from audio_processor import AudioProcessor
-from text_processor import TextProcessor
-from grammar_scorer import GrammarScorer
-from utils import print_results_summary, save_results, setup_logging
+from pipeline import (
+    ScoringPipeline,
+    batch_pipeline,
+    resolve_workers,
+    score_files_parallel,
+    score_files_pipelined,
+)
+from config import RESULTS_CONFIG
+from result_model import ScoringResult
+from results_store import open_results_store
+from run_manifest import RunCheckpoint
+from utils import print_results_summary, setup_logging
 
 
-def score_audio_file(audio_path: str, output_dir: str = './results') -> dict:
+def score_audio_file(audio_path: str, output_dir: str = './results',
+                     pipeline: ScoringPipeline = None) -> ScoringResult:
     """
     Score a single audio file
     
     Args:
         audio_path: Path to audio file
         output_dir: Directory to save results
+        pipeline: Warm pipeline to reuse (default: build a new one)
         
     Returns:
-        Dictionary with scoring results
+        ScoringResult (reads like the result dictionary; to_dict() gives it)
     """
     logger = setup_logging()
     logger.info(f"Processing: {audio_path}")
     
     # Initialize components
-    audio_processor = AudioProcessor()
-    text_processor = TextProcessor()
-    grammar_scorer = GrammarScorer()
-    
-    # Step 1: Load and preprocess audio
-    logger.info("Step 1: Loading and preprocessing audio...")
-    audio, sr = audio_processor.preprocess_audio(audio_path)
-    if audio is None:
-        logger.error(f"Failed to load audio: {audio_path}")
-        return None
-    
-    # Get audio metrics
-    duration = audio_processor.get_duration(audio, sr)
-    pause_count = audio_processor.get_pause_count(audio, sr)
-    logger.info(f"Audio duration: {duration:.2f}s, Pauses detected: {pause_count}")
+    pipeline = pipeline or ScoringPipeline(logger=logger)
     
-    # Step 2: Speech to text
-    logger.info("Step 2: Converting speech to text...")
-    transcript = text_processor.speech_to_text(audio_path)
-    if not transcript:
-        logger.error("Failed to transcribe audio")
+    # Decode once, transcribe, score and save
+    result = pipeline.score_file(audio_path, output_dir)
+    if result is None:
         return None
-    logger.info(f"Transcript: {transcript}")
-    
-    # Step 3: Text preprocessing
-    logger.info("Step 3: Preprocessing text...")
-    text_data = text_processor.preprocess_text(transcript)
-    pos_tags = text_data['pos_tags']
-    
-    # Step 4: Grammar scoring
-    logger.info("Step 4: Scoring grammar...")
-    scoring_result = grammar_scorer.score_grammar(
-        transcript, 
-        duration, 
-        pause_count, 
-        pos_tags
-    )
-    
-    # Prepare final result
-    result = {
-        'audio_file': os.path.basename(audio_path),
-        'transcript': transcript,
-        'audio_duration': round(duration, 2),
-        'pauses_detected': pause_count,
-        'final_score': scoring_result['final_score'],
-        'components': scoring_result['components'],
-        'errors': scoring_result['errors'],
-        'statistics': scoring_result['statistics'],
-    }
-    
-    # Save results
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, 
-                               Path(audio_path).stem + '_results.json')
-    save_results(result, output_path, format='json')
     
     # Print summary
     print_results_summary(result)
@@ -93,16 +55,35 @@ def score_audio_file(audio_path: str, output_dir: str = './results') -> dict:
     return result
 
 
-def score_multiple_files(audio_dir: str, output_dir: str = './results') -> list:
+def score_multiple_files(audio_dir: str, output_dir: str = './results',
+                         workers: int = None, chunksize: int = None,
+                         pipelined: bool = False, resume: bool = False) -> list:
     """
     Score all audio files in a directory
     
+    Results are appended to the columnar store in output_dir (see
+    RESULTS_CONFIG); per-file JSON is written too unless disabled there.
+    Progress is checkpointed to a run manifest and an fsynced JSONL log in
+    output_dir (see RUN_CONFIG), so an interrupted run can be resumed.
+    The store buffers rows, so rows an interrupted run never published
+    are appended from the log when it resumes. Files with the same
+    content as an earlier file are scored once and logged as skipped.
+    Error positions are reported as BATCH_CONFIG['error_positions'] says.
+    
     Args:
         audio_dir: Directory containing audio files
         output_dir: Directory to save results
+        workers: Worker processes (None = BATCH_CONFIG, 0 = one per CPU,
+                 1 = score serially in this process)
+        chunksize: Files handed to a worker at a time (None = BATCH_CONFIG)
+        pipelined: Overlap decode, ASR and scoring in threads of this
+                   process (stage sizes come from PIPELINE_CONFIG)
+        resume: Skip files completed by an earlier run into output_dir
+                (False = rescore everything)
         
     Returns:
-        List of result dictionaries
+        List of ScoringResult of the files scored by this call, in
+        sorted file order (all results of the run are in the JSONL log)
     """
     logger = setup_logging()
     logger.info(f"Processing directory: {audio_dir}")
@@ -110,14 +91,76 @@ def score_multiple_files(audio_dir: str, output_dir: str = './results') -> list:
     results = []
     audio_files = list(Path(audio_dir).glob('*.wav'))
     audio_files += list(Path(audio_dir).glob('*.mp3'))
+    audio_files = sorted(str(f) for f in audio_files)
     
     logger.info(f"Found {len(audio_files)} audio files")
     
-    for i, audio_file in enumerate(audio_files, 1):
-        logger.info(f"Processing file {i}/{len(audio_files)}")
-        result = score_audio_file(str(audio_file), output_dir)
-        if result:
-            results.append(result)
+    store = open_results_store(output_dir, logger)
+    checkpoint = (RunCheckpoint(output_dir, resume=resume, store=store)
+                  if output_dir else None)
+    if checkpoint is not None:
+        pending = checkpoint.pending(audio_files)
+        for path, original in checkpoint.duplicates.items():
+            logger.warning(f"Skipping {path}: same content as {original}")
+        skipped = len(audio_files) - len(pending) - len(checkpoint.duplicates)
+        if skipped:
+            logger.info(f"Resuming: {skipped} files already scored, "
+                        f"{len(pending)} remaining")
+        audio_files = pending
+    
+    json_dir = output_dir if store is None or RESULTS_CONFIG['per_file_json'] else None
+    workers = resolve_workers(workers)
+    
+    # Results can arrive from several pipeline threads at once
+    record_lock = threading.Lock()
+    
+    def record(audio_path: str, result: dict) -> None:
+        # The checkpoint also appends the result to the store
+        with record_lock:
+            if checkpoint is not None:
+                checkpoint.record(audio_path, result)
+    
+    try:
+        if checkpoint is not None:
+            restored = checkpoint.restore_store()
+            if restored:
+                logger.info(f"Restored {restored} results missing from the store")
+        
+        if pipelined:
+            pipeline = batch_pipeline(logger)
+            pipeline.warm_up()
+            scored, staged = score_files_pipelined(audio_files, json_dir, pipeline,
+                                                   on_result=record)
+            logger.info("Stage statistics:\n" + staged.format_stats())
+            results = [result for result in scored if result]
+        
+        elif workers > 1 and len(audio_files) > 1:
+            # Each worker warms its own models once in the pool initializer
+            logger.info(f"Scoring with {workers} worker processes")
+            scored = score_files_parallel(audio_files, json_dir, workers, chunksize,
+                                          on_result=record)
+            results = [result for result in scored if result]
+        
+        else:
+            # Load the ASR model once up front so every file reuses it
+            pipeline = batch_pipeline(logger)
+            if audio_files:
+                pipeline.warm_up()
+            
+            for i, audio_file in enumerate(audio_files, 1):
+                logger.info(f"Processing file {i}/{len(audio_files)}")
+                result = score_audio_file(audio_file, json_dir, pipeline)
+                record(audio_file, result)
+                if result:
+                    results.append(result)
+        
+        if checkpoint is not None:
+            checkpoint.finish()
+    finally:
+        if store is not None:
+            store.close()
+        if checkpoint is not None:
+            checkpoint.close()
     
     return results
 
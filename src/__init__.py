@@ -2,30 +2,59 @@
 """
 Grammar Scoring Engine
 A complete AI-based system for analyzing grammatical quality of spoken English
+
+Public names are loaded lazily (PEP 562): `import src` is cheap, and
+librosa, NLTK, pandas and Whisper are imported only when a feature that
+needs them is first used.
 """
 
+import importlib
+
 __version__ = '1.0.0'
 __author__ = 'Your Name'
 __description__ = 'Grammar Scoring Engine from Voice Samples'
 
-from src.audio_processor import AudioProcessor
-from src.text_processor import TextProcessor
-from src.grammar_scorer import GrammarScorer
-from src.utils import (
-    setup_logging,
-    save_results,
-    load_results,
-    create_report,
-    print_results_summary
-)
-
-__all__ = [
-    'AudioProcessor',
-    'TextProcessor',
-    'GrammarScorer',
-    'setup_logging',
-    'save_results',
-    'load_results',
-    'create_report',
-    'print_results_summary',
-]
+# Public name -> submodule defining it
+_LAZY_ATTRS = {
+    'AudioProcessor': 'audio_processor',
+    'TextProcessor': 'text_processor',
+    'GrammarScorer': 'grammar_scorer',
+    'IncrementalGrammarScorer': 'grammar_scorer',
+    'register_rule': 'grammar_scorer',
+    'expand_error_positions': 'grammar_scorer',
+    'RuleEngine': 'rule_engine',
+    'ModelRegistry': 'model_registry',
+    'get_registry': 'model_registry',
+    'preload_models': 'model_registry',
+    'AsyncScorer': 'async_api',
+    'ascore_audio_file': 'async_api',
+    'ascore_many': 'async_api',
+    'StreamingSession': 'streaming',
+    'get_metrics': 'instrumentation',
+    'ResultsStore': 'results_store',
+    'ScoringResult': 'result_model',
+    'ScoreAggregator': 'aggregation',
+    'RunCheckpoint': 'run_manifest',
+    'read_jsonl': 'run_manifest',
+    'build_report': 'reporting',
+    'setup_logging': 'utils',
+    'save_results': 'utils',
+    'load_results': 'utils',
+    'create_report': 'utils',
+    'print_results_summary': 'utils',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'{__name__}.{module_name}'), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,494 @@
+"""
+Aggregation Module
+Constant-memory, mergeable aggregates of scoring results
+"""
+
+import math
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+try:
+    from src.config import AGGREGATION_CONFIG, SCORING_CONFIG
+except ImportError:
+    from config import AGGREGATION_CONFIG, SCORING_CONFIG
+
+
+# Aggregated fields: final score plus each component score
+SCORE_FIELDS = ('final_score', 'grammar', 'complexity', 'fluency', 'clarity')
+
+
+class RunningMoments:
+    """Count, mean, variance and range updated with Welford's method"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value: float) -> None:
+        """
+        Add one value
+
+        Args:
+            value: Observed value
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def update_batch(self, values: np.ndarray) -> None:
+        """
+        Add many values at once
+
+        Args:
+            values: Observed values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        batch = RunningMoments()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    def merge(self, other: 'RunningMoments') -> None:
+        """
+        Combine another partial aggregate into this one (Chan et al.)
+
+        Args:
+            other: Moments of a disjoint set of values
+        """
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Population variance (as np.var)"""
+        return self.m2 / self.count if self.count else math.nan
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (as np.std)"""
+        return math.sqrt(self.variance) if self.count else math.nan
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch (merging t-digest)
+
+    Keeps about compression / 2 weighted centroids, smaller near the tails,
+    so extreme quantiles stay accurate and memory stays bounded.
+    """
+
+    def __init__(self, compression: float = None):
+        """
+        Initialize QuantileSketch
+
+        Args:
+            compression: Accuracy/size trade-off (None = AGGREGATION_CONFIG)
+        """
+        self.compression = compression or AGGREGATION_CONFIG['sketch_compression']
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[float] = []
+        self._buffer_limit = int(5 * self.compression)
+
+    @property
+    def count(self) -> float:
+        """Total weight of the added values"""
+        return float(self.weights.sum()) + len(self._buffer)
+
+    def update(self, value: float) -> None:
+        """
+        Add one value
+
+        Args:
+            value: Observed value
+        """
+        self._buffer.append(value)
+        if len(self._buffer) >= self._buffer_limit:
+            self._compress()
+
+    def update_batch(self, values: np.ndarray) -> None:
+        """
+        Add many values at once
+
+        Args:
+            values: Observed values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            self._compress(values, np.ones(len(values)))
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """
+        Combine another sketch into this one
+
+        Args:
+            other: Sketch of a disjoint set of values
+        """
+        other._compress()
+        self._compress(other.means, other.weights)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value (NaN if no values were added)
+        """
+        self._compress()
+        if not len(self.means):
+            return math.nan
+        if len(self.means) == 1:
+            return float(self.means[0])
+
+        # Centroid means sit at the middle of their cumulative weight
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate(([0.0], centers, [total]))
+        values = np.concatenate(([self.min], self.means, [self.max]))
+        return float(np.interp(q * total, positions, values))
+
+    def _compress(self, means: np.ndarray = None, weights: np.ndarray = None) -> None:
+        """
+        Merge buffered values and extra centroids into the sketch
+
+        Args:
+            means: Extra centroid means
+            weights: Extra centroid weights
+        """
+        parts_m = [self.means]
+        parts_w = [self.weights]
+        if self._buffer:
+            parts_m.append(np.asarray(self._buffer, dtype=np.float64))
+            parts_w.append(np.ones(len(self._buffer)))
+            self._buffer = []
+        if means is not None and len(means):
+            parts_m.append(np.asarray(means, dtype=np.float64))
+            parts_w.append(np.asarray(weights, dtype=np.float64))
+        if len(parts_m) == 1:
+            return
+
+        all_m = np.concatenate(parts_m)
+        all_w = np.concatenate(parts_w)
+        self.min = min(self.min, float(all_m.min()))
+        self.max = max(self.max, float(all_m.max()))
+        order = np.argsort(all_m, kind='stable')
+        all_m = all_m[order]
+        all_w = all_w[order]
+
+        total = all_w.sum()
+        scale = self.compression / (2 * math.pi)
+        merged_m, merged_w = [], []
+        cur_m, cur_w = all_m[0], all_w[0]
+        q_start = 0.0
+        q_limit = self._q_limit(0.0, scale)
+        for mean, weight in zip(all_m[1:].tolist(), all_w[1:].tolist()):
+            if q_start + (cur_w + weight) / total <= q_limit:
+                cur_m += (mean - cur_m) * weight / (cur_w + weight)
+                cur_w += weight
+            else:
+                merged_m.append(cur_m)
+                merged_w.append(cur_w)
+                q_start += cur_w / total
+                q_limit = self._q_limit(q_start, scale)
+                cur_m, cur_w = mean, weight
+        merged_m.append(cur_m)
+        merged_w.append(cur_w)
+
+        self.means = np.array(merged_m)
+        self.weights = np.array(merged_w)
+
+    @staticmethod
+    def _q_limit(q: float, scale: float) -> float:
+        """
+        Largest quantile a centroid starting at q may reach (k1 scale)
+
+        Args:
+            q: Quantile where the centroid starts
+            scale: compression / 2pi
+
+        Returns:
+            Upper quantile bound
+        """
+        k = scale * math.asin(2 * q - 1) + 1
+        if k >= scale * math.pi / 2:
+            return 1.0
+        return (math.sin(k / scale) + 1) / 2
+
+
+class FixedHistogram:
+    """Histogram with fixed, equal-width bins over a known range"""
+
+    def __init__(self, low: float, high: float, bins: int):
+        """
+        Initialize FixedHistogram
+
+        Args:
+            low: Lower edge of the first bin
+            high: Upper edge of the last bin (values above it go to overflow)
+            bins: Number of bins
+        """
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update_batch(self, values: np.ndarray) -> None:
+        """
+        Add many values at once
+
+        Args:
+            values: Observed values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        low, high = self.edges[0], self.edges[-1]
+        self.underflow += int((values < low).sum())
+        self.overflow += int((values > high).sum())
+        inside = values[(values >= low) & (values <= high)]
+        # The top edge is inclusive, as in np.histogram
+        index = np.searchsorted(self.edges, inside, side='right') - 1
+        index = np.minimum(index, len(self.counts) - 1)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+
+    def update(self, value: float) -> None:
+        """
+        Add one value
+
+        Args:
+            value: Observed value
+        """
+        self.update_batch(np.array([value]))
+
+    def merge(self, other: 'FixedHistogram') -> None:
+        """
+        Add another histogram's counts (same bins required)
+
+        Args:
+            other: Histogram of a disjoint set of values
+        """
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bins")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+
+class FieldAggregate:
+    """Moments, quantile sketch and histogram of one score field"""
+
+    def __init__(self, bins: int = None, compression: float = None):
+        """
+        Initialize FieldAggregate
+
+        Args:
+            bins: Histogram bins over the score range (None = AGGREGATION_CONFIG)
+            compression: Quantile sketch compression (None = AGGREGATION_CONFIG)
+        """
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch(compression)
+        self.histogram = FixedHistogram(SCORING_CONFIG['min_score'],
+                                        SCORING_CONFIG['max_score'],
+                                        bins or AGGREGATION_CONFIG['histogram_bins'])
+
+    def update_batch(self, values: np.ndarray) -> None:
+        """
+        Add many values at once
+
+        Args:
+            values: Observed values
+        """
+        self.moments.update_batch(values)
+        self.sketch.update_batch(values)
+        self.histogram.update_batch(values)
+
+    def merge(self, other: 'FieldAggregate') -> None:
+        """
+        Combine another partial aggregate into this one
+
+        Args:
+            other: Aggregate of a disjoint set of results
+        """
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summary statistics of the field
+
+        Returns:
+            Dictionary with count, mean, std, min, max, median and quartiles
+        """
+        empty = not self.moments.count
+        return {
+            'count': self.moments.count,
+            'mean': math.nan if empty else self.moments.mean,
+            'std': self.moments.std,
+            'min': math.nan if empty else self.moments.min,
+            'max': math.nan if empty else self.moments.max,
+            'p25': self.sketch.quantile(0.25),
+            'median': self.sketch.quantile(0.5),
+            'p75': self.sketch.quantile(0.75),
+        }
+
+
+class ScoreAggregator:
+    """
+    Streaming aggregate of final and component scores
+
+    Memory does not grow with the number of results. Aggregators built
+    over disjoint parts (e.g. by parallel workers) combine with merge().
+    """
+
+    def __init__(self, bins: int = None, compression: float = None,
+                 batch_size: int = 4096):
+        """
+        Initialize ScoreAggregator
+
+        Args:
+            bins: Histogram bins per field (None = AGGREGATION_CONFIG)
+            compression: Quantile sketch compression (None = AGGREGATION_CONFIG)
+            batch_size: Results buffered by update() before they are folded in
+        """
+        self.fields = {name: FieldAggregate(bins, compression) for name in SCORE_FIELDS}
+        self.batch_size = batch_size
+        self._pending: Dict[str, List[float]] = {name: [] for name in SCORE_FIELDS}
+
+    @property
+    def count(self) -> int:
+        """Number of aggregated results"""
+        return self.fields['final_score'].moments.count + len(self._pending['final_score'])
+
+    def update(self, result: Dict) -> None:
+        """
+        Add one result dictionary
+
+        Args:
+            result: Result with final_score and components
+        """
+        components = result.get('components', {})
+        self._pending['final_score'].append(result.get('final_score', 0))
+        for name in SCORE_FIELDS[1:]:
+            self._pending[name].append(components.get(name, 0))
+        if len(self._pending['final_score']) >= self.batch_size:
+            self._fold()
+
+    def update_many(self, results: Iterable[Dict]) -> 'ScoreAggregator':
+        """
+        Add results from any iterable, e.g. a generator over a JSONL log
+
+        Args:
+            results: Result dictionaries
+
+        Returns:
+            self
+        """
+        for result in results:
+            self.update(result)
+        self._fold()
+        return self
+
+    def update_arrays(self, columns: Dict[str, np.ndarray]) -> None:
+        """
+        Add a batch of results given as score columns
+
+        Args:
+            columns: Field name (SCORE_FIELDS) -> values of the batch
+        """
+        self._fold()
+        for name, values in columns.items():
+            self.fields[name].update_batch(values)
+
+    def merge(self, other: 'ScoreAggregator') -> 'ScoreAggregator':
+        """
+        Combine another partial aggregate into this one
+
+        Args:
+            other: Aggregate of a disjoint set of results
+
+        Returns:
+            self
+        """
+        self._fold()
+        other._fold()
+        for name, field in self.fields.items():
+            field.merge(other.fields[name])
+        return self
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summary statistics of every field
+
+        Returns:
+            Dictionary mapping field name to its summary
+        """
+        self._fold()
+        return {name: field.summary() for name, field in self.fields.items()}
+
+    def histogram(self, name: str = 'final_score') -> Dict:
+        """
+        Fixed-bin histogram of one field
+
+        Args:
+            name: Field name
+
+        Returns:
+            Dictionary with counts, bin edges and out-of-range counts
+        """
+        self._fold()
+        histogram = self.fields[name].histogram
+        return {
+            'histogram': histogram.counts.tolist(),
+            'bin_edges': histogram.edges.tolist(),
+            'underflow': histogram.underflow,
+            'overflow': histogram.overflow,
+        }
+
+    def _fold(self) -> None:
+        """Fold results buffered by update() into the aggregates"""
+        if not self._pending['final_score']:
+            return
+        for name, values in self._pending.items():
+            self.fields[name].update_batch(np.asarray(values, dtype=np.float64))
+        self._pending = {name: [] for name in SCORE_FIELDS}
+
+
+def aggregate_results(results: Iterable[Dict], bins: int = None,
+                      compression: float = None) -> ScoreAggregator:
+    """
+    Aggregate results in one pass without holding them in memory
+
+    Args:
+        results: Result dictionaries (list, generator, ...)
+        bins: Histogram bins per field (None = AGGREGATION_CONFIG)
+        compression: Quantile sketch compression (None = AGGREGATION_CONFIG)
+
+    Returns:
+        Populated ScoreAggregator
+    """
+    return ScoreAggregator(bins, compression).update_many(results)
@@ -0,0 +1,279 @@
+"""
+Async Scoring Module
+Asyncio-native scoring on managed thread and process pools
+"""
+
+import os
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    from src.config import ASYNC_CONFIG, PIPELINE_CONFIG
+    from src.pipeline import (ScoringPipeline, _init_worker, _score_in_worker,
+                              resolve_workers, save_result_json)
+except ImportError:
+    from config import ASYNC_CONFIG, PIPELINE_CONFIG
+    from pipeline import (ScoringPipeline, _init_worker, _score_in_worker,
+                          resolve_workers, save_result_json)
+
+
+class AsyncScorer:
+    """Score audio files from an event loop without blocking it"""
+
+    def __init__(self, pipeline: ScoringPipeline = None,
+                 max_concurrency: int = None, use_processes: bool = None,
+                 workers: int = None, logger: logging.Logger = None):
+        """
+        Initialize AsyncScorer
+
+        Args:
+            pipeline: Pipeline whose processors the stage threads share
+            max_concurrency: Jobs in flight at once (None = ASYNC_CONFIG)
+            use_processes: Score whole files in worker processes instead of
+                           decode/ASR/NLP stage threads (None = ASYNC_CONFIG)
+            workers: Worker processes when use_processes is set
+                     (None = BATCH_CONFIG, 0 = one per CPU)
+            logger: Logger for job failures (default: module logger)
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.max_concurrency = max_concurrency or ASYNC_CONFIG['max_concurrency']
+        self.use_processes = (ASYNC_CONFIG['use_processes']
+                              if use_processes is None else use_processes)
+        self.pipeline = None if self.use_processes else (pipeline or ScoringPipeline())
+        self.workers = workers
+        self._executors: Dict[str, Executor] = {}
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self._warm = False
+
+    async def __aenter__(self) -> 'AsyncScorer':
+        await self.warm_up()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    async def warm_up(self) -> None:
+        """Load the ASR model (or start the worker processes) ahead of use"""
+        if self._warm:
+            return
+        if self.use_processes:
+            # Pool initializers warm each worker; touch every process once
+            await asyncio.gather(*(self._run('process', os.getpid)
+                                   for _ in range(resolve_workers(self.workers))))
+        else:
+            await self._run('asr', self.pipeline.warm_up)
+        self._warm = True
+
+    async def score_file(self, audio_path: str, output_dir: str = None,
+                         timeout: float = None) -> Optional[Dict]:
+        """
+        Score one audio file
+
+        Cancelling the returned coroutine (or hitting the timeout) stops
+        the job at the next stage boundary; a stage already running in a
+        pool finishes in the background and its result is discarded.
+
+        Args:
+            audio_path: Path to audio file
+            output_dir: Directory to save the JSON result to (None = don't save)
+            timeout: Seconds before asyncio.TimeoutError, counted from when
+                     the file gets a concurrency slot (None = ASYNC_CONFIG)
+
+        Returns:
+            ScoringResult, or None if the file could not
+            be decoded or transcribed
+        """
+        timeout = ASYNC_CONFIG['timeout'] if timeout is None else timeout
+        return await self._score_file(audio_path, output_dir, timeout)
+
+    async def score_many(self, audio_paths: Sequence[str], output_dir: str = None,
+                         timeout: float = None,
+                         return_exceptions: bool = False) -> List:
+        """
+        Score many audio files concurrently, at most max_concurrency at a time
+
+        Args:
+            audio_paths: Paths of the audio files to score
+            output_dir: Directory to save JSON results to (None = don't save)
+            timeout: Per-file timeout in seconds (None = ASYNC_CONFIG)
+            return_exceptions: Return each failure's exception instead of None
+
+        Returns:
+            Results in the same order as audio_paths
+        """
+        jobs = [self.score_file(path, output_dir, timeout) for path in audio_paths]
+        outcomes = await asyncio.gather(*jobs, return_exceptions=True)
+
+        results = []
+        for path, outcome in zip(audio_paths, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException) and not return_exceptions:
+                self.logger.error(f"Error scoring {path}: {outcome!r}")
+                outcome = None
+            results.append(outcome)
+        return results
+
+    def close(self) -> None:
+        """Shut down the pools, cancelling jobs that have not started"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+        self._semaphores.clear()
+        self._warm = False
+
+    async def _score_file(self, audio_path: str, output_dir: str = None,
+                          timeout: float = None) -> Optional[Dict]:
+        """
+        Run one file through the pools under the concurrency cap
+
+        Args:
+            audio_path: Path to audio file
+            output_dir: Directory to save the JSON result to (None = don't save)
+            timeout: Seconds allowed once a slot is acquired (None = no limit)
+
+        Returns:
+            ScoringResult, or None on failure
+        """
+        # The cap is per event loop; a semaphore cannot be shared across loops
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        # Time spent waiting for a slot does not count against the timeout
+        async with semaphore:
+            return await asyncio.wait_for(self._process_file(audio_path, output_dir),
+                                          timeout)
+
+    async def _process_file(self, audio_path: str,
+                            output_dir: str = None) -> Optional[Dict]:
+        """
+        Run one file through the pools
+
+        Args:
+            audio_path: Path to audio file
+            output_dir: Directory to save the JSON result to (None = don't save)
+
+        Returns:
+            ScoringResult, or None on failure
+        """
+        if self.use_processes:
+            result = await self._run('process', _score_in_worker, audio_path)
+            if result is not None and output_dir:
+                await self._run('nlp', save_result_json, result, audio_path,
+                                output_dir)
+            return result
+
+        item = await self._run('decode', self.pipeline.decode, audio_path)
+        if item is None:
+            return None
+        item = await self._run('asr', self.pipeline.transcribe, item)
+        if item is None:
+            return None
+        return await self._run('nlp', self.pipeline.score, item, output_dir)
+
+    async def _run(self, pool: str, func: Callable, *args):
+        """
+        Run a blocking call on one of the managed pools
+
+        Args:
+            pool: 'decode', 'asr', 'nlp' or 'process'
+            func: Blocking function
+            *args: Positional arguments for func
+
+        Returns:
+            Return value of func
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(pool),
+                                          functools.partial(func, *args))
+
+    def _executor(self, pool: str) -> Executor:
+        """
+        Get a pool, creating it on first use
+
+        Args:
+            pool: 'decode', 'asr', 'nlp' or 'process'
+
+        Returns:
+            The executor
+        """
+        executor = self._executors.get(pool)
+        if executor is not None:
+            return executor
+
+        if pool == 'process':
+            workers = resolve_workers(self.workers)
+            threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           initializer=_init_worker,
+                                           initargs=(None, threads_per_worker))
+        else:
+            # One ASR thread per loaded model keeps Whisper calls serialized
+            executor = ThreadPoolExecutor(
+                max_workers=PIPELINE_CONFIG[f'{pool}_workers'],
+                thread_name_prefix=f'async-{pool}',
+            )
+        self._executors[pool] = executor
+        return executor
+
+
+_DEFAULT_SCORER: Optional[AsyncScorer] = None
+
+
+def get_async_scorer() -> AsyncScorer:
+    """
+    Get the process-wide AsyncScorer
+
+    Returns:
+        Shared AsyncScorer configured from ASYNC_CONFIG
+    """
+    global _DEFAULT_SCORER
+    if _DEFAULT_SCORER is None:
+        _DEFAULT_SCORER = AsyncScorer()
+    return _DEFAULT_SCORER
+
+
+async def ascore_audio_file(audio_path: str, output_dir: str = None,
+                            timeout: float = None,
+                            scorer: AsyncScorer = None) -> Optional[Dict]:
+    """
+    Score a single audio file without blocking the event loop
+
+    Args:
+        audio_path: Path to audio file
+        output_dir: Directory to save the JSON result to (None = don't save)
+        timeout: Seconds before asyncio.TimeoutError, counted from when
+                 the file gets a concurrency slot (None = ASYNC_CONFIG)
+        scorer: Scorer to use (default: the process-wide scorer)
+
+    Returns:
+        ScoringResult, or None on failure
+    """
+    scorer = scorer or get_async_scorer()
+    return await scorer.score_file(audio_path, output_dir, timeout)
+
+
+async def ascore_many(audio_paths: Sequence[str], output_dir: str = None,
+                      timeout: float = None, return_exceptions: bool = False,
+                      scorer: AsyncScorer = None) -> List:
+    """
+    Score many audio files concurrently without blocking the event loop
+
+    Args:
+        audio_paths: Paths of the audio files to score
+        output_dir: Directory to save JSON results to (None = don't save)
+        timeout: Per-file timeout in seconds (None = ASYNC_CONFIG)
+        return_exceptions: Return each failure's exception instead of None
+        scorer: Scorer to use (default: the process-wide scorer)
+
+    Returns:
+        Results in the same order as audio_paths
+    """
+    scorer = scorer or get_async_scorer()
+    return await scorer.score_many(audio_paths, output_dir, timeout,
+                                   return_exceptions)
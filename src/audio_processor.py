@@ -4,10 +4,8 @@ Handles audio loading, preprocessing, and feature extraction
 """
 
 import numpy as np
-import librosa
-import librosa.display
 import warnings
-from typing import Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 
 try:
     from src.config import AUDIO_CONFIG
@@ -16,6 +14,93 @@ except ImportError:
 
 warnings.filterwarnings('ignore')
 
+# Analysis frame geometry shared by all spectral features
+N_FFT = 2048
+HOP_LENGTH = 512
+
+
+def hann_window(frame_length: int) -> np.ndarray:
+    """
+    Periodic Hann window, the analysis window of librosa.stft
+    
+    Args:
+        frame_length: Samples per frame
+        
+    Returns:
+        Window of frame_length float32 weights
+    """
+    return np.hanning(frame_length + 1)[:-1].astype(np.float32)
+
+
+def frame_energy_db(audio: np.ndarray, frame_length: int = N_FFT,
+                    hop_length: int = HOP_LENGTH, window: bool = True) -> np.ndarray:
+    """
+    Mean-square energy of centered frames in dB relative to the loudest
+    
+    Frames are strided views of the padded signal, so no frame matrix
+    is copied and no FFT is computed. With window, samples are weighted
+    like the STFT frames of the mel detector, so both see a pause begin
+    and end on the same frames.
+    
+    Args:
+        audio: Audio signal
+        frame_length: Samples per frame
+        hop_length: Samples between frames
+        window: Weight each frame with a Hann window (False = rectangular)
+        
+    Returns:
+        Per-frame energy in dB (0 dB = loudest frame)
+    """
+    padded = np.pad(np.asarray(audio, dtype=np.float32), frame_length // 2)
+    if len(padded) < frame_length:
+        return np.zeros(0, dtype=np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(
+        padded, frame_length
+    )[::hop_length]
+    if window:
+        weights = hann_window(frame_length) ** 2
+        energy = np.einsum('ij,j,ij->i', frames, weights, frames) / weights.sum()
+    else:
+        energy = np.einsum('ij,ij->i', frames, frames) / frame_length
+    ref = max(float(energy.max()), 1e-10)
+    return 10.0 * np.log10(np.maximum(energy, 1e-10) / ref)
+
+
+def find_pauses(silent: np.ndarray, hop_length: int, sr: int,
+                min_pause_duration: float = 0.0) -> Dict:
+    """
+    Locate sound-to-silence transitions in a per-frame silence mask
+    
+    Args:
+        silent: Boolean mask, True for silent frames
+        hop_length: Samples between frames
+        sr: Sample rate
+        min_pause_duration: Ignore pauses shorter than this (seconds)
+        
+    Returns:
+        Dictionary with pause count, start times and durations in seconds
+    """
+    edges = np.diff(silent.astype(np.int8))
+    starts = np.flatnonzero(edges == 1) + 1
+    ends = np.flatnonzero(edges == -1) + 1
+    
+    # Each pause lasts until the next silence-to-sound edge (or the end)
+    next_end = np.searchsorted(ends, starts)
+    end_frames = np.append(ends, len(silent))[next_end]
+    
+    positions = starts * hop_length / sr
+    durations = (end_frames - starts) * hop_length / sr
+    if min_pause_duration > 0:
+        keep = durations >= min_pause_duration
+        positions, durations = positions[keep], durations[keep]
+    
+    return {
+        'pause_count': int(len(positions)),
+        'pause_positions': positions,
+        'pause_durations': durations,
+        'total_pause_duration': float(durations.sum()),
+    }
+
 
 class AudioProcessor:
     """Process audio files for grammar scoring engine"""
@@ -40,6 +125,8 @@ class AudioProcessor:
         Returns:
             Tuple of (audio_data, sample_rate)
         """
+        import librosa
+        
         try:
             audio, sr = librosa.load(file_path, sr=self.sample_rate)
             return audio, sr
@@ -47,6 +134,83 @@ class AudioProcessor:
             print(f"Error loading audio file {file_path}: {e}")
             return None, None
     
+    def get_file_duration(self, file_path: str) -> Optional[float]:
+        """
+        Read the duration of an audio file from its header
+        
+        Args:
+            file_path: Path to audio file
+            
+        Returns:
+            Duration in seconds, or None if the header can't be read
+        """
+        try:
+            import soundfile as sf
+            return sf.info(file_path).duration
+        except Exception:
+            return None
+    
+    def stream_audio(self, file_path: str,
+                     block_size: int = None) -> Iterator[np.ndarray]:
+        """
+        Read an audio file in fixed-size mono blocks at the target rate
+        
+        Args:
+            file_path: Path to audio file
+            block_size: Samples read per block
+                        (default: chunk_size analysis frames)
+            
+        Yields:
+            Mono float32 signal blocks
+        """
+        import soundfile as sf
+        
+        block_size = block_size or self.chunk_size * HOP_LENGTH
+        
+        with sf.SoundFile(file_path) as f:
+            resampler = None
+            if f.samplerate != self.sample_rate:
+                resampler = _make_stream_resampler(f.samplerate,
+                                                   self.sample_rate)
+            
+            while True:
+                block = f.read(block_size, dtype='float32', always_2d=True)
+                last = len(block) < block_size
+                mono = block.mean(axis=1)
+                if resampler is not None:
+                    mono = resampler(mono, last)
+                if len(mono):
+                    yield mono
+                if last:
+                    break
+    
+    def analyze_stream(self, file_path: str,
+                       silence_threshold: float = -40) -> Optional[Dict]:
+        """
+        Compute audio statistics block by block with bounded memory
+        
+        Args:
+            file_path: Path to audio file
+            silence_threshold: Pause threshold in dB
+            
+        Returns:
+            Dictionary with duration, peak, pause count and spectral
+            statistics (see StreamingAudioStats.finalize)
+        """
+        trim_top_db = None
+        if AUDIO_CONFIG['remove_silence']:
+            trim_top_db = abs(AUDIO_CONFIG['silence_threshold'])
+        
+        try:
+            stats = StreamingAudioStats(self.sample_rate,
+                                        trim_top_db=trim_top_db)
+            for block in self.stream_audio(file_path):
+                stats.update(block)
+            return stats.finalize(silence_threshold)
+        except Exception as e:
+            print(f"Error streaming audio file {file_path}: {e}")
+            return None
+    
     def normalize_audio(self, audio: np.ndarray) -> np.ndarray:
         """
         Normalize audio to [-1, 1] range
@@ -75,6 +239,8 @@ class AudioProcessor:
         Returns:
             Audio without silence
         """
+        import librosa
+        
         try:
             # Trim leading and trailing silence
             audio_trimmed, _ = librosa.effects.trim(audio, top_db=top_db)
@@ -83,6 +249,28 @@ class AudioProcessor:
             print(f"Error removing silence: {e}")
             return audio
     
+    def preprocess_signal(self, audio: np.ndarray, sr: int) -> np.ndarray:
+        """
+        Normalize and trim an already loaded signal
+        
+        Args:
+            audio: Audio signal
+            sr: Sample rate
+            
+        Returns:
+            Preprocessed audio signal
+        """
+        # Normalize
+        if AUDIO_CONFIG['normalize']:
+            audio = self.normalize_audio(audio)
+        
+        # Remove silence (threshold is configured in dB below peak)
+        if AUDIO_CONFIG['remove_silence']:
+            audio = self.remove_silence(audio, sr, 
+                                       top_db=abs(AUDIO_CONFIG['silence_threshold']))
+        
+        return audio
+    
     def preprocess_audio(self, file_path: str) -> Optional[Tuple[np.ndarray, int]]:
         """
         Complete preprocessing pipeline
@@ -98,19 +286,24 @@ class AudioProcessor:
         if audio is None:
             return None
         
-        # Normalize
-        if AUDIO_CONFIG['normalize']:
-            audio = self.normalize_audio(audio)
-        
-        # Remove silence
-        if AUDIO_CONFIG['remove_silence']:
-            audio = self.remove_silence(audio, sr, 
-                                       top_db=AUDIO_CONFIG['silence_threshold'])
+        return self.preprocess_signal(audio, sr), sr
+    
+    def analyze(self, audio: np.ndarray, sr: int) -> 'SpectralAnalysis':
+        """
+        Create a shared spectral analysis of a signal
         
-        return audio, sr
+        Args:
+            audio: Audio signal
+            sr: Sample rate
+            
+        Returns:
+            SpectralAnalysis computing the STFT once for all features
+        """
+        return SpectralAnalysis(audio, sr)
     
     def extract_mfcc(self, audio: np.ndarray, sr: int, 
-                     n_mfcc: int = 13) -> np.ndarray:
+                     n_mfcc: int = 13,
+                     analysis: 'SpectralAnalysis' = None) -> np.ndarray:
         """
         Extract MFCC features
         
@@ -118,41 +311,98 @@ class AudioProcessor:
             audio: Audio signal
             sr: Sample rate
             n_mfcc: Number of MFCC coefficients
+            analysis: Shared analysis of the same signal to reuse
             
         Returns:
             MFCC feature matrix
         """
-        mfcc = librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=n_mfcc)
-        return mfcc
+        analysis = analysis or self.analyze(audio, sr)
+        return analysis.mfcc(n_mfcc)
     
-    def extract_spectral_features(self, audio: np.ndarray, sr: int) -> dict:
+    def extract_spectral_features(self, audio: np.ndarray, sr: int,
+                                  analysis: 'SpectralAnalysis' = None) -> dict:
         """
         Extract spectral features
         
         Args:
             audio: Audio signal
             sr: Sample rate
+            analysis: Shared analysis of the same signal to reuse
             
         Returns:
             Dictionary with spectral features
         """
-        # Spectral centroid
-        spectral_centroid = librosa.feature.spectral_centroid(y=audio, sr=sr)[0]
-        
-        # Spectral rolloff
-        spectral_rolloff = librosa.feature.spectral_rolloff(y=audio, sr=sr)[0]
+        analysis = analysis or self.analyze(audio, sr)
+        return analysis.spectral_features()
+    
+    def extract_all_features(self, audio: np.ndarray, sr: int,
+                             n_mfcc: int = 13,
+                             silence_threshold: float = -40) -> dict:
+        """
+        Extract every audio feature from a single STFT
         
-        # Zero crossing rate
-        zcr = librosa.feature.zero_crossing_rate(audio)[0]
+        Args:
+            audio: Audio signal
+            sr: Sample rate
+            n_mfcc: Number of MFCC coefficients
+            silence_threshold: Pause threshold in dB
+            
+        Returns:
+            Dictionary with MFCC matrix and statistics, spectral features,
+            pause count and duration
+        """
+        analysis = self.analyze(audio, sr)
+        mfcc = analysis.mfcc(n_mfcc)
         
-        return {
-            'spectral_centroid_mean': np.mean(spectral_centroid),
-            'spectral_centroid_std': np.std(spectral_centroid),
-            'spectral_rolloff_mean': np.mean(spectral_rolloff),
-            'spectral_rolloff_std': np.std(spectral_rolloff),
-            'zcr_mean': np.mean(zcr),
-            'zcr_std': np.std(zcr),
+        features = {
+            'mfcc': mfcc,
+            'mfcc_mean': np.mean(mfcc, axis=1),
+            'mfcc_std': np.std(mfcc, axis=1),
         }
+        features.update(analysis.spectral_features())
+        features['pause_count'] = analysis.pause_count(silence_threshold)
+        features['duration'] = self.get_duration(audio, sr)
+        return features
+    
+    def extract_features_batch(self, clips: List[np.ndarray], sr: int = None,
+                               n_mfcc: int = 13, batch_size: int = 32,
+                               silence_threshold: float = -40,
+                               detector: str = None):
+        """
+        Extract summary features for many clips with vectorized operations
+        
+        Clips are sorted by length and processed in buckets of batch_size,
+        each zero-padded to its longest clip and transformed as one
+        multi-channel array. Padded frames are masked out of every
+        statistic, so results match per-clip extraction.
+        
+        Args:
+            clips: List of mono audio signals
+            sr: Sample rate of the clips (default: processor sample rate)
+            n_mfcc: Number of MFCC coefficients
+            batch_size: Clips transformed together
+            silence_threshold: Pause threshold in dB
+            detector: 'mel' or 'rms' (default: AUDIO_CONFIG['pause_detector'])
+            
+        Returns:
+            DataFrame with one row per clip, in input order
+        """
+        import pandas as pd
+        
+        sr = sr or self.sample_rate
+        detector = detector or AUDIO_CONFIG['pause_detector']
+        columns = batch_feature_columns(n_mfcc)
+        matrix = np.zeros((len(clips), len(columns)), dtype=np.float64)
+        
+        order = sorted(range(len(clips)), key=lambda i: len(clips[i]))
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            matrix[bucket] = _bucket_features(
+                [np.asarray(clips[i], dtype=np.float32) for i in bucket],
+                sr, n_mfcc, silence_threshold, detector
+            )
+        
+        return pd.DataFrame(matrix, columns=columns)
     
     def get_duration(self, audio: np.ndarray, sr: int) -> float:
         """
@@ -165,10 +415,14 @@ class AudioProcessor:
         Returns:
             Duration in seconds
         """
+        import librosa
+        
         return librosa.get_duration(y=audio, sr=sr)
     
     def get_pause_count(self, audio: np.ndarray, sr: int, 
-                       silence_threshold: float = -40) -> int:
+                       silence_threshold: float = -40,
+                       analysis: 'SpectralAnalysis' = None,
+                       detector: str = None) -> int:
         """
         Estimate number of pauses in audio
         
@@ -176,18 +430,591 @@ class AudioProcessor:
             audio: Audio signal
             sr: Sample rate
             silence_threshold: Threshold in dB
+            analysis: Shared analysis of the same signal to reuse
+            detector: 'mel' or 'rms' (default: AUDIO_CONFIG['pause_detector'])
             
         Returns:
             Number of pauses detected
         """
-        S = librosa.feature.melspectrogram(y=audio, sr=sr)
-        S_db = librosa.power_to_db(S, ref=np.max)
+        detector = detector or AUDIO_CONFIG['pause_detector']
+        if detector == 'rms':
+            return self.detect_pauses(audio, sr, silence_threshold)['pause_count']
+        elif detector == 'mel':
+            analysis = analysis or self.analyze(audio, sr)
+            return analysis.pause_count(silence_threshold)
+        else:
+            raise ValueError(f"Unknown pause detector: {detector}")
+    
+    def detect_pauses(self, audio: np.ndarray, sr: int,
+                      silence_threshold: float = -40,
+                      min_pause_duration: float = 0.0) -> Dict:
+        """
+        Detect pauses from framed RMS energy
+        
+        Much cheaper than the mel-spectrogram detector: one strided pass
+        over the signal instead of an STFT and a mel projection. Frames
+        are silent when their Hann-weighted energy is more than
+        silence_threshold dB below the loudest frame. On broadband
+        speech the pauses match those of SpectralAnalysis.detect_pauses.
+        
+        Args:
+            audio: Audio signal
+            sr: Sample rate
+            silence_threshold: Threshold in dB relative to the loudest frame
+            min_pause_duration: Ignore pauses shorter than this (seconds)
+            
+        Returns:
+            Dictionary with pause count, pause start times (seconds),
+            pause durations (seconds) and total pause duration
+        """
+        silent = frame_energy_db(audio) < silence_threshold
+        return find_pauses(silent, HOP_LENGTH, sr, min_pause_duration)
+
+
+class SpectralAnalysis:
+    """Spectral features of one signal derived from a single STFT"""
+    
+    def __init__(self, audio: np.ndarray, sr: int, n_fft: int = 2048,
+                 hop_length: int = 512, n_mels: int = 128):
+        """
+        Initialize SpectralAnalysis
+        
+        Spectrograms are computed lazily on first use and cached, so each
+        feature only pays for the transforms it needs.
+        
+        Args:
+            audio: Audio signal
+            sr: Sample rate
+            n_fft: FFT window size
+            hop_length: Samples between frames
+            n_mels: Number of mel bands
+        """
+        self.audio = audio
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self._magnitude = None
+        self._mel_power = None
+        self._mel_db = None
+    
+    @property
+    def magnitude(self) -> np.ndarray:
+        """Magnitude spectrogram |STFT|"""
+        if self._magnitude is None:
+            import librosa
+            self._magnitude = np.abs(librosa.stft(
+                self.audio, n_fft=self.n_fft, hop_length=self.hop_length
+            ))
+        return self._magnitude
+    
+    @property
+    def mel_power(self) -> np.ndarray:
+        """Mel power spectrogram"""
+        if self._mel_power is None:
+            import librosa
+            self._mel_power = librosa.feature.melspectrogram(
+                S=self.magnitude ** 2, sr=self.sr, n_fft=self.n_fft,
+                n_mels=self.n_mels
+            )
+        return self._mel_power
+    
+    @property
+    def mel_db(self) -> np.ndarray:
+        """Mel power spectrogram in dB (absolute reference)"""
+        if self._mel_db is None:
+            import librosa
+            self._mel_db = librosa.power_to_db(self.mel_power)
+        return self._mel_db
+    
+    def mfcc(self, n_mfcc: int = 13) -> np.ndarray:
+        """
+        Get MFCC features
+        
+        Args:
+            n_mfcc: Number of MFCC coefficients
+            
+        Returns:
+            MFCC feature matrix
+        """
+        import librosa
+        
+        return librosa.feature.mfcc(S=self.mel_db, sr=self.sr, n_mfcc=n_mfcc)
+    
+    def spectral_centroid(self) -> np.ndarray:
+        """Per-frame spectral centroid"""
+        import librosa
+        
+        return librosa.feature.spectral_centroid(
+            S=self.magnitude, sr=self.sr, n_fft=self.n_fft,
+            hop_length=self.hop_length
+        )[0]
+    
+    def spectral_rolloff(self) -> np.ndarray:
+        """Per-frame spectral rolloff"""
+        import librosa
+        
+        return librosa.feature.spectral_rolloff(
+            S=self.magnitude, sr=self.sr, n_fft=self.n_fft,
+            hop_length=self.hop_length
+        )[0]
+    
+    def zero_crossing_rate(self) -> np.ndarray:
+        """Per-frame zero crossing rate (time domain, no STFT needed)"""
+        import librosa
+        
+        return librosa.feature.zero_crossing_rate(
+            self.audio, frame_length=self.n_fft, hop_length=self.hop_length
+        )[0]
+    
+    def spectral_features(self) -> dict:
+        """
+        Get summary spectral features
+        
+        Returns:
+            Dictionary with spectral features
+        """
+        spectral_centroid = self.spectral_centroid()
+        spectral_rolloff = self.spectral_rolloff()
+        zcr = self.zero_crossing_rate()
+        
+        return {
+            'spectral_centroid_mean': np.mean(spectral_centroid),
+            'spectral_centroid_std': np.std(spectral_centroid),
+            'spectral_rolloff_mean': np.mean(spectral_rolloff),
+            'spectral_rolloff_std': np.std(spectral_rolloff),
+            'zcr_mean': np.mean(zcr),
+            'zcr_std': np.std(zcr),
+        }
+    
+    def pause_count(self, silence_threshold: float = -40) -> int:
+        """
+        Estimate number of pauses from the mel spectrogram
+        
+        Args:
+            silence_threshold: Threshold in dB relative to the loudest bin
+            
+        Returns:
+            Number of pauses detected
+        """
+        return self.detect_pauses(silence_threshold)['pause_count']
+    
+    def detect_pauses(self, silence_threshold: float = -40,
+                      min_pause_duration: float = 0.0) -> Dict:
+        """
+        Detect pauses from the mean dB of the mel bands of each frame
+        
+        Args:
+            silence_threshold: Threshold in dB relative to the loudest bin
+            min_pause_duration: Ignore pauses shorter than this (seconds)
+            
+        Returns:
+            Dictionary with the same keys as AudioProcessor.detect_pauses
+        """
+        import librosa
+        
+        S_db = librosa.power_to_db(self.mel_power, ref=np.max)
         
         # Find frames below threshold
-        silence_frames = np.mean(S_db, axis=0) < silence_threshold
+        silent = np.mean(S_db, axis=0) < silence_threshold
+        return find_pauses(silent, self.hop_length, self.sr, min_pause_duration)
+
+
+class StreamingAudioStats:
+    """Incremental audio statistics over a stream of signal chunks"""
+    
+    def __init__(self, sr: int, n_fft: int = N_FFT,
+                 hop_length: int = HOP_LENGTH, n_mels: int = 128,
+                 trim_top_db: float = None):
+        """
+        Initialize StreamingAudioStats
+        
+        Frames are laid out exactly as librosa's centered STFT, so the
+        statistics match the in-memory methods closely. Memory holds one
+        chunk plus two floats per analysis frame.
+        
+        Args:
+            sr: Sample rate of the incoming chunks
+            n_fft: FFT window size
+            hop_length: Samples between frames
+            n_mels: Number of mel bands
+            trim_top_db: Measure pauses and trimmed duration only between
+                         the first and last frame within this many dB of
+                         the loudest frame (None = no trimming)
+        """
+        import librosa
+        
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.trim_top_db = trim_top_db
+        self.n_samples = 0
+        self.peak = 0.0
+        
+        self._window = librosa.filters.get_window('hann', n_fft, fftbins=True)
+        self._window_power = float(np.sum(self._window ** 2))
+        self._mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)
+        self._freqs = librosa.fft_frequencies(sr=sr, n_fft=n_fft)
+        
+        # Zero padding reproduces the centered framing of librosa.stft
+        self._tail = np.zeros(n_fft // 2, dtype=np.float32)
+        self._frame_mel_db = []
+        self._frame_energy = []
+        self._frame_power = []
+        self._max_mel_db = -np.inf
+        self._centroid = _RunningMoments()
+        self._rolloff = _RunningMoments()
+        self._zcr = _RunningMoments()
+        self._finalized = False
+    
+    def update(self, chunk: np.ndarray) -> None:
+        """
+        Add the next chunk of signal
+        
+        Args:
+            chunk: Mono audio samples
+        """
+        if self._finalized:
+            raise RuntimeError("StreamingAudioStats is already finalized")
+        
+        chunk = np.asarray(chunk, dtype=np.float32).ravel()
+        if not len(chunk):
+            return
+        
+        self.n_samples += len(chunk)
+        self.peak = max(self.peak, float(np.max(np.abs(chunk))))
+        self._consume(np.concatenate([self._tail, chunk]))
+    
+    @property
+    def duration(self) -> float:
+        """Seconds of audio seen so far"""
+        return self.n_samples / self.sr
+    
+    def finalize(self, silence_threshold: float = -40,
+                 detector: str = None) -> Dict:
+        """
+        Flush the last frames and summarize the stream
+        
+        Args:
+            silence_threshold: Pause threshold in dB relative to the
+                               loudest mel bin ('mel') or frame ('rms')
+            detector: 'mel' or 'rms' (default: AUDIO_CONFIG['pause_detector'])
+            
+        Returns:
+            Dictionary with duration, trimmed duration, peak, pause count
+            and spectral statistics
+        """
+        if not self._finalized:
+            padding = np.zeros(self.n_fft // 2, dtype=np.float32)
+            self._consume(np.concatenate([self._tail, padding]))
+            self._finalized = True
+        
+        return self.snapshot(silence_threshold, detector)
+    
+    def snapshot(self, silence_threshold: float = -40,
+                 detector: str = None) -> Dict:
+        """
+        Summarize the frames analyzed so far without ending the stream
+        
+        Pauses are recounted over all frames because the silence threshold
+        is relative to the loudest frame, which later audio can change.
+        The last partial frame is only included by finalize().
+        
+        Args:
+            silence_threshold: Pause threshold in dB relative to the
+                               loudest mel bin ('mel') or frame ('rms')
+            detector: 'mel' or 'rms' (default: AUDIO_CONFIG['pause_detector'])
+            
+        Returns:
+            Dictionary with the same keys as finalize()
+        """
+        frame_power = (np.concatenate(self._frame_power)
+                       if self._frame_power else np.zeros(0, np.float32))
+        
+        start, end = self._voiced_frames(frame_power)
+        detector = detector or AUDIO_CONFIG['pause_detector']
+        if detector == 'rms':
+            energy = (np.concatenate(self._frame_energy)
+                      if self._frame_energy else np.zeros(0, np.float32))
+            
+            # Relative to the loudest frame of the whole stream, as in memory
+            ref = max(float(energy.max()), 1e-10) if len(energy) else 1.0
+            voiced_db = 10.0 * np.log10(np.maximum(energy[start:end], 1e-10) / ref)
+        else:
+            frame_mel_db = (np.concatenate(self._frame_mel_db)
+                            if self._frame_mel_db else np.zeros(0, np.float32))
+            voiced_db = frame_mel_db[start:end] - self._max_mel_db
         
         # Count transitions from sound to silence
-        transitions = np.diff(silence_frames.astype(int))
-        pause_count = np.sum(transitions == 1)
+        silence_frames = voiced_db < silence_threshold
+        pause_count = find_pauses(silence_frames, self.hop_length,
+                                  self.sr)['pause_count']
+        
+        if end > start:
+            trimmed_samples = (min(self.n_samples, end * self.hop_length)
+                               - start * self.hop_length)
+        else:
+            trimmed_samples = 0
+        
+        stats = {
+            'duration': self.duration,
+            'trimmed_duration': trimmed_samples / self.sr,
+            'peak': self.peak,
+            'pause_count': pause_count,
+            'num_frames': len(frame_power),
+        }
+        stats.update(self._centroid.summary('spectral_centroid'))
+        stats.update(self._rolloff.summary('spectral_rolloff'))
+        stats.update(self._zcr.summary('zcr'))
+        return stats
+    
+    def _consume(self, buffer: np.ndarray) -> None:
+        """
+        Analyze every complete frame in the buffer and keep the remainder
+        
+        Args:
+            buffer: Carried-over samples followed by new samples
+        """
+        if len(buffer) < self.n_fft:
+            self._tail = buffer
+            return
+        
+        n_frames = 1 + (len(buffer) - self.n_fft) // self.hop_length
+        frames = np.lib.stride_tricks.sliding_window_view(
+            buffer, self.n_fft
+        )[::self.hop_length][:n_frames]
+        self._analyze_frames(frames)
+        self._tail = buffer[n_frames * self.hop_length:].copy()
+    
+    def _analyze_frames(self, frames: np.ndarray) -> None:
+        """
+        Update running statistics with a block of frames
+        
+        Args:
+            frames: Array of shape (n_frames, n_fft)
+        """
+        windowed = frames * self._window
+        magnitude = np.abs(np.fft.rfft(windowed, axis=1)).T
+        
+        # Mel energy per frame, in dB with librosa's 80 dB floor
+        mel_db = 10.0 * np.log10(np.maximum(
+            self._mel_basis @ (magnitude ** 2), 1e-10
+        ))
+        self._max_mel_db = max(self._max_mel_db, float(mel_db.max()))
+        mel_db = np.maximum(mel_db, self._max_mel_db - 80.0)
+        self._frame_mel_db.append(mel_db.mean(axis=0).astype(np.float32))
+        
+        # Hann-weighted energy (see frame_energy_db) and plain power
+        self._frame_energy.append(
+            (np.sum(windowed ** 2, axis=1) / self._window_power).astype(np.float32)
+        )
+        self._frame_power.append(np.mean(frames ** 2, axis=1).astype(np.float32))
+        
+        # Spectral centroid and 85% rolloff
+        total = magnitude.sum(axis=0)
+        safe_total = np.where(total > 0, total, 1.0)
+        centroid = (self._freqs @ magnitude) / safe_total
+        cumulative = np.cumsum(magnitude, axis=0)
+        rolloff = self._freqs[np.argmax(cumulative >= 0.85 * total, axis=0)]
+        self._centroid.update(np.where(total > 0, centroid, 0.0))
+        self._rolloff.update(rolloff)
+        
+        # Zero crossing rate (near-zero samples count as positive)
+        signs = np.signbit(np.where(np.abs(frames) <= 1e-10, 0.0, frames))
+        crossings = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+        self._zcr.update(crossings / self.n_fft)
+    
+    def _voiced_frames(self, frame_power: np.ndarray) -> Tuple[int, int]:
+        """
+        Find the frame span librosa.effects.trim would keep
+        
+        Args:
+            frame_power: Mean squared amplitude per frame
+            
+        Returns:
+            Tuple of (first_frame, end_frame) with end exclusive
+        """
+        if not len(frame_power):
+            return 0, 0
+        if self.trim_top_db is None:
+            return 0, len(frame_power)
+        
+        ref = max(float(frame_power.max()), 1e-10)
+        power_db = 10.0 * np.log10(np.maximum(frame_power, 1e-10) / ref)
+        voiced = np.flatnonzero(power_db > -self.trim_top_db)
+        if not len(voiced):
+            return 0, 0
+        return int(voiced[0]), int(voiced[-1]) + 1
+
+
+def batch_feature_columns(n_mfcc: int = 13) -> List[str]:
+    """
+    Column names of the batch feature matrix
+    
+    Args:
+        n_mfcc: Number of MFCC coefficients
+        
+    Returns:
+        List of column names
+    """
+    columns = ['duration']
+    columns += [f'mfcc_mean_{i}' for i in range(n_mfcc)]
+    columns += [f'mfcc_std_{i}' for i in range(n_mfcc)]
+    for name in ('spectral_centroid', 'spectral_rolloff', 'zcr'):
+        columns += [f'{name}_mean', f'{name}_std']
+    columns += ['pause_count', 'silence_ratio']
+    return columns
+
+
+def _masked_moments(values: np.ndarray, mask: np.ndarray,
+                    counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and standard deviation over valid frames
+    
+    Args:
+        values: Array of shape (clips, ..., frames)
+        mask: Valid-frame mask of shape (clips, 1, frames)
+        counts: Valid frames per clip, shape (clips, 1)
+        
+    Returns:
+        Tuple of (mean, std), each of shape (clips, ...)
+    """
+    mean = np.sum(values * mask, axis=-1) / counts
+    var = np.sum(((values - mean[..., None]) * mask) ** 2, axis=-1) / counts
+    return mean, np.sqrt(var)
+
+
+def _bucket_features(clips: List[np.ndarray], sr: int, n_mfcc: int,
+                     silence_threshold: float, detector: str) -> np.ndarray:
+    """
+    Feature rows for one bucket of similar-length clips
+    
+    Args:
+        clips: Mono signals
+        sr: Sample rate
+        n_mfcc: Number of MFCC coefficients
+        silence_threshold: Pause threshold in dB
+        detector: 'mel' or 'rms'
+        
+    Returns:
+        Array of shape (len(clips), len(batch_feature_columns(n_mfcc)))
+    """
+    import librosa
+    
+    lengths = np.array([len(clip) for clip in clips])
+    batch = np.zeros((len(clips), max(int(lengths.max()), 1)), dtype=np.float32)
+    for row, clip in enumerate(clips):
+        batch[row, :len(clip)] = clip
+    
+    # Centered frames of a zero-padded clip equal those of the clip itself
+    magnitude = np.abs(librosa.stft(batch, n_fft=N_FFT, hop_length=HOP_LENGTH))
+    n_frames = magnitude.shape[-1]
+    valid = np.arange(n_frames)[None, :] < (1 + lengths // HOP_LENGTH)[:, None]
+    counts = valid.sum(axis=1, keepdims=True).astype(np.float64)
+    mask = valid[:, None, :]
+    
+    # Per-clip dB scaling, as librosa.power_to_db would do for each clip
+    mel_power = librosa.feature.melspectrogram(S=magnitude ** 2, sr=sr,
+                                               n_fft=N_FFT)
+    mel_db = 10.0 * np.log10(np.maximum(mel_power, 1e-10))
+    clip_max_db = np.max(np.where(mask, mel_db, -np.inf), axis=(1, 2))
+    mel_db = np.maximum(mel_db, (clip_max_db - 80.0)[:, None, None])
+    
+    mfcc = librosa.feature.mfcc(S=mel_db, sr=sr, n_mfcc=n_mfcc)
+    mfcc_mean, mfcc_std = _masked_moments(mfcc, mask, counts)
+    
+    spectral = []
+    for feature in (
+        librosa.feature.spectral_centroid(S=magnitude, sr=sr, n_fft=N_FFT,
+                                          hop_length=HOP_LENGTH),
+        librosa.feature.spectral_rolloff(S=magnitude, sr=sr, n_fft=N_FFT,
+                                         hop_length=HOP_LENGTH),
+        librosa.feature.zero_crossing_rate(batch, frame_length=N_FFT,
+                                           hop_length=HOP_LENGTH),
+    ):
+        mean, std = _masked_moments(feature[:, :, :n_frames], mask, counts)
+        spectral += [mean[:, 0], std[:, 0]]
+    
+    # Silent frames, relative to each clip's loudest bin or frame
+    if detector == 'rms':
+        padded = np.pad(batch, ((0, 0), (N_FFT // 2, N_FFT // 2)))
+        frames = np.lib.stride_tricks.sliding_window_view(
+            padded, N_FFT, axis=1
+        )[:, ::HOP_LENGTH][:, :n_frames]
+        weights = hann_window(N_FFT) ** 2
+        energy = np.einsum('bij,j,bij->bi', frames, weights, frames) / weights.sum()
+        ref = np.max(np.where(valid, energy, 0.0), axis=1, keepdims=True)
+        frame_db = 10.0 * np.log10(np.maximum(energy, 1e-10)
+                                   / np.maximum(ref, 1e-10))
+    else:
+        frame_db = np.mean(mel_db, axis=1) - clip_max_db[:, None]
+    silent = (frame_db < silence_threshold) & valid
+    pauses = np.sum(silent[:, 1:] & ~silent[:, :-1] & valid[:, 1:], axis=1)
+    
+    return np.column_stack(
+        [lengths / sr, mfcc_mean, mfcc_std] + spectral
+        + [pauses, silent.sum(axis=1) / counts[:, 0]]
+    )
+
+
+class _RunningMoments:
+    """Mean and standard deviation updated one batch at a time"""
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def update(self, values: np.ndarray) -> None:
+        """
+        Merge a batch of values (Chan et al. parallel variance)
+        
+        Args:
+            values: New observations
+        """
+        n = len(values)
+        if not n:
+            return
+        batch_mean = float(np.mean(values))
+        batch_m2 = float(np.sum((values - batch_mean) ** 2))
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+    
+    def summary(self, name: str) -> Dict[str, float]:
+        """
+        Get mean and standard deviation
+        
+        Args:
+            name: Feature name used as key prefix
+            
+        Returns:
+            Dictionary with '<name>_mean' and '<name>_std'
+        """
+        std = np.sqrt(self.m2 / self.count) if self.count else 0.0
+        return {f'{name}_mean': self.mean, f'{name}_std': float(std)}
+
+
+def _make_stream_resampler(orig_sr: int, target_sr: int):
+    """
+    Build a resampler that carries filter state across blocks
+    
+    Args:
+        orig_sr: Sample rate of the file
+        target_sr: Target sample rate
         
-        return max(0, pause_count)
+    Returns:
+        Callable (block, last) -> resampled block
+    """
+    try:
+        import soxr
+        stream = soxr.ResampleStream(orig_sr, target_sr, 1, dtype='float32')
+        return lambda block, last: stream.resample_chunk(block, last=last)
+    except ImportError:
+        # Stateless fallback: slight artifacts at block edges
+        import librosa
+        return lambda block, last: librosa.resample(
+            block, orig_sr=orig_sr, target_sr=target_sr
+        ) if len(block) else block
@@ -4,11 +4,13 @@
 # Audio processing parameters
 AUDIO_CONFIG = {
     'sample_rate': 16000,  # Hz
-    'chunk_size': 1024,
+    'chunk_size': 1024,  # Analysis frames per block when streaming audio
     'audio_format': 'wav',
     'normalize': True,
     'remove_silence': True,
     'silence_threshold': -40,  # dB
+    'pause_detector': 'mel',  # 'mel' (mel spectrogram) or 'rms' (framed energy, much cheaper)
+    'stream_min_duration': 600,  # Stream files longer than this many seconds (None = never)
 }
 
 # Speech Recognition parameters
@@ -17,6 +19,10 @@ ASR_CONFIG = {
     'model_size': 'base',  # 'tiny', 'base', 'small', 'medium', 'large'
     'language': 'en',
     'confidence_threshold': 0.5,
+    'device': None,  # 'cpu', 'cuda' or None to auto-detect
+    'dtype': None,  # 'float16', 'float32' or None for the device default
+    'max_model_memory_mb': None,  # Evict cached models above this (None = no cap)
+    'use_trimmed_audio': False,  # Transcribe the silence-trimmed signal
 }
 
 # NLP parameters
@@ -25,6 +31,7 @@ NLP_CONFIG = {
     'pos_tagger': 'nltk',
     'remove_stopwords': False,
     'lowercase': True,
+    'nltk_data_dir': './nltk_data',  # Local NLTK data searched first (resources are never downloaded)
 }
 
 # Grammar scoring parameters
@@ -32,6 +39,7 @@ SCORING_CONFIG = {
     'model_type': 'rule_based',  # 'rule_based' or 'ml_based'
     'max_score': 100,
     'min_score': 0,
+    'error_positions': 'full',  # 'full' (dict per hit), 'compact' (parallel int arrays) or 'none'
     'weights': {
         'grammar_errors': 0.4,
         'sentence_complexity': 0.3,
@@ -40,12 +48,93 @@ SCORING_CONFIG = {
     }
 }
 
+# Transcript cache parameters
+CACHE_CONFIG = {
+    'transcript_cache': True,  # Reuse transcripts of previously seen audio
+    'max_size_mb': 256,  # Least recently used transcripts are evicted above this
+}
+
+# Batch processing parameters
+BATCH_CONFIG = {
+    'workers': 1,  # Worker processes for directory scoring (0 = one per CPU)
+    'chunksize': 1,  # Files handed to a worker at a time
+    'error_positions': 'compact',  # Error position detail of batch runs (see SCORING_CONFIG)
+}
+
+# Staged (pipelined) scoring parameters
+PIPELINE_CONFIG = {
+    'decode_workers': 2,  # Threads decoding audio and computing audio metrics
+    'asr_workers': 1,  # Threads running speech-to-text (one per loaded model)
+    'nlp_workers': 1,  # Threads running text analysis and scoring
+    'queue_size': 8,  # Capacity of each queue between stages
+}
+
+# Columnar results store written by batch scoring (needs pyarrow)
+RESULTS_CONFIG = {
+    'store_format': 'parquet',  # 'parquet', 'arrow' (IPC) or None for per-file JSON only
+    'store_name': 'results_store',  # Store directory inside the results directory
+    'row_group_size': 4096,  # Results buffered per row group / record batch
+    'part_rows': 262144,  # Rows per part file before a new one is started
+    'compression': 'zstd',
+    'per_file_json': True,  # Also write <audio>_results.json per file
+    'report_chunksize': 50000,  # Results flattened per chunk when building reports
+}
+
+# Resumable batch runs: manifest and JSONL sink kept in the results directory
+RUN_CONFIG = {
+    'manifest_name': 'run_manifest.sqlite3',  # Content hash -> status of every input
+    'results_name': 'results.jsonl',  # Append-only result log
+    'fsync_every': 64,  # Results written between fsyncs / manifest commits
+    'retry_failed': True,  # Rescore inputs that failed in an earlier run
+}
+
+# Streaming score aggregates (ResultsProcessor)
+AGGREGATION_CONFIG = {
+    'histogram_bins': 20,  # Fixed bins between min_score and max_score per component
+    'sketch_compression': 200,  # Quantile sketch size/accuracy (about half this many centroids)
+}
+
+# Stage timing and metrics instrumentation
+METRICS_CONFIG = {
+    'enabled': False,  # Time every pipeline stage (near-zero cost when off)
+    'attach_timings': False,  # Add a 'timings' block to each result
+    'histogram_buckets': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    'rtf_buckets': (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0),
+}
+
+# Asyncio scoring API parameters
+ASYNC_CONFIG = {
+    'max_concurrency': 4,  # Scoring jobs in flight at once per AsyncScorer
+    'use_processes': False,  # Score whole files in worker processes instead of stage threads
+    'timeout': None,  # Default per-file timeout in seconds (None = no limit)
+}
+
+# Live streaming session parameters
+STREAMING_CONFIG = {
+    'update_interval': 3.0,  # Seconds of audio between provisional scores
+    'window_seconds': 15.0,  # Transcribed audio is committed once the rolling window reaches this
+    'cut_search_seconds': 2.0,  # Commit at the quietest frame within this tail of the window
+}
+
+# Local scoring server parameters
+SERVER_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'batch_window_ms': 25,  # How long the first request of a batch waits for others
+    'max_batch_size': 8,  # Requests scored together in one micro-batch
+    'max_upload_mb': 50,  # Larger uploads are rejected
+    'allow_file_paths': False,  # Accept paths of files on this machine, not just uploads
+    'request_timeout': 60,  # Seconds a request may wait for its result
+    'drain_timeout': 30,  # Seconds to finish in-flight requests on shutdown
+}
+
 # File paths
 FILE_PATHS = {
     'data_dir': './data',
     'results_dir': './results',
     'models_dir': './models',
     'logs_dir': './logs',
+    'cache_dir': './cache',
 }
 
 # Logging
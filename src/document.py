@@ -0,0 +1,153 @@
+"""
+Document Analysis Module
+Tokenizes and tags a text once so every stage can share the result
+"""
+
+from typing import List, Tuple
+
+try:
+    from src import instrumentation
+    from src.nlp_resources import (sent_tokenize, tag_token_lists, tag_tokens,
+                                   word_tokenize)
+except ImportError:
+    import instrumentation
+    from nlp_resources import (sent_tokenize, tag_token_lists, tag_tokens,
+                               word_tokenize)
+
+
+# Treebank tokenization rewrites double quotes; map them back to the source
+_QUOTE_FORMS = {
+    '``': ('"', '``'),
+    "''": ('"', "''"),
+}
+
+
+class AnalyzedDocument:
+    """Sentences, tokens, offsets and POS tags of one text"""
+
+    def __init__(self, text: str, sentences: List[str],
+                 sentence_tokens: List[List[str]],
+                 pos_tags: List[Tuple[str, str]] = None):
+        """
+        Initialize AnalyzedDocument
+
+        Args:
+            text: Analyzed text
+            sentences: Sentences of the text
+            sentence_tokens: Word tokens of each sentence
+            pos_tags: (word, tag) pairs for all tokens, if tagged
+        """
+        self.text = text
+        self.sentences = sentences
+        self.sentence_tokens = sentence_tokens
+        self.tokens = [token for tokens in sentence_tokens for token in tokens]
+        self.sentence_lengths = [len(tokens) for tokens in sentence_tokens]
+        self.pos_tags = pos_tags
+        self._token_offsets = None
+
+    @property
+    def num_words(self) -> int:
+        """Number of word tokens"""
+        return len(self.tokens)
+
+    @property
+    def num_sentences(self) -> int:
+        """Number of sentences"""
+        return len(self.sentences)
+
+    @property
+    def token_offsets(self) -> List[Tuple[int, int]]:
+        """(start, end) character offsets of each token in the text"""
+        if self._token_offsets is None:
+            self._token_offsets = align_tokens(self.tokens, self.text)
+        return self._token_offsets
+
+
+def align_tokens(tokens: List[str], text: str) -> List[Tuple[int, int]]:
+    """
+    Find the character span of each token in the source text
+
+    Args:
+        tokens: Tokens in text order
+        text: Source text
+
+    Returns:
+        List of (start, end) offsets; tokens that cannot be located get an
+        empty span at the current position
+    """
+    offsets = []
+    cursor = 0
+    for token in tokens:
+        best = None
+        for form in _QUOTE_FORMS.get(token, (token,)):
+            start = text.find(form, cursor)
+            if start != -1 and (best is None or start < best[0]):
+                best = (start, start + len(form))
+        if best is None:
+            offsets.append((cursor, cursor))
+        else:
+            offsets.append(best)
+            cursor = best[1]
+    return offsets
+
+
+def analyze_text(text: str, tag: bool = True) -> AnalyzedDocument:
+    """
+    Split, tokenize and optionally POS-tag a text in one pass
+
+    Tokens are identical to nltk.word_tokenize(text): sentences are split
+    once and each sentence is word-tokenized once.
+
+    Args:
+        text: Input text
+        tag: Whether to POS-tag the tokens
+
+    Returns:
+        AnalyzedDocument for the text
+    """
+    with instrumentation.stage('tokenize'):
+        document = _tokenize_document(text)
+    if tag:
+        with instrumentation.stage('tag'):
+            document.pos_tags = tag_tokens(document.tokens)
+    return document
+
+
+def analyze_texts(texts: List[str], tag: bool = True) -> List[AnalyzedDocument]:
+    """
+    Analyze many texts, POS-tagging all of them in one tagger call
+
+    Each text is tagged as a whole, exactly as analyze_text() would, so
+    results do not depend on which texts are batched together.
+
+    Args:
+        texts: Input texts
+        tag: Whether to POS-tag the tokens
+
+    Returns:
+        AnalyzedDocument for each text, in input order
+    """
+    with instrumentation.stage('tokenize'):
+        documents = [_tokenize_document(text) for text in texts]
+    if tag:
+        with instrumentation.stage('tag'):
+            tagged = tag_token_lists([document.tokens for document in documents])
+        for document, pos_tags in zip(documents, tagged):
+            document.pos_tags = pos_tags
+    return documents
+
+
+def _tokenize_document(text: str) -> AnalyzedDocument:
+    """
+    Split a text into sentences and word tokens
+
+    Args:
+        text: Input text
+
+    Returns:
+        Untagged AnalyzedDocument
+    """
+    sentences = sent_tokenize(text)
+    sentence_tokens = [word_tokenize(sentence, preserve_line=True)
+                       for sentence in sentences]
+    return AnalyzedDocument(text, sentences, sentence_tokens)
@@ -3,16 +3,21 @@ Grammar Scoring Module
 Analyzes and scores grammatical correctness
 """
 
-import re
 import numpy as np
-from typing import Dict, List, Tuple
-from nltk import pos_tag, word_tokenize
-from nltk.tokenize import sent_tokenize
+from typing import Dict, Iterable, List, Tuple
 
 try:
     from src.config import SCORING_CONFIG
+    from src import instrumentation
+    from src.document import AnalyzedDocument, analyze_text
+    from src.nlp_resources import word_tokenize
+    from src.rule_engine import RuleEngine, RuleScan
 except ImportError:
     from config import SCORING_CONFIG
+    import instrumentation
+    from document import AnalyzedDocument, analyze_text
+    from nlp_resources import word_tokenize
+    from rule_engine import RuleEngine, RuleScan
 
 # Common grammar error patterns
 GRAMMAR_RULES = {
@@ -34,55 +39,180 @@ GRAMMAR_RULES = {
     },
 }
 
+# Words that signal clear sentence structure (used by the clarity score)
+CLARITY_RULE = 'clarity_markers'
+CLARITY_PATTERN = r'\b(the|a|is|are|and|but|or|if|when|because)\b'
+
+# Ways of reporting error positions (SCORING_CONFIG['error_positions']):
+# 'full' lists a {'rule', 'position', 'text'} dict per hit, 'compact' gives
+# parallel integer arrays with rule names interned, 'none' leaves them out
+ERROR_POSITION_MODES = ('full', 'compact', 'none')
+
+
+def _build_default_engine() -> RuleEngine:
+    """
+    Compile GRAMMAR_RULES and the clarity markers into one engine
+    
+    Returns:
+        RuleEngine shared by GrammarScorer instances
+    """
+    engine = RuleEngine(GRAMMAR_RULES)
+    engine.register(CLARITY_RULE, CLARITY_PATTERN,
+                    'Clear language markers', kind='marker')
+    return engine
+
+
+_DEFAULT_ENGINE = _build_default_engine()
+
+
+def register_rule(name: str, pattern: str, description: str = '',
+                  keywords: List[str] = None) -> None:
+    """
+    Add or replace a grammar rule for every GrammarScorer
+    
+    Args:
+        name: Rule name
+        pattern: Rule regex (matched case-insensitively)
+        description: Human-readable description
+        keywords: Words every match starts with, if the pattern does not
+                  begin with a \\b(word|...) group
+    """
+    GRAMMAR_RULES[name] = {'pattern': pattern, 'description': description}
+    _DEFAULT_ENGINE.register(name, pattern, description, keywords=keywords)
+
+
+def format_error_positions(groups: List[Tuple[str, List[int], List[int]]],
+                           text: str, mode: str) -> object:
+    """
+    Build the error_positions value of a result
+    
+    Args:
+        groups: (rule name, hit starts, hit ends) of each rule with hits
+        text: Text the offsets refer to
+        mode: 'full' or 'compact' (see ERROR_POSITION_MODES)
+        
+    Returns:
+        List of hit dictionaries ('full'), or a dictionary of parallel
+        lists 'rule', 'start' and 'end' where 'rule' indexes the rule
+        names in 'rules' ('compact')
+    """
+    if mode == 'full':
+        return [
+            {'rule': name, 'position': start, 'text': text[start:end]}
+            for name, starts, ends in groups
+            for start, end in zip(starts, ends)
+        ]
+    
+    rules, rule_ids, all_starts, all_ends = [], [], [], []
+    for name, starts, ends in groups:
+        rule_ids.extend([len(rules)] * len(starts))
+        rules.append(name)
+        all_starts.extend(starts)
+        all_ends.extend(ends)
+    return {'rules': rules, 'rule': rule_ids, 'start': all_starts, 'end': all_ends}
+
+
+def expand_error_positions(error_positions: object, text: str) -> List[Dict]:
+    """
+    Get error positions in the 'full' form, whichever form they are in
+    
+    Args:
+        error_positions: errors['error_positions'] of a result
+        text: The result's transcript
+        
+    Returns:
+        List of {'rule', 'position', 'text'} dictionaries
+    """
+    if not isinstance(error_positions, dict):
+        return list(error_positions or ())
+    rules = error_positions['rules']
+    return [
+        {'rule': rules[rule_id], 'position': start, 'text': text[start:end]}
+        for rule_id, start, end in zip(error_positions['rule'],
+                                       error_positions['start'],
+                                       error_positions['end'])
+    ]
+
+
+def _full_entries(rule: str, starts: List[int], ends: List[int], text: str,
+                  offset: int) -> List[Dict]:
+    """
+    Build 'full' error position entries for hits in one piece of text
+    
+    Args:
+        rule: Rule name
+        starts: Hit starts within text
+        ends: Hit ends within text
+        text: The piece of text
+        offset: Position of text in the joined text
+        
+    Returns:
+        List of {'rule', 'position', 'text'} dictionaries
+    """
+    return [{'rule': rule, 'position': offset + start, 'text': text[start:end]}
+            for start, end in zip(starts, ends)]
+
 
 class GrammarScorer:
     """Analyze and score grammatical correctness of text"""
     
-    def __init__(self):
-        """Initialize GrammarScorer"""
+    def __init__(self, rule_engine: RuleEngine = None, error_positions: str = None):
+        """
+        Initialize GrammarScorer
+        
+        Args:
+            rule_engine: Compiled rules to apply (default: GRAMMAR_RULES
+                         plus the clarity markers, see register_rule)
+            error_positions: 'full', 'compact' or 'none' (None = SCORING_CONFIG)
+        """
         self.max_score = SCORING_CONFIG['max_score']
         self.min_score = SCORING_CONFIG['min_score']
         self.weights = SCORING_CONFIG['weights']
+        self.rule_engine = rule_engine or _DEFAULT_ENGINE
+        self.error_positions = error_positions or SCORING_CONFIG['error_positions']
+        if self.error_positions not in ERROR_POSITION_MODES:
+            raise ValueError(f"Unknown error_positions mode: {self.error_positions}")
     
-    def detect_grammar_errors(self, text: str, pos_tags: List[Tuple]) -> Dict:
+    def detect_grammar_errors(self, text: str, pos_tags: List[Tuple],
+                              scan: RuleScan = None) -> Dict:
         """
         Detect potential grammar errors using pattern matching
         
         Args:
             text: Input text
             pos_tags: POS tags for the text
+            scan: Rule hits already found for text (default: scan text)
             
         Returns:
-            Dictionary with error counts and details
+            Dictionary with error counts and details (error_positions is
+            shaped by the scorer's error_positions mode, and left out for
+            'none')
         """
+        scan = scan or self.rule_engine.scan(text)
+        
+        error_types = scan.counts('error')
         errors = {
-            'total_errors': 0,
-            'error_types': {},
-            'error_positions': []
+            'total_errors': sum(error_types.values()),
+            'error_types': error_types,
         }
         
-        # Check each grammar rule
-        for rule_name, rule_info in GRAMMAR_RULES.items():
-            matches = list(re.finditer(rule_info['pattern'], text, re.IGNORECASE))
-            if matches:
-                errors['error_types'][rule_name] = len(matches)
-                errors['total_errors'] += len(matches)
-                
-                for match in matches:
-                    errors['error_positions'].append({
-                        'rule': rule_name,
-                        'position': match.start(),
-                        'text': match.group()
-                    })
-        
+        if self.error_positions != 'none':
+            groups = [(rule.name, scan.starts[rule.rule_id], scan.ends[rule.rule_id])
+                      for rule in scan.rules
+                      if rule.kind == 'error' and scan.starts[rule.rule_id]]
+            errors['error_positions'] = format_error_positions(
+                groups, text, self.error_positions
+            )
         return errors
     
-    def calculate_sentence_complexity(self, sentences: List[str]) -> float:
+    def calculate_sentence_complexity(self, sentences: List[str],
+                                      sentence_lengths: List[int] = None) -> float:
         """
         Calculate average sentence complexity based on length and structure
         
         Args:
             sentences: List of sentences
+            sentence_lengths: Word count of each sentence, if already known
             
         Returns:
             Complexity score (0-1)
@@ -90,11 +220,12 @@ class GrammarScorer:
         if not sentences:
             return 0.0
         
+        if sentence_lengths is None:
+            sentence_lengths = [len(word_tokenize(s)) for s in sentences]
+        
         complexities = []
         
-        for sentence in sentences:
-            words = word_tokenize(sentence)
-            word_count = len(words)
+        for word_count in sentence_lengths:
             
             # Basic complexity: longer sentences are considered more complex
             # Normalize to 0-1 scale (assuming max 30 words per sentence)
@@ -113,14 +244,26 @@ class GrammarScorer:
             duration: Audio duration in seconds
             pause_count: Number of pauses detected
             
+        Returns:
+            Fluency score (0-1)
+        """
+        return self._fluency(len(text.split()), duration, pause_count)
+    
+    def _fluency(self, words: int, duration: float, pause_count: int) -> float:
+        """
+        Fluency score from word count, duration and pauses
+        
+        Args:
+            words: Number of whitespace-separated words
+            duration: Audio duration in seconds
+            pause_count: Number of pauses detected
+            
         Returns:
             Fluency score (0-1)
         """
         if duration == 0:
             return 0.0
         
-        words = len(text.split())
-        
         # Words per minute
         wpm = (words / duration) * 60
         
@@ -136,13 +279,15 @@ class GrammarScorer:
         fluency = wpm_score * (1.0 - pause_penalty)
         return max(0, min(fluency, 1.0))
     
-    def calculate_clarity_score(self, text: str, pos_tags: List[Tuple]) -> float:
+    def calculate_clarity_score(self, text: str, pos_tags: List[Tuple],
+                                scan: RuleScan = None) -> float:
         """
         Calculate clarity based on vocabulary and structure
         
         Args:
             text: Input text
             pos_tags: POS tags
+            scan: Rule hits already found for text (default: scan text)
             
         Returns:
             Clarity score (0-1)
@@ -153,16 +298,26 @@ class GrammarScorer:
         # Count different POS tags (higher variety = more clear structure)
         pos_types = len(set([tag for word, tag in pos_tags]))
         
+        # Check for common clear language patterns
+        scan = scan or self.rule_engine.scan(text)
+        clear_patterns = scan.count(CLARITY_RULE)
+        
+        return self._clarity(pos_types, clear_patterns)
+    
+    def _clarity(self, pos_types: int, clear_patterns: int) -> float:
+        """
+        Clarity score from POS variety and clear-language markers
+        
+        Args:
+            pos_types: Number of distinct POS tags
+            clear_patterns: Number of clarity marker hits
+            
+        Returns:
+            Clarity score (0-1)
+        """
         # Normalize (assume max 15 different POS tags)
         pos_diversity = min(pos_types / 15.0, 1.0)
         
-        # Check for common clear language patterns
-        clear_patterns = len(re.findall(
-            r'\b(the|a|is|are|and|but|or|if|when|because)\b', 
-            text, 
-            re.IGNORECASE
-        ))
-        
         pattern_score = min(clear_patterns / 20.0, 1.0)
         
         clarity = (pos_diversity * 0.5) + (pattern_score * 0.5)
@@ -193,7 +348,8 @@ class GrammarScorer:
         return min(grammar_score, 1.0)
     
     def score_grammar(self, text: str, audio_duration: float, 
-                      pause_count: int, pos_tags: List[Tuple]) -> Dict:
+                      pause_count: int, pos_tags: List[Tuple],
+                      document: AnalyzedDocument = None) -> Dict:
         """
         Calculate comprehensive grammar score
         
@@ -202,30 +358,65 @@ class GrammarScorer:
             audio_duration: Duration of audio in seconds
             pause_count: Number of pauses in audio
             pos_tags: POS tags for the text
+            document: Analysis of text shared from another stage; used
+                      only if it was built from text itself (default:
+                      tokenize text here)
             
         Returns:
             Dictionary with detailed scoring breakdown
         """
-        # Get text components
-        sentences = sent_tokenize(text)
-        words = word_tokenize(text)
-        total_words = len(words)
+        # Get text components. A document of other text (e.g. the cleaned,
+        # lowercased one from preprocess_text, rather than its
+        # transcript_document) would change the counts.
+        if document is None or document.text != text:
+            document = analyze_text(text, tag=False)
+        sentences = document.sentences
+        total_words = document.num_words
+        
+        # Find every rule hit in one pass over the text
+        with instrumentation.stage('rules'):
+            scan = self.rule_engine.scan(text)
+            grammar_errors = self.detect_grammar_errors(text, pos_tags, scan)
         
         # Calculate component scores (0-1)
-        grammar_errors = self.detect_grammar_errors(text, pos_tags)
-        
-        grammar_component = self.calculate_grammar_score_component(
-            grammar_errors, total_words
-        )
-        
-        complexity_component = self.calculate_sentence_complexity(sentences)
-        
-        fluency_component = self.calculate_fluency_score(
-            text, audio_duration, pause_count
-        )
-        
-        clarity_component = self.calculate_clarity_score(text, pos_tags)
+        with instrumentation.stage('score'):
+            grammar_component = self.calculate_grammar_score_component(
+                grammar_errors, total_words
+            )
+            
+            complexity_component = self.calculate_sentence_complexity(
+                sentences, document.sentence_lengths
+            )
+            
+            fluency_component = self.calculate_fluency_score(
+                text, audio_duration, pause_count
+            )
+            
+            clarity_component = self.calculate_clarity_score(text, pos_tags, scan)
+            
+            return self._combine(grammar_errors, total_words, len(sentences),
+                                 grammar_component, complexity_component,
+                                 fluency_component, clarity_component)
+    
+    def _combine(self, grammar_errors: Dict, total_words: int,
+                 total_sentences: int, grammar_component: float,
+                 complexity_component: float, fluency_component: float,
+                 clarity_component: float) -> Dict:
+        """
+        Weight the component scores into the final result
         
+        Args:
+            grammar_errors: Output of detect_grammar_errors
+            total_words: Number of word tokens
+            total_sentences: Number of sentences
+            grammar_component: Grammar score (0-1)
+            complexity_component: Complexity score (0-1)
+            fluency_component: Fluency score (0-1)
+            clarity_component: Clarity score (0-1)
+            
+        Returns:
+            Dictionary with detailed scoring breakdown
+        """
         # Weighted average
         final_score = (
             grammar_component * self.weights['grammar_errors'] +
@@ -248,7 +439,236 @@ class GrammarScorer:
             'errors': grammar_errors,
             'statistics': {
                 'total_words': total_words,
-                'total_sentences': len(sentences),
-                'avg_sentence_length': total_words / len(sentences) if sentences else 0,
+                'total_sentences': total_sentences,
+                'avg_sentence_length': total_words / total_sentences if total_sentences else 0,
             }
         }
+
+
+class IncrementalGrammarScorer:
+    """
+    Grammar scorer that keeps running state as text is appended
+    
+    Appending analyzes only the new text and score() combines running
+    totals, so updating a long transcript costs time proportional to the
+    appended or pending text. Error positions are the exception: they
+    cover every hit so far, so callers scoring often can leave them to
+    the final score (see score()).
+    
+    Each appended piece is analyzed on its own: appending whole sentences
+    gives the score_grammar result of the joined text, unless sentence
+    splitting, a rule match or POS-tag context would have crossed the
+    boundary between pieces.
+    """
+    
+    def __init__(self, scorer: GrammarScorer = None):
+        """
+        Initialize IncrementalGrammarScorer
+        
+        Args:
+            scorer: Scorer providing rules, weights and component formulas
+        """
+        self.scorer = scorer or GrammarScorer()
+        self.length = 0
+        self.word_count = 0
+        self.total_words = 0
+        self.total_sentences = 0
+        self.complexity_sum = 0.0
+        self.clarity_markers = 0
+        self.pos_tag_counts: Dict[str, int] = {}
+        # Rule name -> (starts, ends) of its hits in the joined text
+        self.error_hits: Dict[str, Tuple[List[int], List[int]]] = {}
+        # Rule name -> number of hits
+        self.error_counts: Dict[str, int] = {}
+        # Rule name -> 'full' position entries, built as text is appended
+        # while the scorer's error_positions mode is 'full'
+        self._full_positions: Dict[str, List[Dict]] = {}
+        self._parts: List[str] = []
+    
+    @property
+    def text(self) -> str:
+        """All appended text, joined with single spaces"""
+        return ' '.join(self._parts)
+    
+    def append(self, text: str, document: AnalyzedDocument = None) -> None:
+        """
+        Add text (ideally whole sentences) to the running state
+        
+        Args:
+            text: New transcript text
+            document: Tagged analysis of the text, e.g. from
+                      TextProcessor.preprocess_text (default: analyze here)
+        """
+        if not text:
+            return
+        
+        offset = self.length + 1 if self._parts else 0
+        segment = self._analyze(text, document)
+        
+        full = self.scorer.error_positions == 'full'
+        for rule, (starts, ends) in segment['error_hits'].items():
+            rule_starts, rule_ends = self.error_hits.setdefault(rule, ([], []))
+            rule_starts.extend(offset + start for start in starts)
+            rule_ends.extend(offset + end for end in ends)
+            self.error_counts[rule] = self.error_counts.get(rule, 0) + len(starts)
+            if full:
+                self._full_positions.setdefault(rule, []).extend(
+                    _full_entries(rule, starts, ends, text, offset))
+        self.clarity_markers += segment['clarity_markers']
+        for tag, count in segment['pos_tag_counts'].items():
+            self.pos_tag_counts[tag] = self.pos_tag_counts.get(tag, 0) + count
+        self.word_count += segment['word_count']
+        self.total_words += segment['total_words']
+        self.total_sentences += segment['total_sentences']
+        self.complexity_sum += segment['complexity_sum']
+        
+        self._parts.append(text)
+        self.length = offset + len(text)
+    
+    def score(self, audio_duration: float, pause_count: int,
+              pending_text: str = None,
+              pending_document: AnalyzedDocument = None,
+              positions: bool = True) -> Dict:
+        """
+        Score everything appended so far
+        
+        Args:
+            audio_duration: Duration of audio in seconds
+            pause_count: Number of pauses in audio
+            pending_text: Provisional text scored after the appended text
+                          without being added to the running state
+            pending_document: Tagged analysis of pending_text
+            positions: Report error positions in the scorer's mode. They
+                       are copied from every hit so far, which costs time
+                       proportional to the whole transcript.
+            
+        Returns:
+            Dictionary with the same breakdown as GrammarScorer.score_grammar
+        """
+        pending = None
+        pending_hits: Dict[str, Tuple[List[int], List[int]]] = {}
+        offset = self.length + 1 if self._parts else 0
+        if pending_text:
+            pending = self._analyze(pending_text, pending_document)
+            pending_hits = pending['error_hits']
+        
+        def total(name):
+            return getattr(self, name) + (pending[name] if pending else 0)
+        
+        error_types = {}
+        for rule in self.scorer.rule_engine.rule_names():
+            count = self.error_counts.get(rule, 0)
+            if rule in pending_hits:
+                count += len(pending_hits[rule][0])
+            if count:
+                error_types[rule] = count
+        grammar_errors = {
+            'total_errors': sum(error_types.values()),
+            'error_types': error_types,
+        }
+        mode = self.scorer.error_positions
+        if positions and mode != 'none':
+            grammar_errors['error_positions'] = self._error_positions(
+                error_types, mode, pending_text, pending_hits, offset
+            )
+        
+        tags = set(self.pos_tag_counts)
+        if pending:
+            tags.update(pending['pos_tag_counts'])
+        
+        total_words = total('total_words')
+        total_sentences = total('total_sentences')
+        scorer = self.scorer
+        
+        grammar_component = scorer.calculate_grammar_score_component(
+            grammar_errors, total_words
+        )
+        complexity_component = (total('complexity_sum') / total_sentences
+                                if total_sentences else 0.0)
+        fluency_component = scorer._fluency(total('word_count'),
+                                            audio_duration, pause_count)
+        clarity_component = (scorer._clarity(len(tags), total('clarity_markers'))
+                             if tags else 0.0)
+        
+        return scorer._combine(grammar_errors, total_words, total_sentences,
+                               grammar_component, complexity_component,
+                               fluency_component, clarity_component)
+    
+    def _error_positions(self, rules: Iterable[str], mode: str, pending_text: str,
+                         pending_hits: Dict[str, Tuple[List[int], List[int]]],
+                         offset: int) -> object:
+        """
+        Combine the kept error positions with those of the pending text
+        
+        Args:
+            rules: Names of the rules with hits, in result order
+            mode: 'full' or 'compact' (see ERROR_POSITION_MODES)
+            pending_text: Provisional text (may be None)
+            pending_hits: Rule name -> (starts, ends) within pending_text
+            offset: Position of pending_text in the joined text
+            
+        Returns:
+            Same value as format_error_positions over the joined text
+        """
+        if mode == 'full':
+            positions = []
+            for rule in rules:
+                positions += self._full_positions.get(rule, ())
+                if rule in pending_hits:
+                    starts, ends = pending_hits[rule]
+                    positions += _full_entries(rule, starts, ends, pending_text, offset)
+            return positions
+        
+        names, rule_ids, all_starts, all_ends = [], [], [], []
+        for rule in rules:
+            starts, ends = self.error_hits.get(rule, ((), ()))
+            all_starts += starts
+            all_ends += ends
+            if rule in pending_hits:
+                pending_starts, pending_ends = pending_hits[rule]
+                all_starts += [offset + start for start in pending_starts]
+                all_ends += [offset + end for end in pending_ends]
+            rule_ids += [len(names)] * (len(all_starts) - len(rule_ids))
+            names.append(rule)
+        return {'rules': names, 'rule': rule_ids, 'start': all_starts, 'end': all_ends}
+    
+    def _analyze(self, text: str, document: AnalyzedDocument = None) -> Dict:
+        """
+        Compute the additive statistics of one piece of text
+        
+        Args:
+            text: Text to analyze
+            document: Tagged analysis of the text (default: analyze here)
+            
+        Returns:
+            Dictionary of counts and hits with offsets relative to text
+        """
+        tagged = document or analyze_text(text)
+        
+        # As in score_grammar, words and sentences are counted in the text
+        # itself; a document of other text (e.g. the cleaned, lowercased
+        # one from preprocess_text) only supplies the POS tags
+        document = tagged if tagged.text == text else analyze_text(text, tag=False)
+        engine = self.scorer.rule_engine
+        scan = engine.scan(text)
+        error_hits = {rule.name: (scan.starts[rule.rule_id], scan.ends[rule.rule_id])
+                      for rule in scan.rules
+                      if rule.kind == 'error' and scan.starts[rule.rule_id]}
+        
+        pos_tag_counts: Dict[str, int] = {}
+        for _, tag in tagged.pos_tags or ():
+            pos_tag_counts[tag] = pos_tag_counts.get(tag, 0) + 1
+        
+        # Same per-sentence complexity as calculate_sentence_complexity
+        complexity_sum = sum(min(length / 30.0, 1.0)
+                             for length in document.sentence_lengths)
+        
+        return {
+            'error_hits': error_hits,
+            'clarity_markers': scan.count(CLARITY_RULE),
+            'pos_tag_counts': pos_tag_counts,
+            'word_count': len(text.split()),
+            'total_words': document.num_words,
+            'total_sentences': document.num_sentences,
+            'complexity_sum': complexity_sum,
+        }
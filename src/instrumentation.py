@@ -0,0 +1,381 @@
+"""
+Instrumentation Module
+Per-stage wall/CPU timings, real-time factor and Prometheus-style metrics
+"""
+
+import time
+import threading
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence
+
+try:
+    from src.config import METRICS_CONFIG
+except ImportError:
+    from config import METRICS_CONFIG
+
+
+# Metric names are prefixed so they can share a scrape with other services
+METRIC_PREFIX = 'grammar_scorer'
+
+# Timings dictionary of the item the current thread is working on
+_CURRENT_TIMINGS: ContextVar[Optional[Dict]] = ContextVar('timings', default=None)
+
+
+class MetricsSink:
+    """Receives stage and file measurements; subclass to export elsewhere"""
+
+    def record_stage(self, stage: str, wall_seconds: float, cpu_seconds: float,
+                     ok: bool) -> None:
+        """
+        Record one timed stage call
+
+        Args:
+            stage: Stage name
+            wall_seconds: Elapsed wall-clock time
+            cpu_seconds: CPU time of the calling thread
+            ok: False if the stage raised
+        """
+
+    def record_file(self, audio_seconds: float, wall_seconds: float,
+                    real_time_factor: Optional[float]) -> None:
+        """
+        Record one scored file
+
+        Args:
+            audio_seconds: Duration of the scored audio
+            wall_seconds: Summed wall time of the file's stages
+            real_time_factor: wall_seconds / audio_seconds (None if no audio)
+        """
+
+
+class Histogram:
+    """Cumulative fixed-bucket histogram"""
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Initialize Histogram
+
+        Args:
+            buckets: Upper bounds of the buckets, ascending
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Add a value
+
+        Args:
+            value: Observed value
+        """
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative(self) -> List[int]:
+        """Counts of values at or below each bucket bound"""
+        totals, running = [], 0
+        for count in self.counts:
+            running += count
+            totals.append(running)
+        return totals
+
+
+class PrometheusSink(MetricsSink):
+    """In-process counters and histograms rendered in Prometheus text format"""
+
+    def __init__(self, buckets: Sequence[float] = None,
+                 rtf_buckets: Sequence[float] = None):
+        """
+        Initialize PrometheusSink
+
+        Args:
+            buckets: Stage latency buckets in seconds (None = METRICS_CONFIG)
+            rtf_buckets: Real-time factor buckets (None = METRICS_CONFIG)
+        """
+        self.buckets = tuple(buckets or METRICS_CONFIG['histogram_buckets'])
+        self.rtf_buckets = tuple(rtf_buckets or METRICS_CONFIG['rtf_buckets'])
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all recorded values"""
+        self._lock = threading.Lock()
+        self.stage_seconds: Dict[str, Histogram] = {}
+        self.stage_cpu_seconds: Dict[str, float] = {}
+        self.stage_errors: Dict[str, int] = {}
+        self.files = 0
+        self.audio_seconds = 0.0
+        self.real_time_factor = Histogram(self.rtf_buckets)
+
+    def record_stage(self, stage: str, wall_seconds: float, cpu_seconds: float,
+                     ok: bool) -> None:
+        with self._lock:
+            histogram = self.stage_seconds.get(stage)
+            if histogram is None:
+                histogram = self.stage_seconds[stage] = Histogram(self.buckets)
+                self.stage_cpu_seconds[stage] = 0.0
+                self.stage_errors[stage] = 0
+            histogram.observe(wall_seconds)
+            self.stage_cpu_seconds[stage] += cpu_seconds
+            if not ok:
+                self.stage_errors[stage] += 1
+
+    def record_file(self, audio_seconds: float, wall_seconds: float,
+                    real_time_factor: Optional[float]) -> None:
+        with self._lock:
+            self.files += 1
+            self.audio_seconds += audio_seconds
+            if real_time_factor is not None:
+                self.real_time_factor.observe(real_time_factor)
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            Metrics text, ending with a newline
+        """
+        p = METRIC_PREFIX
+        lines = []
+        with self._lock:
+            lines += [f'# HELP {p}_stage_seconds Wall-clock time per pipeline stage',
+                      f'# TYPE {p}_stage_seconds histogram']
+            for stage, histogram in sorted(self.stage_seconds.items()):
+                lines += _histogram_lines(f'{p}_stage_seconds', histogram,
+                                          f'stage="{stage}"')
+
+            lines += [f'# HELP {p}_stage_cpu_seconds_total CPU time per pipeline stage',
+                      f'# TYPE {p}_stage_cpu_seconds_total counter']
+            lines += [f'{p}_stage_cpu_seconds_total{{stage="{stage}"}} {seconds:.6f}'
+                      for stage, seconds in sorted(self.stage_cpu_seconds.items())]
+
+            lines += [f'# HELP {p}_stage_errors_total Stage calls that raised',
+                      f'# TYPE {p}_stage_errors_total counter']
+            lines += [f'{p}_stage_errors_total{{stage="{stage}"}} {count}'
+                      for stage, count in sorted(self.stage_errors.items())]
+
+            lines += [f'# HELP {p}_files_total Files scored',
+                      f'# TYPE {p}_files_total counter',
+                      f'{p}_files_total {self.files}',
+                      f'# HELP {p}_audio_seconds_total Seconds of audio scored',
+                      f'# TYPE {p}_audio_seconds_total counter',
+                      f'{p}_audio_seconds_total {self.audio_seconds:.3f}',
+                      f'# HELP {p}_real_time_factor Processing time per second of audio',
+                      f'# TYPE {p}_real_time_factor histogram']
+            lines += _histogram_lines(f'{p}_real_time_factor', self.real_time_factor)
+        return '\n'.join(lines) + '\n'
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str = '') -> List[str]:
+    """
+    Format one histogram's bucket, sum and count samples
+
+    Args:
+        name: Metric name
+        histogram: Histogram to format
+        labels: Extra labels, e.g. 'stage="asr"'
+
+    Returns:
+        Exposition lines
+    """
+    prefix = f'{labels},' if labels else ''
+    suffix = f'{{{labels}}}' if labels else ''
+    lines = [f'{name}_bucket{{{prefix}le="{bound:g}"}} {count}'
+             for bound, count in zip(histogram.buckets, histogram.cumulative())]
+    lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+    lines.append(f'{name}_sum{suffix} {histogram.sum:.6f}')
+    lines.append(f'{name}_count{suffix} {histogram.count}')
+    return lines
+
+
+_REGISTRY = PrometheusSink()
+_SINKS: List[MetricsSink] = [_REGISTRY]
+
+
+def get_metrics() -> PrometheusSink:
+    """
+    Get the process-wide metrics registry
+
+    Returns:
+        Shared PrometheusSink
+    """
+    return _REGISTRY
+
+
+def add_sink(sink: MetricsSink) -> None:
+    """
+    Send measurements to another sink as well as the registry
+
+    Args:
+        sink: MetricsSink implementation (e.g. a StatsD or OpenTelemetry bridge)
+    """
+    if sink not in _SINKS:
+        _SINKS.append(sink)
+
+
+def remove_sink(sink: MetricsSink) -> None:
+    """
+    Stop sending measurements to a sink
+
+    Args:
+        sink: Sink previously passed to add_sink()
+    """
+    if sink in _SINKS:
+        _SINKS.remove(sink)
+
+
+def enabled() -> bool:
+    """Whether stage timing is switched on in METRICS_CONFIG"""
+    return METRICS_CONFIG['enabled']
+
+
+class _NullContext:
+    """Shared do-nothing context used while instrumentation is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL = _NullContext()
+
+
+class _StageTimer:
+    """Times one stage call and reports it"""
+
+    __slots__ = ('name', '_wall', '_cpu')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> '_StageTimer':
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+
+        timings = _CURRENT_TIMINGS.get()
+        if timings is not None:
+            entry = timings.get(self.name)
+            if entry is None:
+                timings[self.name] = {'wall_s': wall, 'cpu_s': cpu, 'calls': 1}
+            else:
+                entry['wall_s'] += wall
+                entry['cpu_s'] += cpu
+                entry['calls'] += 1
+
+        for sink in _SINKS:
+            sink.record_stage(self.name, wall, cpu, exc_type is None)
+        return False
+
+
+def stage(name: str):
+    """
+    Time a pipeline stage
+
+    Wall time uses perf_counter and CPU time uses thread_time, so stages
+    running concurrently on other threads are not charged to this one.
+    Timings go to every sink and, inside collect(), to the item's
+    timings dictionary. Returns a shared no-op context when disabled.
+
+    Args:
+        name: Stage name, e.g. 'decode', 'asr' or 'rules'
+
+    Returns:
+        Context manager
+    """
+    if not METRICS_CONFIG['enabled']:
+        return _NULL
+    return _StageTimer(name)
+
+
+class _Collect:
+    """Makes a timings dictionary current for the calling context"""
+
+    __slots__ = ('timings', '_token')
+
+    def __init__(self, timings: Dict):
+        self.timings = timings
+
+    def __enter__(self) -> Dict:
+        self._token = _CURRENT_TIMINGS.set(self.timings)
+        return self.timings
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _CURRENT_TIMINGS.reset(self._token)
+        return False
+
+
+def collect(timings: Optional[Dict]):
+    """
+    Record nested stage() calls into an item's timings dictionary
+
+    Items move between threads in the staged and async pipelines, so each
+    step re-enters collect() with the dictionary carried on the item.
+
+    Args:
+        timings: Dictionary of stage name -> {'wall_s', 'cpu_s', 'calls'}
+                 (None = don't collect)
+
+    Returns:
+        Context manager
+    """
+    if timings is None or not METRICS_CONFIG['enabled']:
+        return _NULL
+    return _Collect(timings)
+
+
+def new_timings() -> Optional[Dict]:
+    """
+    Start a timings dictionary for one item
+
+    Returns:
+        Empty dictionary, or None while instrumentation is off
+    """
+    return {} if METRICS_CONFIG['enabled'] else None
+
+
+def summarize_timings(timings: Dict, audio_seconds: float, report: bool = True) -> Dict:
+    """
+    Build the timings block of a result and report the file to the sinks
+
+    Args:
+        timings: Stage timings collected for the item
+        audio_seconds: Duration of the scored audio
+        report: Report the file to the sinks (False for an interim summary
+                of an item whose stages are not all done)
+
+    Returns:
+        Dictionary with per-stage timings, totals and real-time factor
+    """
+    wall = sum(entry['wall_s'] for entry in timings.values())
+    cpu = sum(entry['cpu_s'] for entry in timings.values())
+    real_time_factor = wall / audio_seconds if audio_seconds > 0 else None
+
+    if report:
+        for sink in _SINKS:
+            sink.record_file(audio_seconds, wall, real_time_factor)
+
+    return {
+        'stages': {name: {'wall_s': round(entry['wall_s'], 6),
+                          'cpu_s': round(entry['cpu_s'], 6),
+                          'calls': entry['calls']}
+                   for name, entry in timings.items()},
+        'wall_s': round(wall, 6),
+        'cpu_s': round(cpu, 6),
+        'audio_seconds': round(audio_seconds, 3),
+        'real_time_factor': (round(real_time_factor, 4)
+                             if real_time_factor is not None else None),
+    }
@@ -0,0 +1,314 @@
+"""
+Model Registry Module
+Loads ASR models once per process and shares them across processors
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+try:
+    from src.config import ASR_CONFIG
+except ImportError:
+    from config import ASR_CONFIG
+
+
+ModelKey = Tuple[str, str, str]
+
+
+def resolve_device(device: str = None) -> str:
+    """
+    Resolve the device a model should be loaded on
+
+    Args:
+        device: 'cpu', 'cuda' or None for auto-detection
+
+    Returns:
+        Device name
+    """
+    device = device or ASR_CONFIG.get('device')
+    if device:
+        return device
+
+    try:
+        import torch
+        return 'cuda' if torch.cuda.is_available() else 'cpu'
+    except ImportError:
+        return 'cpu'
+
+
+def resolve_dtype(device: str, dtype: str = None) -> str:
+    """
+    Resolve the weight precision for a device
+
+    Args:
+        device: Device the model runs on
+        dtype: 'float16', 'float32' or None for the device default
+
+    Returns:
+        Data type name
+    """
+    dtype = dtype or ASR_CONFIG.get('dtype')
+    if dtype:
+        return dtype
+
+    # Half precision is only worthwhile (and supported by Whisper) on GPU
+    return 'float16' if device.startswith('cuda') else 'float32'
+
+
+def load_whisper_model(model_size: str, device: str, dtype: str):
+    """
+    Load a Whisper model from disk
+
+    Args:
+        model_size: Whisper model name ('tiny', 'base', ...)
+        device: Device to load the weights on
+        dtype: Weight precision
+
+    Returns:
+        Loaded Whisper model
+    """
+    import whisper
+
+    model = whisper.load_model(model_size, device=device)
+    if dtype == 'float16':
+        model = model.half()
+    return model
+
+
+def estimate_model_size_mb(model) -> float:
+    """
+    Estimate the memory held by a model's parameters and buffers
+
+    Args:
+        model: Loaded model
+
+    Returns:
+        Size in megabytes (0 if it cannot be determined)
+    """
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        total_bytes = sum(t.numel() * t.element_size() for t in tensors)
+        return total_bytes / (1024 * 1024)
+    except AttributeError:
+        return 0.0
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded ASR models"""
+
+    def __init__(self, max_memory_mb: float = None,
+                 loader: Callable = None):
+        """
+        Initialize ModelRegistry
+
+        Args:
+            max_memory_mb: Memory cap for all cached models (None = unlimited)
+            loader: Callable (model_size, device, dtype) -> model
+        """
+        self.max_memory_mb = max_memory_mb
+        self._loader = loader or load_whisper_model
+        self._models: 'OrderedDict[ModelKey, Tuple[object, float]]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    def make_key(self, model_size: str = None, device: str = None,
+                 dtype: str = None) -> ModelKey:
+        """
+        Build the cache key for a model request
+
+        Args:
+            model_size: Whisper model name
+            device: Device name
+            dtype: Weight precision
+
+        Returns:
+            Tuple of (model_size, device, dtype)
+        """
+        model_size = model_size or ASR_CONFIG['model_size']
+        device = resolve_device(device)
+        dtype = resolve_dtype(device, dtype)
+        return model_size, device, dtype
+
+    def get_model(self, model_size: str = None, device: str = None,
+                  dtype: str = None):
+        """
+        Return a warm model, loading it on first use
+
+        Args:
+            model_size: Whisper model name
+            device: Device name
+            dtype: Weight precision
+
+        Returns:
+            Loaded model
+        """
+        key = self.make_key(model_size, device, dtype)
+
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+
+            model = self._loader(*key)
+            self._models[key] = (model, estimate_model_size_mb(model))
+            self._enforce_memory_cap(keep=key)
+            return model
+
+    def preload(self, model_sizes: List[str] = None, device: str = None,
+                dtype: str = None) -> List[ModelKey]:
+        """
+        Load models ahead of the first transcription
+
+        Args:
+            model_sizes: Model names to load (default: configured model)
+            device: Device name
+            dtype: Weight precision
+
+        Returns:
+            Keys of the loaded models
+        """
+        model_sizes = model_sizes or [ASR_CONFIG['model_size']]
+        keys = []
+        for model_size in model_sizes:
+            self.get_model(model_size, device, dtype)
+            keys.append(self.make_key(model_size, device, dtype))
+        return keys
+
+    def evict(self, model_size: str = None, device: str = None,
+              dtype: str = None) -> bool:
+        """
+        Drop a model from the registry
+
+        Args:
+            model_size: Whisper model name
+            device: Device name
+            dtype: Weight precision
+
+        Returns:
+            True if a model was evicted
+        """
+        key = self.make_key(model_size, device, dtype)
+        with self._lock:
+            if key not in self._models:
+                return False
+            del self._models[key]
+        _release_device_memory(key[1])
+        return True
+
+    def clear(self) -> None:
+        """Drop every cached model"""
+        with self._lock:
+            devices = {key[1] for key in self._models}
+            self._models.clear()
+        for device in devices:
+            _release_device_memory(device)
+
+    def memory_usage_mb(self) -> float:
+        """
+        Get the memory held by cached models
+
+        Returns:
+            Size in megabytes
+        """
+        with self._lock:
+            return sum(size for _, size in self._models.values())
+
+    def loaded_models(self) -> List[ModelKey]:
+        """
+        List cached models from least to most recently used
+
+        Returns:
+            List of model keys
+        """
+        with self._lock:
+            return list(self._models.keys())
+
+    def _enforce_memory_cap(self, keep: ModelKey) -> None:
+        """
+        Evict least recently used models until under the memory cap
+
+        Args:
+            keep: Key that must stay loaded (the model just requested)
+        """
+        if self.max_memory_mb is None:
+            return
+
+        evicted_devices = set()
+        for key in list(self._models.keys()):
+            if self.memory_usage_mb() <= self.max_memory_mb:
+                break
+            if key == keep:
+                continue
+            del self._models[key]
+            evicted_devices.add(key[1])
+
+        for device in evicted_devices:
+            _release_device_memory(device)
+
+
+def _release_device_memory(device: str) -> None:
+    """
+    Return cached allocator memory to the GPU after an eviction
+
+    Args:
+        device: Device the evicted model lived on
+    """
+    if not device.startswith('cuda'):
+        return
+    try:
+        import torch
+        torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+_REGISTRY: Optional[ModelRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """
+    Get the process-wide model registry
+
+    Returns:
+        Shared ModelRegistry instance
+    """
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = ModelRegistry(
+                    max_memory_mb=ASR_CONFIG.get('max_model_memory_mb')
+                )
+    return _REGISTRY
+
+
+def get_model(model_size: str = None, device: str = None, dtype: str = None):
+    """
+    Get a warm model from the process-wide registry
+
+    Args:
+        model_size: Whisper model name
+        device: Device name
+        dtype: Weight precision
+
+    Returns:
+        Loaded model
+    """
+    return get_registry().get_model(model_size, device, dtype)
+
+
+def preload_models(model_sizes: List[str] = None, device: str = None,
+                   dtype: str = None) -> List[ModelKey]:
+    """
+    Preload models into the process-wide registry at startup
+
+    Args:
+        model_sizes: Model names to load (default: configured model)
+        device: Device name
+        dtype: Weight precision
+
+    Returns:
+        Keys of the loaded models
+    """
+    return get_registry().preload(model_sizes, device, dtype)
@@ -0,0 +1,203 @@
+"""
+NLP Resources Module
+Process-wide NLTK models shared by every text processor
+
+NLTK is imported on first use and reads its data from the configured
+local directory (NLP_CONFIG['nltk_data_dir']) ahead of NLTK's default
+search path. Resources are never downloaded; a missing resource raises
+LookupError naming the directory to install it into.
+"""
+
+import os
+import threading
+from typing import TYPE_CHECKING, FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+    from src.config import NLP_CONFIG
+except ImportError:
+    from config import NLP_CONFIG
+
+if TYPE_CHECKING:
+    from nltk.tag.perceptron import PerceptronTagger
+
+
+# NLTK data each feature needs; newer NLTK releases ship the first
+# alternative, older ones the second
+NLTK_RESOURCES = {
+    'punkt': ('tokenizers/punkt_tab/english/', 'tokenizers/punkt'),
+    'tagger': ('taggers/averaged_perceptron_tagger_eng/',
+               'taggers/averaged_perceptron_tagger'),
+    'stopwords': ('corpora/stopwords',),
+}
+
+_LOCK = threading.Lock()
+_NLTK = None
+_TAGGER: Optional['PerceptronTagger'] = None
+_STOPWORDS: Optional[FrozenSet[str]] = None
+
+
+def load_nltk():
+    """
+    Import NLTK and put the configured data directory first on its path
+
+    Returns:
+        The nltk module
+    """
+    global _NLTK
+    if _NLTK is None:
+        with _LOCK:
+            if _NLTK is None:
+                import nltk
+                data_dir = NLP_CONFIG.get('nltk_data_dir')
+                if data_dir:
+                    data_dir = os.path.abspath(data_dir)
+                    if data_dir not in nltk.data.path:
+                        nltk.data.path.insert(0, data_dir)
+                _NLTK = nltk
+    return _NLTK
+
+
+def missing_nltk_resources() -> List[str]:
+    """
+    List the NLTK resources that cannot be found locally
+
+    Returns:
+        Names from NLTK_RESOURCES with none of their paths installed
+    """
+    nltk = load_nltk()
+    missing = []
+    for name, paths in NLTK_RESOURCES.items():
+        for path in paths:
+            try:
+                nltk.data.find(path)
+                break
+            except LookupError:
+                continue
+        else:
+            missing.append(name)
+    return missing
+
+
+def _resource_error(name: str, error: LookupError) -> LookupError:
+    """
+    Build an actionable error for a missing NLTK resource
+
+    Args:
+        name: Key of NLTK_RESOURCES
+        error: Error raised by NLTK
+
+    Returns:
+        LookupError pointing at the local data directory
+    """
+    package = NLTK_RESOURCES[name][0].split('/')[1]
+    data_dir = os.path.abspath(NLP_CONFIG.get('nltk_data_dir') or 'nltk_data')
+    return LookupError(
+        f"NLTK resource '{package}' not found and downloads are disabled. "
+        f"Install it with: python -m nltk.downloader -d {data_dir} {package}\n"
+        f"{error}"
+    )
+
+
+def get_tagger() -> 'PerceptronTagger':
+    """
+    Get the process-wide POS tagger, loading it on first use
+
+    Returns:
+        Shared averaged perceptron tagger (the model behind nltk.pos_tag)
+    """
+    global _TAGGER
+    if _TAGGER is None:
+        load_nltk()
+        with _LOCK:
+            if _TAGGER is None:
+                from nltk.tag.perceptron import PerceptronTagger
+                try:
+                    _TAGGER = PerceptronTagger()
+                except LookupError as e:
+                    raise _resource_error('tagger', e) from None
+    return _TAGGER
+
+
+def get_stopwords() -> FrozenSet[str]:
+    """
+    Get the English stopword list, loading it on first use
+
+    Returns:
+        Lowercase stopwords
+    """
+    global _STOPWORDS
+    if _STOPWORDS is None:
+        load_nltk()
+        from nltk.corpus import stopwords
+        try:
+            _STOPWORDS = frozenset(stopwords.words('english'))
+        except LookupError as e:
+            raise _resource_error('stopwords', e) from None
+    return _STOPWORDS
+
+
+def sent_tokenize(text: str) -> List[str]:
+    """
+    Split text into sentences with NLTK's Punkt tokenizer
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of sentences
+    """
+    load_nltk()
+    from nltk.tokenize import sent_tokenize as nltk_sent_tokenize
+    try:
+        return nltk_sent_tokenize(text)
+    except LookupError as e:
+        raise _resource_error('punkt', e) from None
+
+
+def word_tokenize(text: str, preserve_line: bool = False) -> List[str]:
+    """
+    Split text into word tokens, identical to nltk.word_tokenize
+
+    Args:
+        text: Input text
+        preserve_line: Treat text as a single sentence
+
+    Returns:
+        List of tokens
+    """
+    load_nltk()
+    from nltk.tokenize import word_tokenize as nltk_word_tokenize
+    try:
+        return nltk_word_tokenize(text, preserve_line=preserve_line)
+    except LookupError as e:
+        raise _resource_error('punkt', e) from None
+
+
+def tag_tokens(tokens: Sequence[str]) -> List[Tuple[str, str]]:
+    """
+    POS-tag one token sequence
+
+    Args:
+        tokens: Word tokens
+
+    Returns:
+        List of (word, pos_tag) tuples, identical to nltk.pos_tag(tokens)
+    """
+    return get_tagger().tag(list(tokens))
+
+
+def tag_token_lists(token_lists: Sequence[Sequence[str]]) -> List[List[Tuple[str, str]]]:
+    """
+    POS-tag many token sequences in one call
+
+    Each sequence is tagged on its own, so results are identical to
+    nltk.pos_tag_sents(token_lists) and aligned with the input.
+
+    Args:
+        token_lists: Word tokens of each transcript or sentence
+
+    Returns:
+        List of (word, pos_tag) lists, one per input sequence
+    """
+    tagger = get_tagger()
+    return tagger.tag_sents([list(tokens) for tokens in token_lists])
@@ -0,0 +1,514 @@
+"""
+Scoring Pipeline Module
+Runs the audio -> text -> grammar scoring steps with reusable processors
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from src.config import (ASR_CONFIG, AUDIO_CONFIG, BATCH_CONFIG, METRICS_CONFIG,
+                            PIPELINE_CONFIG)
+    from src import instrumentation
+    from src.audio_processor import AudioProcessor
+    from src.text_processor import TextProcessor
+    from src.grammar_scorer import GrammarScorer
+    from src.model_registry import preload_models
+    from src.result_model import ComponentScores, ErrorSummary, ScoringResult, Statistics
+    from src.staged_pipeline import StagedPipeline
+    from src.utils import save_results
+except ImportError:
+    from config import (ASR_CONFIG, AUDIO_CONFIG, BATCH_CONFIG, METRICS_CONFIG,
+                        PIPELINE_CONFIG)
+    import instrumentation
+    from audio_processor import AudioProcessor
+    from text_processor import TextProcessor
+    from grammar_scorer import GrammarScorer
+    from model_registry import preload_models
+    from result_model import ComponentScores, ErrorSummary, ScoringResult, Statistics
+    from staged_pipeline import StagedPipeline
+    from utils import save_results
+
+
+class ScoringPipeline:
+    """Score audio files with one warm set of processors"""
+
+    def __init__(self, audio_processor: AudioProcessor = None,
+                 text_processor: TextProcessor = None,
+                 grammar_scorer: GrammarScorer = None,
+                 logger: logging.Logger = None):
+        """
+        Initialize ScoringPipeline
+
+        Args:
+            audio_processor: Audio processor to reuse
+            text_processor: Text processor to reuse
+            grammar_scorer: Grammar scorer to reuse
+            logger: Logger for step progress (default: module logger)
+        """
+        self.audio_processor = audio_processor or AudioProcessor()
+        self.text_processor = text_processor or TextProcessor()
+        self.grammar_scorer = grammar_scorer or GrammarScorer()
+        self.logger = logger or logging.getLogger(__name__)
+
+    def warm_up(self) -> None:
+        """Load the ASR model ahead of the first file"""
+        if ASR_CONFIG['engine'] == 'whisper':
+            preload_models()
+
+    def decode(self, audio_path: str) -> Optional[Dict]:
+        """
+        Decode an audio file once and compute its audio metrics
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            Dictionary with the decoded signals and audio metrics
+        """
+        self.logger.info("Step 1: Loading and preprocessing audio...")
+        timings = instrumentation.new_timings()
+        with instrumentation.collect(timings):
+            if self._should_stream(audio_path):
+                item = self._decode_streaming(audio_path)
+            else:
+                item = self._decode_in_memory(audio_path)
+        if item is not None:
+            item['timings'] = timings
+        return item
+
+    def _decode_in_memory(self, audio_path: str) -> Optional[Dict]:
+        """
+        Decode a whole file and compute its audio metrics
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            Dictionary with the decoded signals and audio metrics
+        """
+        with instrumentation.stage('decode'):
+            raw_audio, sr = self.audio_processor.load_audio(audio_path)
+        if raw_audio is None:
+            self.logger.error(f"Failed to load audio: {audio_path}")
+            return None
+        with instrumentation.stage('trim'):
+            audio = self.audio_processor.preprocess_signal(raw_audio, sr)
+
+        with instrumentation.stage('features'):
+            duration = self.audio_processor.get_duration(audio, sr)
+            pause_count = self.audio_processor.get_pause_count(audio, sr)
+        self.logger.info(f"Audio duration: {duration:.2f}s, "
+                         f"Pauses detected: {pause_count}")
+
+        return {
+            'audio_path': audio_path,
+            'asr_audio': audio if ASR_CONFIG['use_trimmed_audio'] else raw_audio,
+            'sample_rate': sr,
+            'duration': duration,
+            'pause_count': pause_count,
+        }
+
+    def _should_stream(self, audio_path: str) -> bool:
+        """
+        Check whether a file is long enough to analyze in blocks
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            True if the file should be streamed
+        """
+        min_duration = AUDIO_CONFIG['stream_min_duration']
+        if min_duration is None:
+            return False
+        duration = self.audio_processor.get_file_duration(audio_path)
+        return duration is not None and duration > min_duration
+
+    def _decode_streaming(self, audio_path: str) -> Optional[Dict]:
+        """
+        Compute audio metrics of a long file with bounded memory
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            Dictionary with audio metrics; ASR reads the file itself
+        """
+        # Blocks are decoded, trimmed and analyzed together
+        with instrumentation.stage('decode'):
+            stats = self.audio_processor.analyze_stream(audio_path)
+        if stats is None:
+            self.logger.error(f"Failed to load audio: {audio_path}")
+            return None
+
+        duration = (stats['trimmed_duration'] if AUDIO_CONFIG['remove_silence']
+                    else stats['duration'])
+        self.logger.info(f"Audio duration: {duration:.2f}s, "
+                         f"Pauses detected: {stats['pause_count']} (streamed)")
+
+        return {
+            'audio_path': audio_path,
+            'asr_audio': audio_path,
+            'sample_rate': None,
+            'duration': duration,
+            'pause_count': stats['pause_count'],
+        }
+
+    def transcribe(self, item: Dict) -> Optional[Dict]:
+        """
+        Run speech-to-text on a decoded item
+
+        Args:
+            item: Output of decode()
+
+        Returns:
+            The item with its transcript added
+        """
+        self.logger.info("Step 2: Converting speech to text...")
+        with instrumentation.collect(item.get('timings')), \
+                instrumentation.stage('asr'):
+            transcript = self.text_processor.speech_to_text(
+                item['asr_audio'], sample_rate=item['sample_rate']
+            )
+        if not transcript:
+            self.logger.error("Failed to transcribe audio")
+            return None
+        self.logger.info(f"Transcript: {transcript}")
+
+        item['transcript'] = transcript
+        return item
+
+    def score(self, item: Dict, output_dir: str = None) -> ScoringResult:
+        """
+        Run text analysis and grammar scoring on a transcribed item
+
+        Args:
+            item: Output of transcribe()
+            output_dir: Directory to save the JSON result to (None = don't
+                        save); saving is timed as the item's 'save' stage
+
+        Returns:
+            ScoringResult
+        """
+        self.logger.info("Step 3: Preprocessing text...")
+        with instrumentation.collect(item.get('timings')):
+            text_data = self.text_processor.preprocess_text(item['transcript'])
+            result = self._score_text_data(item, text_data)
+            if output_dir:
+                self._save(item, result, output_dir)
+        self._finish_timings(item, result)
+        return result
+
+    def score_batch(self, items: List[Dict]) -> List[ScoringResult]:
+        """
+        Score many transcribed items, POS-tagging them in one batch
+
+        Args:
+            items: Outputs of transcribe()
+
+        Returns:
+            Scoring results aligned with items
+        """
+        self.logger.info(f"Step 3: Preprocessing {len(items)} texts...")
+        text_data = self.text_processor.preprocess_texts(
+            [item['transcript'] for item in items]
+        )
+        results = []
+        for item, data in zip(items, text_data):
+            with instrumentation.collect(item.get('timings')):
+                result = self._score_text_data(item, data)
+            self._finish_timings(item, result)
+            results.append(result)
+        return results
+
+    def _score_text_data(self, item: Dict, text_data: Dict) -> ScoringResult:
+        """
+        Score grammar of a preprocessed transcript
+
+        Args:
+            item: Output of transcribe()
+            text_data: Output of preprocess_text() for the transcript
+
+        Returns:
+            ScoringResult
+        """
+        transcript = item['transcript']
+
+        self.logger.info("Step 4: Scoring grammar...")
+        scoring_result = self.grammar_scorer.score_grammar(
+            transcript,
+            item['duration'],
+            item['pause_count'],
+            text_data['pos_tags'],
+            document=text_data['transcript_document']
+        )
+
+        return self.make_result(item, scoring_result)
+
+    def _save(self, item: Dict, result: ScoringResult, output_dir: str) -> None:
+        """
+        Save a scored item's JSON result
+
+        A file cannot hold the time taken to write it, so attached timings
+        in the file cover the stages up to the save.
+
+        Args:
+            item: Output of transcribe()
+            result: The item's result
+            output_dir: Results directory
+        """
+        timings = item.get('timings')
+        if timings is not None and METRICS_CONFIG['attach_timings']:
+            result.timings = instrumentation.summarize_timings(
+                timings, item['duration'], report=False
+            )
+        save_result_json(result, item['audio_path'], output_dir)
+
+    def _finish_timings(self, item: Dict, result: ScoringResult) -> None:
+        """
+        Summarize a finished item's timings, saving included
+
+        Args:
+            item: Output of transcribe()
+            result: The item's result (timings attached if configured)
+        """
+        timings = item.get('timings')
+        if timings is not None:
+            summary = instrumentation.summarize_timings(timings, item['duration'])
+            if METRICS_CONFIG['attach_timings']:
+                result.timings = summary
+
+    def make_result(self, item: Dict, scoring_result: Dict) -> ScoringResult:
+        """
+        Build the result of a scored item
+
+        Args:
+            item: Output of transcribe()
+            scoring_result: Output of GrammarScorer.score_grammar
+
+        Returns:
+            ScoringResult (reads like the result dictionary; to_dict()
+            gives the dictionary itself)
+        """
+        return ScoringResult(
+            audio_file=os.path.basename(item['audio_path']),
+            transcript=item['transcript'],
+            audio_duration=round(item['duration'], 2),
+            pauses_detected=item['pause_count'],
+            final_score=scoring_result['final_score'],
+            components=ComponentScores.from_dict(scoring_result['components']),
+            errors=ErrorSummary.from_dict(scoring_result['errors']),
+            statistics=Statistics.from_dict(scoring_result['statistics']),
+        )
+
+    def score_file(self, audio_path: str,
+                   output_dir: str = None) -> Optional[ScoringResult]:
+        """
+        Score a single audio file end to end
+
+        Args:
+            audio_path: Path to audio file
+            output_dir: Directory to save the JSON result to (None = don't save)
+
+        Returns:
+            ScoringResult, or None on failure
+        """
+        item = self.decode(audio_path)
+        if item is None:
+            return None
+
+        item = self.transcribe(item)
+        if item is None:
+            return None
+
+        return self.score(item, output_dir)
+
+
+def save_result_json(result: ScoringResult, audio_path: str, output_dir: str) -> str:
+    """
+    Save one result next to the others in the results directory
+
+    Args:
+        result: Result dictionary
+        audio_path: Path of the scored audio file
+        output_dir: Results directory
+
+    Returns:
+        Path of the written file
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir,
+                               Path(audio_path).stem + '_results.json')
+    with instrumentation.stage('save'):
+        save_results(result, output_path, format='json')
+    return output_path
+
+
+# Per-process pipeline used by pool workers
+_WORKER_PIPELINE: Optional[ScoringPipeline] = None
+_WORKER_OUTPUT_DIR: Optional[str] = None
+
+
+def batch_pipeline(logger: logging.Logger = None) -> ScoringPipeline:
+    """
+    Build a pipeline for bulk scoring
+
+    Args:
+        logger: Logger for step progress (default: module logger)
+
+    Returns:
+        ScoringPipeline reporting error positions as BATCH_CONFIG says
+    """
+    return ScoringPipeline(
+        grammar_scorer=GrammarScorer(error_positions=BATCH_CONFIG['error_positions']),
+        logger=logger,
+    )
+
+
+def _init_worker(output_dir: str, threads_per_worker: int,
+                 batch: bool = False) -> None:
+    """
+    Build and warm the worker's pipeline once per process
+
+    Args:
+        output_dir: Directory to save results to
+        threads_per_worker: Intra-op threads each worker may use
+        batch: Build a bulk-scoring pipeline (see batch_pipeline)
+    """
+    global _WORKER_PIPELINE, _WORKER_OUTPUT_DIR
+
+    # Keep N workers from each spawning one math thread per core
+    try:
+        import torch
+        torch.set_num_threads(threads_per_worker)
+    except ImportError:
+        pass
+
+    _WORKER_PIPELINE = batch_pipeline() if batch else ScoringPipeline()
+    _WORKER_PIPELINE.warm_up()
+    _WORKER_OUTPUT_DIR = output_dir
+
+
+def _score_in_worker(audio_path: str) -> Optional[ScoringResult]:
+    """
+    Score one file with the worker's warm pipeline
+
+    Args:
+        audio_path: Path to audio file
+
+    Returns:
+        Dictionary with scoring results, or None on failure
+    """
+    try:
+        return _WORKER_PIPELINE.score_file(audio_path, _WORKER_OUTPUT_DIR)
+    except Exception as e:
+        print(f"Error scoring {audio_path}: {e}")
+        return None
+
+
+def resolve_workers(workers: int = None) -> int:
+    """
+    Resolve the number of worker processes to use
+
+    Args:
+        workers: Requested workers (None = config, 0 = one per CPU)
+
+    Returns:
+        Number of worker processes
+    """
+    workers = BATCH_CONFIG['workers'] if workers is None else workers
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def score_files_parallel(audio_paths: List[str], output_dir: str = None,
+                         workers: int = None, chunksize: int = None,
+                         on_result: Callable[[str, Optional[ScoringResult]], None] = None
+                         ) -> List[Optional[ScoringResult]]:
+    """
+    Score files on a pool of worker processes
+
+    Each worker builds its own batch_pipeline() once.
+
+    Args:
+        audio_paths: Paths of the audio files to score
+        output_dir: Directory to save JSON results to (None = don't save)
+        workers: Number of worker processes (None = config, 0 = one per CPU)
+        chunksize: Files handed to a worker at a time (None = config)
+        on_result: Called in this process with (audio_path, result or None)
+                   as each file finishes, in input order
+
+    Returns:
+        Results in the same order as audio_paths (None for failed files)
+    """
+    workers = resolve_workers(workers)
+    chunksize = chunksize or BATCH_CONFIG['chunksize']
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker,
+                             initargs=(output_dir, threads_per_worker, True)) as executor:
+        results = []
+        for audio_path, result in zip(audio_paths,
+                                      executor.map(_score_in_worker, audio_paths,
+                                                   chunksize=chunksize)):
+            if on_result is not None:
+                on_result(audio_path, result)
+            results.append(result)
+        return results
+
+
+def score_files_pipelined(audio_paths: List[str], output_dir: str = None,
+                          pipeline: ScoringPipeline = None,
+                          decode_workers: int = None, asr_workers: int = None,
+                          nlp_workers: int = None, queue_size: int = None,
+                          on_result: Callable[[str, ScoringResult], None] = None
+                          ) -> Tuple[List[Optional[ScoringResult]], StagedPipeline]:
+    """
+    Score files with decode, ASR and NLP stages running concurrently
+
+    Decoding of the next files and scoring of the previous file happen
+    while ASR is busy, connected by bounded queues so no stage can run
+    arbitrarily far ahead.
+
+    Args:
+        audio_paths: Paths of the audio files to score
+        output_dir: Directory to save JSON results to (None = don't save)
+        pipeline: Warm pipeline whose processors the stages share
+                  (default: batch_pipeline())
+        decode_workers: Decode/feature threads (None = PIPELINE_CONFIG)
+        asr_workers: Speech-to-text threads (None = PIPELINE_CONFIG)
+        nlp_workers: Text analysis/scoring threads (None = PIPELINE_CONFIG)
+        queue_size: Capacity of each inter-stage queue (None = PIPELINE_CONFIG)
+        on_result: Called from the NLP threads with (audio_path, result) as
+                   each file is scored; files dropped earlier are not reported
+
+    Returns:
+        Tuple of (results in input order, the StagedPipeline with its stats)
+    """
+    pipeline = pipeline or batch_pipeline()
+
+    def score_and_save(item: Dict) -> ScoringResult:
+        result = pipeline.score(item, output_dir)
+        if on_result is not None:
+            on_result(item['audio_path'], result)
+        return result
+
+    staged = StagedPipeline(
+        [
+            ('decode', pipeline.decode,
+             decode_workers or PIPELINE_CONFIG['decode_workers']),
+            ('asr', pipeline.transcribe,
+             asr_workers or PIPELINE_CONFIG['asr_workers']),
+            ('nlp', score_and_save,
+             nlp_workers or PIPELINE_CONFIG['nlp_workers']),
+        ],
+        queue_size=queue_size,
+    )
+    results = staged.run(audio_paths)
+    return results, staged
@@ -0,0 +1,419 @@
+"""
+Reporting Module
+Chunked, column-wise report building from result lists, JSONL logs and
+results stores, written incrementally to CSV or Parquet
+"""
+
+import os
+import json
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from src.config import RESULTS_CONFIG
+    from src.results_store import ResultsStore, _import_pyarrow, is_results_store
+    from src.run_manifest import read_jsonl
+except ImportError:
+    from config import RESULTS_CONFIG
+    from results_store import ResultsStore, _import_pyarrow, is_results_store
+    from run_manifest import read_jsonl
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# (report column, dotted path in the result, dtype)
+ReportColumn = Tuple[str, str, str]
+
+REPORT_COLUMNS: Tuple[ReportColumn, ...] = (
+    ('audio_file', 'audio_file', 'object'),
+    ('grammar_score', 'final_score', 'float64'),
+    ('grammar_component', 'components.grammar', 'float64'),
+    ('fluency_component', 'components.fluency', 'float64'),
+    ('clarity_component', 'components.clarity', 'float64'),
+    ('complexity_component', 'components.complexity', 'float64'),
+    ('total_errors', 'errors.total_errors', 'int64'),
+    ('total_words', 'statistics.total_words', 'int64'),
+)
+
+DETAILED_REPORT_COLUMNS: Tuple[ReportColumn, ...] = (
+    ('audio_file', 'audio_file', 'object'),
+    ('final_score', 'final_score', 'float64'),
+    ('grammar_score', 'components.grammar', 'float64'),
+    ('fluency_score', 'components.fluency', 'float64'),
+    ('clarity_score', 'components.clarity', 'float64'),
+    ('complexity_score', 'components.complexity', 'float64'),
+    ('total_errors', 'errors.total_errors', 'int64'),
+    ('total_words', 'statistics.total_words', 'int64'),
+    ('total_sentences', 'statistics.total_sentences', 'int64'),
+    ('transcript', 'transcript', 'object'),
+)
+
+# Value used for a field missing from a result
+_DEFAULTS = {'object': '', 'float64': 0.0, 'int64': 0}
+
+ResultSource = Union[Iterable[Dict], ResultsStore, str]
+
+
+def flatten_results(results: List[Dict],
+                    columns: Iterable[ReportColumn] = REPORT_COLUMNS) -> 'pd.DataFrame':
+    """
+    Flatten nested result dictionaries into typed report columns
+
+    Each column is built in one pass over the chunk, and each nested
+    dictionary (components, errors, ...) is looked up once per result
+    rather than once per field. Missing fields and fields set to None get
+    the column default.
+
+    Args:
+        results: Result dictionaries
+        columns: Report columns to build
+
+    Returns:
+        DataFrame with one typed column per report column
+    """
+    import pandas as pd
+
+    parents: Dict[str, List[Dict]] = {}
+    data = {}
+    for name, path, dtype in columns:
+        parent, _, key = path.rpartition('.')
+        if parent:
+            if parent not in parents:
+                parents[parent] = [result.get(parent) or {} for result in results]
+            source = parents[parent]
+        else:
+            source = results
+
+        values = [item.get(key) for item in source]
+        if None in values:
+            default = _DEFAULTS[dtype]
+            values = [default if value is None else value for value in values]
+        # A Series keeps the object dtype that pandas would infer away
+        data[name] = (pd.Series(values, dtype=dtype) if dtype == 'object'
+                      else np.array(values, dtype=dtype))
+    return pd.DataFrame(data)
+
+
+def iter_result_chunks(source: ResultSource,
+                       chunksize: int = None) -> Iterator[List[Dict]]:
+    """
+    Read results in chunks from any supported source
+
+    Args:
+        source: Result dictionaries (list or iterable), a ResultsStore, or
+                a path to a store directory, JSONL log, JSON or CSV file
+        chunksize: Results per chunk (None = RESULTS_CONFIG)
+
+    Yields:
+        Lists of result dictionaries
+    """
+    chunksize = chunksize or RESULTS_CONFIG['report_chunksize']
+
+    if isinstance(source, str):
+        if is_results_store(source):
+            source = ResultsStore(source)
+        elif source.endswith('.csv'):
+            import pandas as pd
+            for frame in pd.read_csv(source, chunksize=chunksize):
+                yield frame.to_dict('records')
+            return
+        elif source.endswith('.jsonl'):
+            source = read_jsonl(source)
+        elif source.endswith('.json'):
+            with open(source, 'r') as f:
+                loaded = json.load(f)
+            source = loaded if isinstance(loaded, list) else [loaded]
+        else:
+            raise ValueError("Unsupported file format")
+
+    if isinstance(source, ResultsStore):
+        source = source.iter_results()
+
+    iterator = iter(source)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_report_frames(source: ResultSource,
+                       columns: Iterable[ReportColumn] = REPORT_COLUMNS,
+                       chunksize: int = None) -> Iterator['pd.DataFrame']:
+    """
+    Build report columns chunk by chunk
+
+    Results stores are read column-wise: only the report's columns are
+    loaded and nothing is rebuilt into dictionaries. JSONL logs are parsed
+    the same way by pyarrow when it is installed.
+
+    Args:
+        source: Anything iter_result_chunks() accepts
+        columns: Report columns to build
+        chunksize: Results per chunk (None = RESULTS_CONFIG)
+
+    Yields:
+        DataFrame per chunk
+    """
+    columns = tuple(columns)
+    if isinstance(source, str) and is_results_store(source):
+        source = ResultsStore(source)
+
+    if isinstance(source, ResultsStore):
+        paths = list(dict.fromkeys(path for _, path, _ in columns))
+        for batch in source.iter_batches(paths, chunksize or RESULTS_CONFIG['report_chunksize']):
+            frame = batch.to_pandas()
+            yield _typed_frame({name: frame[path] for name, path, _ in columns}, columns)
+        return
+
+    if isinstance(source, str) and source.endswith('.jsonl'):
+        yield from _iter_jsonl_frames(source, columns, chunksize)
+        return
+
+    for chunk in iter_result_chunks(source, chunksize):
+        yield flatten_results(chunk, columns)
+
+
+def _iter_jsonl_frames(path: str, columns: Tuple[ReportColumn, ...],
+                       chunksize: int = None) -> Iterator['pd.DataFrame']:
+    """
+    Build report columns from a JSONL log, parsing only the report fields
+
+    pyarrow parses the log into typed columns without building a
+    dictionary per record. Records are deduplicated as read_jsonl does.
+    Without pyarrow, or if a record does not fit the report types, the
+    log is read through read_jsonl instead.
+
+    Args:
+        path: JSONL log
+        columns: Report columns to build
+        chunksize: Results per chunk (None = RESULTS_CONFIG)
+
+    Yields:
+        DataFrame per chunk
+    """
+    chunksize = chunksize or RESULTS_CONFIG['report_chunksize']
+    yielded = 0
+    try:
+        pa = _import_pyarrow()
+        import pyarrow.json as pj
+        open_json = pj.open_json
+    except (ImportError, AttributeError):
+        open_json = None
+
+    if open_json is not None and os.path.exists(path):
+        try:
+            buffer = _complete_lines(pa, path)
+            keep = _last_records(pa, pj, buffer)
+            schema = _json_schema(pa, columns)
+            options = pj.ParseOptions(explicit_schema=schema,
+                                      unexpected_field_behavior='ignore')
+            row = 0
+            for batch in open_json(pa.BufferReader(buffer), parse_options=options):
+                table = pa.Table.from_batches([batch]).flatten()
+                if keep is not None:
+                    table = table.filter(keep[row:row + table.num_rows])
+                row += batch.num_rows
+                for start in range(0, table.num_rows, chunksize):
+                    frame = table.slice(start, chunksize).to_pandas()
+                    yield _typed_frame({name: frame[field] for name, field, _ in columns},
+                                       columns)
+                    yielded += min(chunksize, table.num_rows - start)
+            return
+        except pa.ArrowInvalid:
+            pass
+
+    results = islice(read_jsonl(path), yielded, None)
+    for chunk in iter_result_chunks(results, chunksize):
+        yield flatten_results(chunk, columns)
+
+
+def _complete_lines(pa, path: str) -> 'pa.Buffer':
+    """
+    Memory-map a JSONL file up to its last complete line
+
+    Args:
+        pa: The pyarrow module
+        path: JSONL file
+
+    Returns:
+        Buffer of the complete lines (a torn last line is left out)
+    """
+    source = pa.memory_map(path)
+    buffer = source.read_buffer()
+    data = memoryview(buffer)
+    end = len(data)
+    while end and data[end - 1] != ord('\n'):
+        end -= 1
+    return buffer.slice(0, end)
+
+
+def _last_records(pa, pj, buffer: 'pa.Buffer') -> Optional['pa.Array']:
+    """
+    Find the last record of each input in a JSONL log
+
+    Args:
+        pa: The pyarrow module
+        pj: The pyarrow.json module
+        buffer: Complete lines of the log
+
+    Returns:
+        Boolean mask of the records to keep, or None to keep them all
+    """
+    import pandas as pd
+
+    options = pj.ParseOptions(explicit_schema=pa.schema([('content_hash', pa.string())]),
+                              unexpected_field_behavior='ignore')
+    hashes = pj.read_json(pa.BufferReader(buffer), parse_options=options)
+    hashes = hashes.column('content_hash').to_pandas()
+    # Records without a content hash are always kept, as in read_jsonl
+    superseded = hashes.duplicated(keep='last') & hashes.notna()
+    if not superseded.any():
+        return None
+    return pa.array(~superseded.to_numpy())
+
+
+def _json_schema(pa, columns: Tuple[ReportColumn, ...]) -> 'pa.Schema':
+    """
+    Arrow schema of the nested result fields a report reads
+
+    Args:
+        pa: The pyarrow module
+        columns: Report columns
+
+    Returns:
+        Schema of nested structs matching the dotted paths
+    """
+    types = {'object': pa.string(), 'float64': pa.float64(), 'int64': pa.int64()}
+    nested: Dict[str, object] = {}
+    for _, path, dtype in columns:
+        *parents, key = path.split('.')
+        level = nested
+        for parent in parents:
+            level = level.setdefault(parent, {})
+        level[key] = types[dtype]
+
+    def fields(level):
+        return [pa.field(name, pa.struct(fields(value)) if isinstance(value, dict) else value)
+                for name, value in level.items()]
+
+    return pa.schema(fields(nested))
+
+
+def _typed_frame(data: Dict, columns: Tuple[ReportColumn, ...]) -> 'pd.DataFrame':
+    """
+    Fill missing values and apply the report dtypes
+
+    Args:
+        data: Report column name -> values
+        columns: Report columns
+
+    Returns:
+        Typed DataFrame
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame(data)
+    for name, _, dtype in columns:
+        frame[name] = frame[name].fillna(_DEFAULTS[dtype]).astype(dtype)
+    return frame
+
+
+class ReportWriter:
+    """Append report chunks to a CSV or Parquet file"""
+
+    def __init__(self, output_path: str, format: str = None):
+        """
+        Initialize ReportWriter
+
+        Args:
+            output_path: Output file path
+            format: 'csv' or 'parquet' (None = from the file extension)
+        """
+        self.output_path = output_path
+        self.format = format or ('parquet' if output_path.endswith('.parquet') else 'csv')
+        self.rows = 0
+        self._parquet_writer = None
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self) -> 'ReportWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write(self, frame: 'pd.DataFrame') -> None:
+        """
+        Append one chunk
+
+        Args:
+            frame: Report chunk
+        """
+        if self.format == 'parquet':
+            pa = _import_pyarrow()
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(
+                    self.output_path, table.schema,
+                    compression=RESULTS_CONFIG['compression'])
+            self._parquet_writer.write_table(table)
+        else:
+            frame.to_csv(self.output_path, index=False,
+                         mode='w' if self.rows == 0 else 'a',
+                         header=self.rows == 0)
+        self.rows += len(frame)
+
+    def close(self) -> None:
+        """Finish the file"""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+def build_report(source: ResultSource, output_path: str = None,
+                 columns: Iterable[ReportColumn] = REPORT_COLUMNS,
+                 chunksize: int = None,
+                 return_frame: bool = True) -> Optional['pd.DataFrame']:
+    """
+    Build a report chunk by chunk, writing each chunk as it is ready
+
+    Args:
+        source: Anything iter_result_chunks() accepts
+        output_path: CSV or Parquet file to write (None = don't write)
+        columns: Report columns to build
+        chunksize: Results per chunk (None = RESULTS_CONFIG)
+        return_frame: Also return the whole report as one DataFrame
+                      (False keeps memory bounded by the chunk size)
+
+    Returns:
+        Report DataFrame, or None if return_frame is False
+    """
+    import pandas as pd
+
+    columns = tuple(columns)
+    frames = []
+    writer = ReportWriter(output_path) if output_path else None
+    try:
+        for frame in iter_report_frames(source, columns, chunksize):
+            if writer is not None:
+                writer.write(frame)
+            if return_frame:
+                frames.append(frame)
+        if writer is not None and writer.rows == 0:
+            writer.write(_typed_frame({name: [] for name, _, _ in columns}, columns))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if not return_frame:
+        return None
+    if not frames:
+        return _typed_frame({name: [] for name, _, _ in columns}, columns)
+    return pd.concat(frames, ignore_index=True)
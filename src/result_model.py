@@ -0,0 +1,408 @@
+"""
+Result Model Module
+Slotted, typed scoring results that read like the dictionaries they replace
+"""
+
+import json
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from src.results_store import _json_default
+except ImportError:
+    from results_store import _json_default
+
+
+class _Record:
+    """
+    Base of the result classes
+
+    Fields are slots rather than dictionary entries, which keeps each
+    result small. get(), [] and items() work as on the dictionary form,
+    so code written against result dictionaries keeps working.
+    """
+
+    __slots__ = ()
+
+    # Field names, in dictionary order
+    _fields: Tuple[str, ...] = ()
+    # Fields left out of the dictionary form while they are None
+    _optional: FrozenSet[str] = frozenset()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            value = getattr(self, key)
+            if value is not None or key not in self._optional:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._fields:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (_Record, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, _Record)
+                                      else other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields)
+        return f'{type(self).__name__}({fields})'
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a field like dict.get
+
+        Args:
+            key: Field name
+            default: Value if the field is missing
+
+        Returns:
+            Field value or default
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        """Names of the fields present in the dictionary form"""
+        return [name for name in self._fields
+                if name not in self._optional or getattr(self, name) is not None]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """(name, value) pairs of the fields present in the dictionary form"""
+        return [(name, self[name]) for name in self.keys()]
+
+    def values(self) -> List[Any]:
+        """Values of the fields present in the dictionary form"""
+        return [self[name] for name in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the nested result dictionary
+
+        Returns:
+            Dictionary (nested records converted too)
+        """
+        return {name: value.to_dict() if isinstance(value, _Record) else value
+                for name, value in self.items()}
+
+
+class ComponentScores(_Record):
+    """Component scores (0-100)"""
+
+    __slots__ = ('grammar', 'complexity', 'fluency', 'clarity')
+    _fields = __slots__
+
+    def __init__(self, grammar: float = 0.0, complexity: float = 0.0,
+                 fluency: float = 0.0, clarity: float = 0.0):
+        self.grammar = grammar
+        self.complexity = complexity
+        self.fluency = fluency
+        self.clarity = clarity
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ComponentScores':
+        """
+        Build from the 'components' dictionary of a result
+
+        Args:
+            data: Component name -> score
+
+        Returns:
+            ComponentScores
+        """
+        return cls(data.get('grammar', 0.0), data.get('complexity', 0.0),
+                   data.get('fluency', 0.0), data.get('clarity', 0.0))
+
+
+class ErrorSummary(_Record):
+    """Grammar error counts and positions"""
+
+    __slots__ = ('total_errors', 'error_types', 'error_positions')
+    _fields = __slots__
+    _optional = frozenset({'error_positions'})
+
+    def __init__(self, total_errors: int = 0, error_types: Dict[str, int] = None,
+                 error_positions: Any = None):
+        """
+        Initialize ErrorSummary
+
+        Args:
+            total_errors: Number of rule hits
+            error_types: Rule name -> hit count
+            error_positions: Hits in the form set by the scorer's
+                             error_positions mode (None = not reported)
+        """
+        self.total_errors = total_errors
+        self.error_types = error_types if error_types is not None else {}
+        self.error_positions = error_positions
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ErrorSummary':
+        """
+        Build from the 'errors' dictionary of a result
+
+        Args:
+            data: Output of GrammarScorer.detect_grammar_errors
+
+        Returns:
+            ErrorSummary
+        """
+        return cls(data.get('total_errors', 0), data.get('error_types'),
+                   data.get('error_positions'))
+
+
+class Statistics(_Record):
+    """Text statistics"""
+
+    __slots__ = ('total_words', 'total_sentences', 'avg_sentence_length')
+    _fields = __slots__
+
+    def __init__(self, total_words: int = 0, total_sentences: int = 0,
+                 avg_sentence_length: float = 0.0):
+        self.total_words = total_words
+        self.total_sentences = total_sentences
+        self.avg_sentence_length = avg_sentence_length
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Statistics':
+        """
+        Build from the 'statistics' dictionary of a result
+
+        Args:
+            data: Statistics dictionary
+
+        Returns:
+            Statistics
+        """
+        return cls(data.get('total_words', 0), data.get('total_sentences', 0),
+                   data.get('avg_sentence_length', 0.0))
+
+
+class ScoringResult(_Record):
+    """
+    Scoring result of one audio file
+
+    Keys set that are not fields (e.g. the streaming 'provisional' flag)
+    are kept in extra and appear after the fields in the dictionary form.
+    """
+
+    __slots__ = ('audio_file', 'transcript', 'audio_duration', 'pauses_detected',
+                 'final_score', 'components', 'errors', 'statistics', 'timings',
+                 'extra')
+    _fields = __slots__[:-1]
+    _optional = frozenset({'timings'})
+
+    def __init__(self, audio_file: str, transcript: str, audio_duration: float,
+                 pauses_detected: int, final_score: float,
+                 components: ComponentScores, errors: ErrorSummary,
+                 statistics: Statistics, timings: Dict = None,
+                 extra: Dict[str, Any] = None):
+        """
+        Initialize ScoringResult
+
+        Args:
+            audio_file: Base name of the scored file
+            transcript: Transcribed text
+            audio_duration: Duration of audio in seconds
+            pauses_detected: Number of pauses in audio
+            final_score: Weighted score (0-100)
+            components: Component scores
+            errors: Grammar errors found
+            statistics: Text statistics
+            timings: Stage timings (None = not attached)
+            extra: Additional keys
+        """
+        self.audio_file = audio_file
+        self.transcript = transcript
+        self.audio_duration = audio_duration
+        self.pauses_detected = pauses_detected
+        self.final_score = final_score
+        self.components = components
+        self.errors = errors
+        self.statistics = statistics
+        self.timings = timings
+        self.extra = extra
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return super().__getitem__(key)
+        except KeyError:
+            if self.extra and key in self.extra:
+                return self.extra[key]
+            raise
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._fields:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def keys(self) -> List[str]:
+        keys = super().keys()
+        if self.extra:
+            keys += list(self.extra)
+        return keys
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ScoringResult':
+        """
+        Build from a result dictionary (e.g. loaded from JSON)
+
+        Args:
+            data: Nested result dictionary
+
+        Returns:
+            ScoringResult (keys that are not fields go to extra)
+        """
+        extra = {key: value for key, value in data.items() if key not in cls._fields}
+        return cls(
+            audio_file=data.get('audio_file', ''),
+            transcript=data.get('transcript', ''),
+            audio_duration=data.get('audio_duration', 0.0),
+            pauses_detected=data.get('pauses_detected', 0),
+            final_score=data.get('final_score', 0.0),
+            components=ComponentScores.from_dict(data.get('components') or {}),
+            errors=ErrorSummary.from_dict(data.get('errors') or {}),
+            statistics=Statistics.from_dict(data.get('statistics') or {}),
+            timings=data.get('timings'),
+            extra=extra or None,
+        )
+
+    def to_row(self) -> Dict[str, Any]:
+        """
+        Flatten into a results store row
+
+        Returns:
+            Dictionary of store column name -> value (variable-shaped
+            values as JSON text, missing ones None)
+        """
+        components, errors, statistics = self.components, self.errors, self.statistics
+        return {
+            'audio_file': self.audio_file,
+            'transcript': self.transcript,
+            'audio_duration': self.audio_duration,
+            'pauses_detected': self.pauses_detected,
+            'final_score': self.final_score,
+            'components.grammar': components.grammar,
+            'components.complexity': components.complexity,
+            'components.fluency': components.fluency,
+            'components.clarity': components.clarity,
+            'errors.total_errors': errors.total_errors,
+            'errors.error_types': _dumps(errors.error_types),
+            'errors.error_positions': _dumps(errors.error_positions),
+            'statistics.total_words': statistics.total_words,
+            'statistics.total_sentences': statistics.total_sentences,
+            'statistics.avg_sentence_length': statistics.avg_sentence_length,
+            'timings': _dumps(self.timings),
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'ScoringResult':
+        """
+        Build from a results store row
+
+        Args:
+            row: Column name -> value, as returned by to_row() or read
+                 from a ResultsStore (missing columns get defaults)
+
+        Returns:
+            ScoringResult
+        """
+        def value(name, default=None):
+            found = row.get(name)
+            return default if found is None else found
+
+        return cls(
+            audio_file=value('audio_file', ''),
+            transcript=value('transcript', ''),
+            audio_duration=value('audio_duration', 0.0),
+            pauses_detected=value('pauses_detected', 0),
+            final_score=value('final_score', 0.0),
+            components=ComponentScores(value('components.grammar', 0.0),
+                                       value('components.complexity', 0.0),
+                                       value('components.fluency', 0.0),
+                                       value('components.clarity', 0.0)),
+            errors=ErrorSummary(value('errors.total_errors', 0),
+                                _loads(row.get('errors.error_types')),
+                                _loads(row.get('errors.error_positions'))),
+            statistics=Statistics(value('statistics.total_words', 0),
+                                  value('statistics.total_sentences', 0),
+                                  value('statistics.avg_sentence_length', 0.0)),
+            timings=_loads(row.get('timings')),
+        )
+
+
+def _dumps(value: Any) -> Optional[str]:
+    """Serialize a variable-shaped value for a JSON column"""
+    return None if value is None else json.dumps(value, default=_json_default)
+
+
+def _loads(text: Optional[str]) -> Any:
+    """Parse a JSON column value"""
+    return None if text is None else json.loads(text)
+
+
+def results_to_columns(results: Iterable[ScoringResult]) -> Dict[str, List]:
+    """
+    Export results column by column
+
+    Args:
+        results: Scoring results
+
+    Returns:
+        Dictionary of store column name -> list of values, ready for
+        pandas.DataFrame or pyarrow.table(..., schema=arrow_schema())
+    """
+    results = list(results)
+    components = [result.components for result in results]
+    errors = [result.errors for result in results]
+    statistics = [result.statistics for result in results]
+
+    return {
+        'audio_file': [result.audio_file for result in results],
+        'transcript': [result.transcript for result in results],
+        'audio_duration': [result.audio_duration for result in results],
+        'pauses_detected': [result.pauses_detected for result in results],
+        'final_score': [result.final_score for result in results],
+        'components.grammar': [item.grammar for item in components],
+        'components.complexity': [item.complexity for item in components],
+        'components.fluency': [item.fluency for item in components],
+        'components.clarity': [item.clarity for item in components],
+        'errors.total_errors': [item.total_errors for item in errors],
+        'errors.error_types': [_dumps(item.error_types) for item in errors],
+        'errors.error_positions': [_dumps(item.error_positions) for item in errors],
+        'statistics.total_words': [item.total_words for item in statistics],
+        'statistics.total_sentences': [item.total_sentences for item in statistics],
+        'statistics.avg_sentence_length': [item.avg_sentence_length
+                                           for item in statistics],
+        'timings': [_dumps(result.timings) for result in results],
+    }
+
+
+def as_dict(result: Any) -> Any:
+    """
+    Get the dictionary form of a result, leaving dictionaries as they are
+
+    Args:
+        result: ScoringResult, result dictionary or None
+
+    Returns:
+        Result dictionary (or result unchanged if it is not a record)
+    """
+    return result.to_dict() if isinstance(result, _Record) else result
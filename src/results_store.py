@@ -0,0 +1,459 @@
+"""
+Results Store Module
+Append-only columnar store of scoring results (Parquet or Arrow IPC)
+"""
+
+import os
+import json
+import uuid
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    from src.config import RESULTS_CONFIG
+except ImportError:
+    from config import RESULTS_CONFIG
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+
+# Flattened result columns: dotted names mirror the nested result keys.
+# 'json' columns hold variable-shaped values serialized as JSON text.
+RESULT_COLUMNS = (
+    ('audio_file', 'string'),
+    ('transcript', 'string'),
+    ('audio_duration', 'float64'),
+    ('pauses_detected', 'int64'),
+    ('final_score', 'float64'),
+    ('components.grammar', 'float64'),
+    ('components.complexity', 'float64'),
+    ('components.fluency', 'float64'),
+    ('components.clarity', 'float64'),
+    ('errors.total_errors', 'int64'),
+    ('errors.error_types', 'json'),
+    ('errors.error_positions', 'json'),
+    ('statistics.total_words', 'int64'),
+    ('statistics.total_sentences', 'int64'),
+    ('statistics.avg_sentence_length', 'float64'),
+    ('timings', 'json'),
+)
+
+COLUMN_NAMES = tuple(name for name, _ in RESULT_COLUMNS)
+JSON_COLUMNS = frozenset(name for name, kind in RESULT_COLUMNS if kind == 'json')
+
+# Part file extension of each store format
+_EXTENSIONS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Suffix of a part file that is still being written
+_IN_PROGRESS = '.inprogress'
+
+
+def _import_pyarrow():
+    """
+    Import pyarrow, explaining how to get it if missing
+
+    Returns:
+        The pyarrow module
+    """
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "The columnar results store needs pyarrow: pip install pyarrow "
+            "(or set RESULTS_CONFIG['store_format'] = None)"
+        ) from e
+    return pyarrow
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars and other non-JSON values"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def flatten_result(result: Dict) -> Dict[str, Any]:
+    """
+    Flatten a nested result dictionary into a store row
+
+    Args:
+        result: ScoringResult or result dictionary
+
+    Returns:
+        Dictionary of column name -> value (missing fields are None)
+    """
+    if hasattr(result, 'to_row'):
+        return result.to_row()
+    row = {}
+    for name in COLUMN_NAMES:
+        value = result
+        for key in name.split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+        if name in JSON_COLUMNS and value is not None:
+            value = json.dumps(value, default=_json_default)
+        row[name] = value
+    return row
+
+
+def unflatten_row(row: Dict[str, Any]) -> Dict:
+    """
+    Rebuild a nested result dictionary from a store row
+
+    Args:
+        row: Column name -> value, for all or some of the columns
+
+    Returns:
+        Result dictionary (columns that are None are left out)
+    """
+    result: Dict = {}
+    for name, value in row.items():
+        if value is None:
+            continue
+        if name in JSON_COLUMNS:
+            value = json.loads(value)
+        *parents, key = name.split('.')
+        target = result
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value
+    return result
+
+
+def arrow_schema(columns: Iterable[str] = None) -> 'pa.Schema':
+    """
+    Arrow schema of the store
+
+    Args:
+        columns: Subset of columns, in order (default: all)
+
+    Returns:
+        pyarrow Schema
+    """
+    pa = _import_pyarrow()
+    types = {'string': pa.string(), 'json': pa.string(),
+             'float64': pa.float64(), 'int64': pa.int64()}
+    kinds = dict(RESULT_COLUMNS)
+    return pa.schema([(name, types[kinds[name]])
+                      for name in (columns or COLUMN_NAMES)])
+
+
+class ResultsStore:
+    """
+    Directory of append-only Parquet or Arrow IPC part files
+
+    Each writer session adds new part files, so concurrent writers and
+    later sessions never rewrite existing data; only clear() removes it.
+    A part becomes visible to readers once it is complete (every
+    part_rows rows, and on close).
+    """
+
+    def __init__(self, path: str, format: str = None, row_group_size: int = None,
+                 part_rows: int = None, compression: str = None,
+                 on_publish: Callable[[List[str]], None] = None):
+        """
+        Initialize ResultsStore
+
+        Args:
+            path: Store directory (created on first write)
+            format: 'parquet' or 'arrow' for new parts (None = RESULTS_CONFIG)
+            row_group_size: Rows per row group / record batch (None = RESULTS_CONFIG)
+            part_rows: Rows per part file (None = RESULTS_CONFIG)
+            compression: Codec for new parts (None = RESULTS_CONFIG)
+            on_publish: Called with the keys of the rows of each part once
+                        it is visible to readers (see append())
+        """
+        self.path = path
+        self.format = format or RESULTS_CONFIG['store_format'] or 'parquet'
+        if self.format not in _EXTENSIONS:
+            raise ValueError(f"Unsupported store format: {self.format}")
+        self.row_group_size = row_group_size or RESULTS_CONFIG['row_group_size']
+        self.part_rows = part_rows or RESULTS_CONFIG['part_rows']
+        self.compression = compression or RESULTS_CONFIG['compression']
+
+        self._buffer: Dict[str, List] = {name: [] for name in COLUMN_NAMES}
+        self._buffered = 0
+        self._writer = None
+        self._part_path: Optional[str] = None
+        self._part_written = 0
+        self._parts_started = 0
+        self._session: Optional[str] = None
+        self.on_publish = on_publish
+        # Keys of the rows appended since the last part was published
+        self._keys: List[str] = []
+
+    def __enter__(self) -> 'ResultsStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def append(self, result: Dict, key: str = None) -> None:
+        """
+        Add one result, writing a row group once enough are buffered
+
+        Args:
+            result: Result dictionary
+            key: Identifies the row to on_publish (e.g. its content hash)
+        """
+        if key is not None:
+            self._keys.append(key)
+        for name, value in flatten_result(result).items():
+            self._buffer[name].append(value)
+        self._buffered += 1
+        if self._buffered >= self.row_group_size:
+            self.flush()
+
+    def extend(self, results: Iterable[Optional[Dict]]) -> None:
+        """
+        Add many results, skipping None entries of failed files
+
+        Args:
+            results: Result dictionaries
+        """
+        for result in results:
+            if result is not None:
+                self.append(result)
+
+    def flush(self) -> None:
+        """Write the buffered results as one row group"""
+        if not self._buffered:
+            return
+        pa = _import_pyarrow()
+        schema = arrow_schema()
+        batch = pa.record_batch(
+            [pa.array(self._buffer[field.name], type=field.type) for field in schema],
+            schema=schema,
+        )
+        self._buffer = {name: [] for name in COLUMN_NAMES}
+        self._buffered = 0
+
+        if self._writer is None:
+            self._open_part(schema)
+        if self.format == 'parquet':
+            self._writer.write_table(pa.Table.from_batches([batch]),
+                                     row_group_size=batch.num_rows)
+        else:
+            self._writer.write_batch(batch)
+
+        self._part_written += batch.num_rows
+        if self._part_written >= self.part_rows:
+            self._close_part()
+
+    def close(self) -> None:
+        """Write buffered results and publish the current part"""
+        self.flush()
+        self._close_part()
+
+    def clear(self) -> None:
+        """
+        Delete every part of the store, including unfinished ones
+
+        Buffered results are dropped too. Unlike appending, this removes
+        data written by other sessions; fresh (not resumed) batch runs use
+        it to replace the store of the earlier run.
+        """
+        self._buffer = {name: [] for name in COLUMN_NAMES}
+        self._buffered = 0
+        self._keys = []
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._part_path = None
+        if not os.path.isdir(self.path):
+            return
+        for name in os.listdir(self.path):
+            if name.startswith('part-'):
+                os.remove(os.path.join(self.path, name))
+
+    def _open_part(self, schema: 'pa.Schema') -> None:
+        """
+        Start a new part file
+
+        Args:
+            schema: Arrow schema of the part
+        """
+        pa = _import_pyarrow()
+        os.makedirs(self.path, exist_ok=True)
+        if self._session is None:
+            # Sorts by start time; unique across processes and sessions
+            self._session = (f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-"
+                             f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        self._parts_started += 1
+        name = (f"part-{self._session}-{self._parts_started:04d}"
+                f"{_EXTENSIONS[self.format]}")
+        self._part_path = os.path.join(self.path, name)
+        in_progress = self._part_path + _IN_PROGRESS
+
+        if self.format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(in_progress, schema,
+                                            compression=self.compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            self._writer = pa.ipc.new_file(in_progress, schema, options=options)
+        self._part_written = 0
+
+    def _close_part(self) -> None:
+        """Finish the current part file and make it visible to readers"""
+        if self._writer is None:
+            return
+        self._writer.close()
+        os.replace(self._part_path + _IN_PROGRESS, self._part_path)
+        self._writer = None
+        self._part_path = None
+
+        # A part is closed right after a flush, so it holds every keyed row
+        keys, self._keys = self._keys, []
+        if keys and self.on_publish is not None:
+            self.on_publish(keys)
+
+    def part_files(self) -> List[str]:
+        """
+        Completed part files, oldest first
+
+        Returns:
+            Paths of the parts
+        """
+        if not os.path.isdir(self.path):
+            return []
+        return [os.path.join(self.path, name) for name in sorted(os.listdir(self.path))
+                if name.startswith('part-')
+                and name.endswith(tuple(_EXTENSIONS.values()))]
+
+    def iter_batches(self, columns: List[str] = None,
+                     batch_size: int = None) -> Iterator['pa.RecordBatch']:
+        """
+        Read the store one record batch at a time
+
+        Only the requested columns are read from disk: Parquet parts are
+        column-chunked and Arrow parts are memory-mapped.
+
+        Args:
+            columns: Columns to read (default: all)
+            batch_size: Maximum rows per Parquet batch (None = row_group_size)
+
+        Yields:
+            pyarrow RecordBatch with the requested columns
+        """
+        pa = _import_pyarrow()
+        columns = list(columns or COLUMN_NAMES)
+        batch_size = batch_size or self.row_group_size
+
+        for part in self.part_files():
+            if part.endswith(_EXTENSIONS['parquet']):
+                import pyarrow.parquet as pq
+                yield from pq.ParquetFile(part).iter_batches(batch_size=batch_size,
+                                                             columns=columns)
+            else:
+                with pa.memory_map(part) as source:
+                    reader = pa.ipc.open_file(source)
+                    for index in range(reader.num_record_batches):
+                        batch = reader.get_batch(index)
+                        yield pa.record_batch([batch.column(name) for name in columns],
+                                              names=columns)
+
+    def read(self, columns: List[str] = None) -> 'pd.DataFrame':
+        """
+        Read columns of every stored result into a DataFrame
+
+        Args:
+            columns: Columns to read (default: all)
+
+        Returns:
+            DataFrame with one row per result
+        """
+        pa = _import_pyarrow()
+        columns = list(columns or COLUMN_NAMES)
+        table = pa.Table.from_batches(list(self.iter_batches(columns)),
+                                      schema=arrow_schema(columns))
+        return table.to_pandas()
+
+    def read_column(self, name: str) -> np.ndarray:
+        """
+        Read one column of every stored result
+
+        Args:
+            name: Column name
+
+        Returns:
+            NumPy array of the column values
+        """
+        chunks = [batch.column(0).to_numpy(zero_copy_only=False)
+                  for batch in self.iter_batches([name])]
+        if not chunks:
+            return np.array([])
+        return np.concatenate(chunks)
+
+    def iter_results(self, columns: List[str] = None) -> Iterator[Dict]:
+        """
+        Read stored results back as nested dictionaries
+
+        Args:
+            columns: Columns to read (default: all)
+
+        Yields:
+            Result dictionary per stored row
+        """
+        for batch in self.iter_batches(columns):
+            for row in batch.to_pylist():
+                yield unflatten_row(row)
+
+    def count_rows(self) -> int:
+        """
+        Number of results in completed parts
+
+        Returns:
+            Row count, read from part metadata
+        """
+        pa = _import_pyarrow()
+        total = 0
+        for part in self.part_files():
+            if part.endswith(_EXTENSIONS['parquet']):
+                import pyarrow.parquet as pq
+                total += pq.ParquetFile(part).metadata.num_rows
+            else:
+                with pa.memory_map(part) as source:
+                    reader = pa.ipc.open_file(source)
+                    total += sum(reader.get_batch(index).num_rows
+                                 for index in range(reader.num_record_batches))
+        return total
+
+
+def is_results_store(path: str) -> bool:
+    """
+    Check whether a path is a results store directory
+
+    Args:
+        path: Path to check
+
+    Returns:
+        True if path is a directory containing store part files
+    """
+    return os.path.isdir(path) and bool(ResultsStore(path).part_files())
+
+
+def open_results_store(results_dir: str,
+                       logger: logging.Logger = None) -> Optional[ResultsStore]:
+    """
+    Open the batch results store configured in RESULTS_CONFIG
+
+    Args:
+        results_dir: Results directory the store lives in
+        logger: Logger for the missing-pyarrow warning
+
+    Returns:
+        ResultsStore, or None if the store is disabled or pyarrow is missing
+    """
+    if not RESULTS_CONFIG['store_format'] or not results_dir:
+        return None
+    try:
+        _import_pyarrow()
+    except ImportError as e:
+        (logger or logging.getLogger(__name__)).warning(f"{e}; writing JSON only")
+        return None
+    return ResultsStore(os.path.join(results_dir, RESULTS_CONFIG['store_name']))
@@ -0,0 +1,294 @@
+"""
+Rule Engine Module
+Finds the hits of every grammar rule in a single pass over the text
+"""
+
+import re
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+
+# Rules of the form \b(word|word|...) followed by \b or a required \s can
+# only match at the start of one of those words, so they are dispatched by
+# keyword. An optional \s (\s*, \s?, \s{0,n}) would let a word run on.
+_KEYWORD_PREFIX = re.compile(
+    r'^\\b\((?:\?:)?(\w+(?:\|\w+)*)\)(?=\\b|\\s(?![*?]|\{0))'
+)
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """
+    Check whether a regex has a | outside every group and character class
+
+    Args:
+        pattern: Rule regex
+
+    Returns:
+        True if some match of the pattern need not start with its prefix
+    """
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+    return False
+
+
+def extract_keywords(pattern: str) -> Optional[FrozenSet[str]]:
+    """
+    Get the words a rule pattern must start with
+
+    Args:
+        pattern: Rule regex
+
+    Returns:
+        Lowercase leading words, or None if the pattern can start anywhere
+    """
+    match = _KEYWORD_PREFIX.match(pattern)
+    if match is None or _has_top_level_alternation(pattern):
+        return None
+    return frozenset(word.lower() for word in match.group(1).split('|'))
+
+
+class GrammarRule:
+    """A compiled grammar rule"""
+
+    __slots__ = ('rule_id', 'name', 'pattern', 'description', 'kind',
+                 'regex', 'keywords')
+
+    def __init__(self, rule_id: int, name: str, pattern: str,
+                 description: str = '', kind: str = 'error',
+                 keywords: FrozenSet[str] = None, flags: int = re.IGNORECASE):
+        """
+        Initialize GrammarRule
+
+        Args:
+            rule_id: Dense integer id
+            name: Rule name
+            pattern: Rule regex
+            description: Human-readable description
+            kind: 'error' (counts as a grammar error) or 'marker'
+            keywords: Words every match starts with (default: from pattern)
+            flags: Regex flags
+        """
+        self.rule_id = rule_id
+        self.name = name
+        self.pattern = pattern
+        self.description = description
+        self.kind = kind
+        self.regex = re.compile(pattern, flags)
+        if keywords is None:
+            keywords = extract_keywords(pattern)
+        self.keywords = (frozenset(word.lower() for word in keywords)
+                         if keywords is not None else None)
+
+
+class RuleScan:
+    """Every rule hit found in one text"""
+
+    def __init__(self, rules: List[GrammarRule]):
+        """
+        Initialize RuleScan
+
+        Args:
+            rules: Rules of the engine that produced the scan
+        """
+        self.rules = rules
+        self.starts: List[List[int]] = [[] for _ in rules]
+        self.ends: List[List[int]] = [[] for _ in rules]
+
+    def count(self, name: str) -> int:
+        """
+        Get the number of hits of a rule
+
+        Args:
+            name: Rule name
+
+        Returns:
+            Hit count (0 for unknown rules)
+        """
+        for rule in self.rules:
+            if rule.name == name:
+                return len(self.starts[rule.rule_id])
+        return 0
+
+    def counts(self, kind: str = 'error') -> Dict[str, int]:
+        """
+        Get hit counts of rules with at least one hit
+
+        Args:
+            kind: Rule kind to report
+
+        Returns:
+            Dictionary mapping rule name to hit count, in registration order
+        """
+        return {rule.name: len(self.starts[rule.rule_id])
+                for rule in self.rules
+                if rule.kind == kind and self.starts[rule.rule_id]}
+
+    def hits(self, kind: str = 'error') -> List[Tuple[int, int, int]]:
+        """
+        Get hits grouped by rule, then ordered by position
+
+        Args:
+            kind: Rule kind to report
+
+        Returns:
+            List of (rule_id, start, end)
+        """
+        return [(rule.rule_id, start, end)
+                for rule in self.rules if rule.kind == kind
+                for start, end in zip(self.starts[rule.rule_id],
+                                      self.ends[rule.rule_id])]
+
+
+class RuleEngine:
+    """Registry of grammar rules compiled for single-pass matching"""
+
+    def __init__(self, rules: Dict[str, Dict] = None, flags: int = re.IGNORECASE):
+        """
+        Initialize RuleEngine
+
+        Args:
+            rules: Initial rules as {name: {'pattern': ..., 'description': ...}}
+            flags: Regex flags for every rule
+        """
+        self.flags = flags
+        self.rules: List[GrammarRule] = []
+        self._by_name: Dict[str, GrammarRule] = {}
+        self._compiled = False
+        self._keyword_index: Dict[str, List[GrammarRule]] = {}
+        self._candidate_regex = None
+        self._fallback_rules: List[GrammarRule] = []
+
+        for name, info in (rules or {}).items():
+            self.register(name, info['pattern'], info.get('description', ''))
+
+    def register(self, name: str, pattern: str, description: str = '',
+                 kind: str = 'error', keywords: List[str] = None) -> GrammarRule:
+        """
+        Add or replace a rule
+
+        Rules that start with a fixed set of words (auto-detected from
+        \\b(word|...) patterns, or given as keywords) cost one dictionary
+        lookup per candidate word, however many rules are registered.
+        Other rules are matched with their own pass over the text.
+
+        Args:
+            name: Rule name
+            pattern: Rule regex
+            description: Human-readable description
+            kind: 'error' (counts as a grammar error) or 'marker'
+            keywords: Words every match starts with (default: from pattern)
+
+        Returns:
+            The compiled rule
+        """
+        if name in self._by_name:
+            rule_id = self._by_name[name].rule_id
+        else:
+            rule_id = len(self.rules)
+            self.rules.append(None)
+
+        rule = GrammarRule(rule_id, name, pattern, description, kind,
+                           frozenset(keywords) if keywords else None, self.flags)
+        self.rules[rule_id] = rule
+        self._by_name[name] = rule
+        self._compiled = False
+        return rule
+
+    def get(self, name: str) -> Optional[GrammarRule]:
+        """
+        Look up a rule by name
+
+        Args:
+            name: Rule name
+
+        Returns:
+            The rule, or None if it is not registered
+        """
+        return self._by_name.get(name)
+
+    def rule_names(self) -> List[str]:
+        """
+        Get rule names indexed by rule id
+
+        Returns:
+            List of rule names
+        """
+        return [rule.name for rule in self.rules]
+
+    def scan(self, text: str) -> RuleScan:
+        """
+        Find the hits of every rule
+
+        Hits of each rule are non-overlapping and identical to
+        re.finditer(rule.pattern, text, flags).
+
+        Args:
+            text: Input text
+
+        Returns:
+            RuleScan with per-rule hit offsets
+        """
+        if not self._compiled:
+            self._compile()
+
+        result = RuleScan(self.rules)
+        next_start = [0] * len(self.rules)
+
+        if self._candidate_regex is not None:
+            index = self._keyword_index
+            for candidate in self._candidate_regex.finditer(text):
+                start = candidate.start()
+                for rule in index.get(candidate.group().lower(), ()):
+                    rule_id = rule.rule_id
+                    if start < next_start[rule_id]:
+                        continue
+                    match = rule.regex.match(text, start)
+                    if match is not None:
+                        result.starts[rule_id].append(start)
+                        result.ends[rule_id].append(match.end())
+                        next_start[rule_id] = match.end()
+
+        for rule in self._fallback_rules:
+            for match in rule.regex.finditer(text):
+                result.starts[rule.rule_id].append(match.start())
+                result.ends[rule.rule_id].append(match.end())
+
+        return result
+
+    def _compile(self) -> None:
+        """Build the keyword index and the combined candidate pattern"""
+        index: Dict[str, List[GrammarRule]] = {}
+        fallback = []
+        for rule in self.rules:
+            if rule.keywords is None:
+                fallback.append(rule)
+                continue
+            for word in rule.keywords:
+                index.setdefault(word, []).append(rule)
+
+        self._keyword_index = index
+        self._fallback_rules = fallback
+        if index:
+            # Longest first so the alternation prefers whole words
+            words = sorted(index, key=len, reverse=True)
+            self._candidate_regex = re.compile(
+                r'\b(?:' + '|'.join(map(re.escape, words)) + r')\b', self.flags
+            )
+        else:
+            self._candidate_regex = None
+        self._compiled = True
@@ -0,0 +1,511 @@
+"""
+Run Manifest Module
+Checkpointing for resumable batch runs: a SQLite manifest of input
+content hashes and their status, and an fsynced JSONL result log
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    from src.config import RUN_CONFIG
+    from src.transcript_cache import hash_audio
+except ImportError:
+    from config import RUN_CONFIG
+    from transcript_cache import hash_audio
+
+if TYPE_CHECKING:
+    from src.results_store import ResultsStore
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inputs (
+    content_hash TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    stored INTEGER NOT NULL DEFAULT 0,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_inputs_path ON inputs (path);
+"""
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+# Bytes read at a time when looking for the last complete JSONL line
+_TAIL_BLOCK_SIZE = 1 << 16
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars and other non-JSON values"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class RunManifest:
+    """SQLite record of every input of a run, keyed by content hash"""
+
+    def __init__(self, path: str):
+        """
+        Initialize RunManifest
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+
+    def hash_inputs(self, audio_paths: Iterable[str]) -> Dict[str, str]:
+        """
+        Get the content hash of each input
+
+        Files whose path, size and modification time match a manifest
+        entry reuse its hash instead of being read again.
+
+        Args:
+            audio_paths: Paths of the input files
+
+        Returns:
+            Dictionary mapping path to content hash
+        """
+        conn = self._connect()
+        hashes = {}
+        for path in audio_paths:
+            stat = os.stat(path)
+            row = conn.execute(
+                "SELECT content_hash FROM inputs "
+                "WHERE path = ? AND size = ? AND mtime = ?",
+                (path, stat.st_size, stat.st_mtime)
+            ).fetchone()
+            hashes[path] = row[0] if row else hash_audio(path)
+        return hashes
+
+    def register(self, hashes: Dict[str, str]) -> None:
+        """
+        Add inputs as pending, refreshing the path of known content
+
+        Args:
+            hashes: Dictionary mapping path to content hash
+        """
+        now = time.time()
+        rows = []
+        for path, content_hash in hashes.items():
+            stat = os.stat(path)
+            rows.append((content_hash, path, stat.st_size, stat.st_mtime, PENDING, now))
+
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO inputs (content_hash, path, size, mtime, status, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (content_hash) DO UPDATE SET "
+                "path = excluded.path, size = excluded.size, mtime = excluded.mtime",
+                rows
+            )
+
+    def statuses(self, content_hashes: Iterable[str] = None) -> Dict[str, str]:
+        """
+        Get the status of inputs
+
+        Args:
+            content_hashes: Inputs to look up (default: all)
+
+        Returns:
+            Dictionary mapping content hash to 'pending', 'done' or 'failed'
+        """
+        rows = self._connect().execute("SELECT content_hash, status FROM inputs")
+        if content_hashes is None:
+            return dict(rows)
+        wanted = set(content_hashes)
+        return {content_hash: status for content_hash, status in rows
+                if content_hash in wanted}
+
+    def mark(self, content_hashes: Iterable[str], status: str) -> None:
+        """
+        Set the status of inputs and count the attempt
+
+        Args:
+            content_hashes: Inputs to update
+            status: 'done' or 'failed'
+        """
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "UPDATE inputs SET status = ?, attempts = attempts + 1, updated = ? "
+                "WHERE content_hash = ?",
+                [(status, now, content_hash) for content_hash in content_hashes]
+            )
+
+    def stored(self, content_hashes: Iterable[str]) -> Set[str]:
+        """
+        Get the inputs whose results are in a published part of the store
+
+        Args:
+            content_hashes: Inputs to look up
+
+        Returns:
+            Set of the content hashes that are stored
+        """
+        rows = self._connect().execute("SELECT content_hash FROM inputs WHERE stored = 1")
+        wanted = set(content_hashes)
+        return {content_hash for content_hash, in rows if content_hash in wanted}
+
+    def unstored_done(self) -> Set[str]:
+        """
+        Get the done inputs whose results are not in the store yet
+
+        Returns:
+            Set of content hashes
+        """
+        rows = self._connect().execute(
+            "SELECT content_hash FROM inputs WHERE status = ? AND stored = 0", (DONE,)
+        )
+        return {content_hash for content_hash, in rows}
+
+    def mark_stored(self, content_hashes: Iterable[str]) -> None:
+        """
+        Record that the results of inputs are in a published store part
+
+        Args:
+            content_hashes: Inputs to update
+        """
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "UPDATE inputs SET stored = 1 WHERE content_hash = ?",
+                [(content_hash,) for content_hash in content_hashes]
+            )
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Count inputs by status
+
+        Returns:
+            Dictionary mapping status to number of inputs
+        """
+        return dict(self._connect().execute(
+            "SELECT status, COUNT(*) FROM inputs GROUP BY status"
+        ))
+
+    def reset(self) -> None:
+        """Forget every input (start a fresh run)"""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM inputs")
+
+    def close(self) -> None:
+        """Close this thread's database connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get this thread's connection, opening it on first use
+
+        Returns:
+            SQLite connection
+        """
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not be shared across a fork
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.executescript(_SCHEMA)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+
+class JsonlSink:
+    """Append-only JSON Lines file, fsynced on demand"""
+
+    def __init__(self, path: str):
+        """
+        Initialize JsonlSink
+
+        Args:
+            path: JSONL file, appended to if it exists
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _drop_partial_line(path)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, record: Dict) -> None:
+        """
+        Append one record (durable after the next sync())
+
+        Args:
+            record: JSON-serializable dictionary
+        """
+        self._file.write(json.dumps(record, default=_json_default) + '\n')
+
+    def sync(self) -> None:
+        """Flush written records to stable storage"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Sync and close the file"""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+
+def _drop_partial_line(path: str) -> None:
+    """
+    Cut a torn last line left by a crash mid-write
+
+    Args:
+        path: JSONL file (may not exist)
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - _TAIL_BLOCK_SIZE)
+            f.seek(start)
+            block = f.read(position - start)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                cut = start + newline + 1
+                break
+            position = start
+        else:
+            cut = 0
+        if cut != end:
+            f.truncate(cut)
+
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    """
+    Stream the results of a run's JSONL log
+
+    An input rescored after a crash (or in a fresh run) appears more than
+    once; only its last record is returned, at the position it was
+    written. A first pass finds the last line of each input, so memory
+    holds line numbers rather than records.
+
+    Args:
+        path: JSONL file
+
+    Yields:
+        Result dictionaries
+    """
+    if not os.path.exists(path):
+        return
+
+    last_line: Dict[str, int] = {}
+    duplicates = False
+    for number, record in _iter_jsonl(path):
+        content_hash = record.get('content_hash', number)
+        duplicates = duplicates or content_hash in last_line
+        last_line[content_hash] = number
+
+    for number, record in _iter_jsonl(path):
+        if not duplicates or last_line[record.get('content_hash', number)] == number:
+            yield record
+
+
+def _iter_jsonl(path: str) -> Iterator[Tuple[int, Dict]]:
+    """
+    Parse the complete lines of a JSONL file
+
+    Args:
+        path: JSONL file
+
+    Yields:
+        (line number, record) pairs; a torn last line is skipped
+    """
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f):
+            if not line.endswith('\n'):
+                break
+            yield number, json.loads(line)
+
+
+class RunCheckpoint:
+    """
+    Checkpoint of a batch run in its results directory
+
+    Results are appended to the JSONL log and inputs are marked done only
+    after the log is fsynced, so a crash loses at most the last
+    fsync_every results. Progress is keyed by content hash, so a restart
+    skips completed inputs regardless of worker count or file order.
+
+    A results store is kept in step with the log: each input's result is
+    appended to it once, and the manifest notes which inputs are in a
+    published part. Rows a crash kept from being published are restored
+    from the log by restore_store().
+    """
+
+    def __init__(self, run_dir: str, resume: bool = True, fsync_every: int = None,
+                 store: 'ResultsStore' = None):
+        """
+        Initialize RunCheckpoint
+
+        Args:
+            run_dir: Directory holding the manifest and JSONL log
+            resume: Continue the run recorded there (False = rescore every
+                    input; new records supersede old ones in the log, and
+                    the store is cleared)
+            fsync_every: Results between fsyncs (None = RUN_CONFIG)
+            store: Results store to append results to (None = log only)
+        """
+        self.run_dir = run_dir
+        self.fsync_every = fsync_every or RUN_CONFIG['fsync_every']
+        self.manifest = RunManifest(os.path.join(run_dir, RUN_CONFIG['manifest_name']))
+        self.store = store
+        if store is not None:
+            store.on_publish = self.manifest.mark_stored
+        if not resume:
+            self.manifest.reset()
+            if store is not None:
+                store.clear()
+        self.sink = JsonlSink(os.path.join(run_dir, RUN_CONFIG['results_name']))
+
+        self._hashes: Dict[str, str] = {}
+        self._outstanding: Set[str] = set()
+        # Pending inputs whose results are already in the store
+        self._stored: Set[str] = set()
+        # Skipped path -> path of the input with the same content
+        self.duplicates: Dict[str, str] = {}
+        self._done: List[str] = []
+        self._failed: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def results_path(self) -> str:
+        """Path of the JSONL result log"""
+        return self.sink.path
+
+    def pending(self, audio_paths: List[str]) -> List[str]:
+        """
+        Register inputs and get the ones still to score
+
+        Args:
+            audio_paths: Paths of every input of the run
+
+        Returns:
+            Paths not completed earlier, in input order (one per distinct
+            content, see duplicates; failed inputs are included if
+            RUN_CONFIG['retry_failed'])
+        """
+        hashes = self.manifest.hash_inputs(audio_paths)
+        self.manifest.register(hashes)
+        statuses = self.manifest.statuses(hashes.values())
+
+        skip = {DONE} if RUN_CONFIG['retry_failed'] else {DONE, FAILED}
+        pending = []
+        first_path: Dict[str, str] = {}
+        for path in audio_paths:
+            content_hash = hashes[path]
+            if content_hash in first_path:
+                self.duplicates[path] = first_path[content_hash]
+                continue
+            first_path[content_hash] = path
+            if statuses.get(content_hash) in skip or content_hash in self._outstanding:
+                continue
+            self._hashes[path] = content_hash
+            self._outstanding.add(content_hash)
+            pending.append(path)
+
+        if self.store is not None:
+            self._stored |= self.manifest.stored(self._hashes[path] for path in pending)
+        return pending
+
+    def record(self, audio_path: str, result: Optional[Dict]) -> None:
+        """
+        Record the outcome of one input (thread-safe)
+
+        Args:
+            audio_path: Path returned by pending()
+            result: Result dictionary or ScoringResult, or None if scoring failed
+        """
+        with self._lock:
+            content_hash = self._hashes[audio_path]
+            self._outstanding.discard(content_hash)
+            if result is None:
+                self._failed.append(content_hash)
+            else:
+                record = result.to_dict() if hasattr(result, 'to_dict') else dict(result)
+                record['content_hash'] = content_hash
+                self.sink.write(record)
+                self._done.append(content_hash)
+                # An input rescored after a crash may already have a
+                # published row; it keeps that one
+                if self.store is not None and content_hash not in self._stored:
+                    self.store.append(result, key=content_hash)
+                    self._stored.add(content_hash)
+            if len(self._done) + len(self._failed) >= self.fsync_every:
+                self._commit()
+
+    def restore_store(self) -> int:
+        """
+        Append the logged results of done inputs missing from the store
+
+        These are the rows a crashed run buffered but never published.
+        The log is only read when some are missing.
+
+        Returns:
+            Number of results appended
+        """
+        missing = self.manifest.unstored_done() if self.store is not None else set()
+        restored = 0
+        if missing:
+            for record in read_jsonl(self.results_path):
+                content_hash = record.get('content_hash')
+                if content_hash in missing:
+                    self.store.append(record, key=content_hash)
+                    missing.discard(content_hash)
+                    restored += 1
+                    if not missing:
+                        break
+        return restored
+
+    def finish(self) -> None:
+        """Mark inputs that never produced an outcome as failed"""
+        with self._lock:
+            self._failed.extend(self._outstanding)
+            self._outstanding.clear()
+            self._commit()
+
+    def close(self) -> None:
+        """Commit recorded outcomes and close the log and manifest"""
+        with self._lock:
+            self._commit()
+        self.sink.close()
+        self.manifest.close()
+
+    def _commit(self) -> None:
+        """Fsync the log, then mark its inputs in the manifest"""
+        if not self._done and not self._failed:
+            return
+        self.sink.sync()
+        self.manifest.mark(self._done, DONE)
+        self.manifest.mark(self._failed, FAILED)
+        self._done = []
+        self._failed = []
@@ -0,0 +1,613 @@
+"""
+Scoring Server Module
+Long-running local HTTP service with warm models and request micro-batching
+
+Endpoints:
+    POST /score   Raw audio bytes (optional ?name=clip.wav), or a JSON body
+                  {"path": "/path/to/audio.wav"} if file paths are allowed
+                  (--allow-file-paths); returns the scoring result
+    GET  /health  Service status, queue depth and batching statistics
+    GET  /metrics Stage timings in Prometheus text format
+                  (requires METRICS_CONFIG['enabled'])
+
+Run with:
+    python src/server.py [--host 127.0.0.1] [--port 8765] [--allow-file-paths]
+"""
+
+import os
+import sys
+import json
+import queue
+import signal
+import logging
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+try:
+    from src.config import PIPELINE_CONFIG, SERVER_CONFIG
+    from src.instrumentation import get_metrics
+    from src.pipeline import ScoringPipeline
+    from src.nlp_resources import get_tagger
+except ImportError:
+    from config import PIPELINE_CONFIG, SERVER_CONFIG
+    from instrumentation import get_metrics
+    from pipeline import ScoringPipeline
+    from nlp_resources import get_tagger
+
+
+# Tells the batching thread to stop after the requests queued before it
+_STOP = object()
+
+# Audio containers accepted as uploads
+_UPLOAD_SUFFIXES = ('.wav', '.mp3', '.flac', '.ogg', '.m4a')
+
+
+class ScoringError(Exception):
+    """A request could not be scored"""
+
+
+class MicroBatcher:
+    """Group concurrently submitted items into batches within a latency window"""
+
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]],
+                 window_ms: float = None, max_batch_size: int = None):
+        """
+        Initialize MicroBatcher
+
+        Args:
+            process_batch: Function taking a list of items and returning a
+                           result (or Exception instance) for each item
+            window_ms: How long the first item of a batch waits for more
+            max_batch_size: Largest batch handed to process_batch
+        """
+        self.process_batch = process_batch
+        window_ms = SERVER_CONFIG['batch_window_ms'] if window_ms is None else window_ms
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size or SERVER_CONFIG['max_batch_size']
+
+        self.batches = 0
+        self.items = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='micro-batcher',
+                                        daemon=True)
+
+    def start(self) -> None:
+        """Start the batching thread"""
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queue an item for the next batch
+
+        Args:
+            item: Input for process_batch
+
+        Returns:
+            Future resolving to the item's result
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise ScoringError("Server is shutting down")
+            self._queue.put((item, future))
+        return future
+
+    def queue_depth(self) -> int:
+        """
+        Get the number of items waiting for a batch
+
+        Returns:
+            Queued item count
+        """
+        return self._queue.qsize()
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Stop accepting items and finish the ones already queued
+
+        Args:
+            timeout: Seconds to wait for queued items (None = no limit)
+
+        Returns:
+            True if every queued item was processed in time
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self) -> None:
+        """Collect and process batches until closed"""
+        stopping = False
+        while not stopping:
+            entry = self._queue.get()
+            if entry is _STOP:
+                break
+
+            batch = [entry]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            self._process(batch)
+
+    def _process(self, batch: List) -> None:
+        """
+        Run one batch and resolve its futures
+
+        Args:
+            batch: List of (item, future)
+        """
+        # Requests that gave up while queued are not scored
+        batch = [(item, future) for item, future in batch
+                 if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class ScoringService:
+    """Warm scoring pipeline behind a micro-batcher"""
+
+    def __init__(self, pipeline: ScoringPipeline = None, window_ms: float = None,
+                 max_batch_size: int = None, decode_workers: int = None,
+                 logger: logging.Logger = None):
+        """
+        Initialize ScoringService
+
+        Args:
+            pipeline: Pipeline to keep warm (default: a new ScoringPipeline)
+            window_ms: Micro-batch latency window (None = SERVER_CONFIG)
+            max_batch_size: Largest micro-batch (None = SERVER_CONFIG)
+            decode_workers: Threads decoding the audio of a batch
+                            (None = PIPELINE_CONFIG)
+            logger: Logger for service events (default: module logger)
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.pipeline = pipeline or ScoringPipeline(logger=self.logger)
+        self.batcher = MicroBatcher(self._score_batch, window_ms, max_batch_size)
+        self._decode_pool = ThreadPoolExecutor(
+            max_workers=decode_workers or PIPELINE_CONFIG['decode_workers'],
+            thread_name_prefix='decode',
+        )
+        self.started_at = None
+        self.draining = False
+        self._in_flight = 0
+        self._idle = threading.Condition()
+
+    def start(self) -> None:
+        """Load every model, then start accepting requests"""
+        self.logger.info("Warming up models...")
+        self.pipeline.warm_up()
+        get_tagger()
+        self.pipeline.grammar_scorer.score_grammar("Warm up the scorer.", 1.0, 0, None)
+        self.batcher.start()
+        self.started_at = time.time()
+        self.logger.info("Scoring service ready")
+
+    def score(self, audio_path: str, timeout: float = None) -> Dict:
+        """
+        Score one file as part of the next micro-batch
+
+        Args:
+            audio_path: Path to audio file
+            timeout: Seconds to wait for the result (None = SERVER_CONFIG)
+
+        Returns:
+            ScoringResult
+        """
+        if self.draining:
+            raise ScoringError("Server is shutting down")
+
+        timeout = SERVER_CONFIG['request_timeout'] if timeout is None else timeout
+        with self._idle:
+            self._in_flight += 1
+        try:
+            future = self.batcher.submit(audio_path)
+            try:
+                return future.result(timeout=timeout)
+            except TimeoutError:
+                future.cancel()
+                raise
+        finally:
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+
+    def health(self) -> Dict:
+        """
+        Describe the state of the service
+
+        Returns:
+            Dictionary with status, load and batching statistics
+        """
+        batches = self.batcher.batches
+        return {
+            'status': 'draining' if self.draining else 'ok',
+            'uptime_seconds': round(time.time() - self.started_at, 1) if self.started_at else 0.0,
+            'in_flight': self._in_flight,
+            'queue_depth': self.batcher.queue_depth(),
+            'batches': batches,
+            'requests_scored': self.batcher.items,
+            'mean_batch_size': round(self.batcher.items / batches, 2) if batches else 0.0,
+            'models_loaded': [
+                '/'.join(str(part) for part in key)
+                for key in self.pipeline.text_processor.registry.loaded_models()
+            ],
+        }
+
+    def drain(self, timeout: float = None) -> bool:
+        """
+        Refuse new requests and wait for in-flight ones to finish
+
+        Args:
+            timeout: Seconds to wait (None = SERVER_CONFIG)
+
+        Returns:
+            True if every in-flight request finished in time
+        """
+        timeout = SERVER_CONFIG['drain_timeout'] if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        self.draining = True
+        self.logger.info(f"Draining {self._in_flight} in-flight requests...")
+
+        with self._idle:
+            while self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._idle.wait(remaining)
+            drained = self._in_flight == 0
+
+        drained = self.batcher.close(max(0.0, deadline - time.monotonic())) and drained
+        self._decode_pool.shutdown(wait=drained)
+        return drained
+
+    def _score_batch(self, audio_paths: List[str]) -> List[Any]:
+        """
+        Decode, transcribe and score a micro-batch
+
+        Audio is decoded in parallel, ASR runs on the one warm model, and
+        all transcripts are POS-tagged together.
+
+        Args:
+            audio_paths: Paths of the audio files in the batch
+
+        Returns:
+            Result dictionary or ScoringError for each path
+        """
+        self.logger.info(f"Scoring micro-batch of {len(audio_paths)}")
+        decoded = list(self._decode_pool.map(self._decode, audio_paths))
+
+        outputs: List[Any] = [None] * len(audio_paths)
+        transcribed = []
+        for index, item in enumerate(decoded):
+            if isinstance(item, Exception):
+                outputs[index] = item
+                continue
+            try:
+                item = self.pipeline.transcribe(item)
+            except Exception as e:
+                item = None
+                self.logger.error(f"Transcription failed: {e}")
+            if item is None:
+                outputs[index] = ScoringError("Failed to transcribe audio")
+            else:
+                transcribed.append((index, item))
+
+        if transcribed:
+            scored = self.pipeline.score_batch([item for _, item in transcribed])
+            for (index, _), result in zip(transcribed, scored):
+                outputs[index] = result
+
+        return outputs
+
+    def _decode(self, audio_path: str) -> Any:
+        """
+        Decode one file, capturing failures
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            Output of ScoringPipeline.decode(), or ScoringError
+        """
+        try:
+            item = self.pipeline.decode(audio_path)
+        except Exception as e:
+            return ScoringError(f"Failed to load audio: {e}")
+        if item is None:
+            return ScoringError("Failed to load audio")
+        return item
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars and other non-JSON values"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a ScoringService"""
+
+    server_version = 'GrammarScoringServer/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        if path == '/metrics':
+            self._send_text(HTTPStatus.OK, get_metrics().render(),
+                            'text/plain; version=0.0.4')
+            return
+        if path != '/health':
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': 'Not found'})
+            return
+        health = self.server.service.health()
+        status = HTTPStatus.OK if health['status'] == 'ok' else HTTPStatus.SERVICE_UNAVAILABLE
+        self._send_json(status, health)
+
+    def do_POST(self) -> None:
+        # Rejections below leave the request body unread, so they close the
+        # connection; otherwise the body would be parsed as the next request
+        url = urlparse(self.path)
+        if url.path != '/score':
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': 'Not found'}, close=True)
+            return
+        if self.server.service.draining:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE,
+                            {'error': 'Server is shutting down'}, close=True)
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            self._send_json(HTTPStatus.LENGTH_REQUIRED,
+                            {'error': 'Request body with Content-Length required'},
+                            close=True)
+            return
+        if length > SERVER_CONFIG['max_upload_mb'] * 1024 * 1024:
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            {'error': 'Upload too large'}, close=True)
+            return
+
+        body = self.rfile.read(length)
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip()
+        query = parse_qs(url.query)
+
+        if content_type == 'application/json':
+            self._score_path(body)
+        else:
+            name = query.get('name', ['upload.wav'])[0]
+            self._score_upload(body, os.path.basename(name))
+
+    def _score_path(self, body: bytes) -> None:
+        """
+        Score a file already on this machine
+
+        Args:
+            body: JSON request body with a "path" field
+        """
+        if not SERVER_CONFIG['allow_file_paths']:
+            self._send_json(HTTPStatus.FORBIDDEN, {'error': 'File paths are disabled'})
+            return
+        try:
+            audio_path = json.loads(body)['path']
+        except (ValueError, KeyError, TypeError):
+            self._send_json(HTTPStatus.BAD_REQUEST,
+                            {'error': 'Expected JSON body {"path": ...}'})
+            return
+        if not os.path.isfile(audio_path):
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': f'No such file: {audio_path}'})
+            return
+        self._score(audio_path)
+
+    def _score_upload(self, body: bytes, name: str) -> None:
+        """
+        Score uploaded audio bytes
+
+        Args:
+            body: Audio file contents
+            name: Original file name, used for the container type and result
+        """
+        suffix = os.path.splitext(name)[1].lower()
+        if suffix not in _UPLOAD_SUFFIXES:
+            suffix = '.wav'
+
+        fd, upload_path = tempfile.mkstemp(suffix=suffix, prefix='upload_')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            self._score(upload_path, name)
+        finally:
+            os.remove(upload_path)
+
+    def _score(self, audio_path: str, name: str = None) -> None:
+        """
+        Score a file through the service and send the response
+
+        Args:
+            audio_path: Path to audio file
+            name: File name to report instead of the path's base name
+        """
+        try:
+            result = self.server.service.score(audio_path)
+        except TimeoutError:
+            self._send_json(HTTPStatus.GATEWAY_TIMEOUT, {'error': 'Scoring timed out'})
+            return
+        except ScoringError as e:
+            status = (HTTPStatus.SERVICE_UNAVAILABLE if self.server.service.draining
+                      else HTTPStatus.UNPROCESSABLE_ENTITY)
+            self._send_json(status, {'error': str(e)})
+            return
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)})
+            return
+
+        result = result.to_dict()
+        if name:
+            result['audio_file'] = name
+        self._send_json(HTTPStatus.OK, result)
+
+    def _send_json(self, status: HTTPStatus, payload: Dict, close: bool = False) -> None:
+        """
+        Send a JSON response
+
+        Args:
+            status: HTTP status
+            payload: Response body
+            close: Close the connection after the response
+        """
+        body = json.dumps(payload, default=_json_default)
+        self._send_text(status, body, 'application/json', close)
+
+    def _send_text(self, status: HTTPStatus, body: str, content_type: str,
+                   close: bool = False) -> None:
+        """
+        Send a text response
+
+        Args:
+            status: HTTP status
+            body: Response body
+            content_type: Content-Type header value
+            close: Close the connection after the response
+        """
+        encoded = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(encoded)))
+        if close:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args) -> None:
+        self.server.service.logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """Threaded HTTP server owning a ScoringService"""
+
+    daemon_threads = True
+
+    def __init__(self, service: ScoringService, host: str = None, port: int = None):
+        """
+        Initialize ScoringServer
+
+        Args:
+            service: Started scoring service
+            host: Interface to bind (None = SERVER_CONFIG)
+            port: Port to bind, 0 for any free port (None = SERVER_CONFIG)
+        """
+        self.service = service
+        host = host or SERVER_CONFIG['host']
+        port = SERVER_CONFIG['port'] if port is None else port
+        super().__init__((host, port), ScoringRequestHandler)
+
+    def drain_and_shutdown(self, timeout: float = None) -> bool:
+        """
+        Finish in-flight requests, then stop serving
+
+        Args:
+            timeout: Seconds to wait for in-flight requests (None = SERVER_CONFIG)
+
+        Returns:
+            True if every in-flight request finished in time
+        """
+        drained = self.service.drain(timeout)
+        self.shutdown()
+        return drained
+
+
+def serve(host: str = None, port: int = None, service: ScoringService = None) -> None:
+    """
+    Warm up and serve until SIGINT/SIGTERM, then drain gracefully
+
+    Args:
+        host: Interface to bind (None = SERVER_CONFIG)
+        port: Port to bind (None = SERVER_CONFIG)
+        service: Service to expose (default: a new ScoringService)
+    """
+    service = service or ScoringService()
+    service.start()
+    server = ScoringServer(service, host, port)
+
+    def handle_signal(signum, frame):
+        # shutdown() blocks until serve_forever() returns, so not from here
+        if not service.draining:
+            threading.Thread(target=server.drain_and_shutdown, name='drain',
+                             daemon=True).start()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    address, bound_port = server.server_address[:2]
+    service.logger.info(f"Serving on http://{address}:{bound_port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.logger.info("Server stopped")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    try:
+        from src.config import METRICS_CONFIG
+        from src.utils import setup_logging
+    except ImportError:
+        from config import METRICS_CONFIG
+        from utils import setup_logging
+
+    parser = argparse.ArgumentParser(description='Grammar scoring server')
+    parser.add_argument('--host', default=None, help='Interface to bind')
+    parser.add_argument('--port', type=int, default=None, help='Port to bind')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Time pipeline stages and serve them on /metrics')
+    parser.add_argument('--allow-file-paths', action='store_true',
+                        help='Accept JSON requests naming files on this machine')
+    args = parser.parse_args()
+    if args.metrics:
+        METRICS_CONFIG['enabled'] = True
+    if args.allow_file_paths:
+        SERVER_CONFIG['allow_file_paths'] = True
+
+    logger = setup_logging()
+    serve(args.host, args.port, ScoringService(logger=logger))
+    sys.exit(0)
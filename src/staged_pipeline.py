@@ -0,0 +1,279 @@
+"""
+Staged Pipeline Module
+Overlaps pipeline stages with worker threads and bounded queues
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+try:
+    from src.config import PIPELINE_CONFIG
+except ImportError:
+    from config import PIPELINE_CONFIG
+
+
+# Marks the end of the input on a stage queue
+_DONE = object()
+
+
+class StageStats:
+    """Throughput and queue-depth counters for one stage"""
+
+    def __init__(self, name: str, workers: int):
+        """
+        Initialize StageStats
+
+        Args:
+            name: Stage name
+            workers: Number of worker threads in the stage
+        """
+        self.name = name
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self._lock = threading.Lock()
+
+    def record_depth(self, depth: int) -> None:
+        """
+        Record the input queue depth seen by a worker
+
+        Args:
+            depth: Items waiting in the stage's input queue
+        """
+        with self._lock:
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+            self._depth_total += depth
+            self._depth_samples += 1
+
+    def record_item(self, seconds: float, ok: bool) -> None:
+        """
+        Record one processed item
+
+        Args:
+            seconds: Time spent in the stage function
+            ok: False if the item failed or was dropped
+        """
+        with self._lock:
+            self.busy_seconds += seconds
+            if ok:
+                self.processed += 1
+            else:
+                self.failed += 1
+
+    def to_dict(self, elapsed: float, queue_depth: int) -> Dict[str, Any]:
+        """
+        Summarize the stage
+
+        Args:
+            elapsed: Wall time of the whole run in seconds
+            queue_depth: Current depth of the stage's input queue
+
+        Returns:
+            Dictionary with stage statistics
+        """
+        with self._lock:
+            items = self.processed + self.failed
+            return {
+                'workers': self.workers,
+                'processed': self.processed,
+                'failed': self.failed,
+                'busy_seconds': round(self.busy_seconds, 4),
+                'throughput_per_sec': round(items / elapsed, 4) if elapsed > 0 else 0.0,
+                'utilization': (round(self.busy_seconds / (elapsed * self.workers), 4)
+                                if elapsed > 0 else 0.0),
+                'queue_depth': queue_depth,
+                'max_queue_depth': self.max_queue_depth,
+                'mean_queue_depth': (round(self._depth_total / self._depth_samples, 2)
+                                     if self._depth_samples else 0.0),
+            }
+
+
+class StagedPipeline:
+    """Run items through stages connected by bounded queues"""
+
+    def __init__(self, stages: List[Tuple[str, Callable, int]],
+                 queue_size: int = None):
+        """
+        Initialize StagedPipeline
+
+        Args:
+            stages: List of (name, function, worker_threads). Each function
+                    takes the previous stage's output and returns the next
+                    stage's input, or None to drop the item.
+            queue_size: Capacity of each inter-stage queue
+        """
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage")
+
+        self.stages = stages
+        self.queue_size = queue_size or PIPELINE_CONFIG['queue_size']
+        self._queues: List[queue.Queue] = []
+        self._stats: List[StageStats] = []
+        self._start_time = None
+        self._end_time = None
+        self._feed_error = None
+
+    def run(self, items: Iterable) -> List[Any]:
+        """
+        Push items through every stage
+
+        Args:
+            items: Inputs for the first stage
+
+        Returns:
+            Final outputs in input order (None for dropped or failed items)
+
+        Raises:
+            Exception: Whatever iterating items raised, once the stages
+                       have finished the inputs read before the error
+        """
+        self._queues = [queue.Queue(maxsize=self.queue_size)
+                        for _ in range(len(self.stages) + 1)]
+        self._stats = [StageStats(name, workers)
+                       for name, _, workers in self.stages]
+        self._start_time = time.perf_counter()
+        self._end_time = None
+        self._feed_error = None
+
+        threads = []
+        for index, (name, func, workers) in enumerate(self.stages):
+            remaining = [workers]
+            remaining_lock = threading.Lock()
+            for worker in range(workers):
+                thread = threading.Thread(
+                    target=self._stage_worker,
+                    args=(index, func, remaining, remaining_lock),
+                    name=f"{name}-{worker}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        count = [0]
+        feeder = threading.Thread(target=self._feed, args=(items, count),
+                                  name="feeder", daemon=True)
+        feeder.start()
+
+        # Collect finished items until the last stage signals completion
+        finished = {}
+        output_queue = self._queues[-1]
+        while True:
+            entry = output_queue.get()
+            if entry is _DONE:
+                break
+            index, value = entry
+            finished[index] = value
+
+        feeder.join()
+        for thread in threads:
+            thread.join()
+        self._end_time = time.perf_counter()
+
+        if self._feed_error is not None:
+            raise self._feed_error
+        return [finished.get(index) for index in range(count[0])]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-stage queue depth and throughput
+
+        Returns:
+            Dictionary mapping stage name to its statistics
+        """
+        if self._start_time is None:
+            return {}
+        end = self._end_time or time.perf_counter()
+        elapsed = end - self._start_time
+        return {
+            stats.name: stats.to_dict(elapsed, self._queues[i].qsize())
+            for i, stats in enumerate(self._stats)
+        }
+
+    def format_stats(self) -> str:
+        """
+        Render per-stage statistics as a table
+
+        Returns:
+            Multi-line summary string
+        """
+        lines = [f"{'stage':<12}{'workers':>8}{'done':>8}{'failed':>8}"
+                 f"{'items/s':>10}{'util':>8}{'max_q':>8}{'mean_q':>8}"]
+        for name, s in self.stats().items():
+            lines.append(
+                f"{name:<12}{s['workers']:>8}{s['processed']:>8}{s['failed']:>8}"
+                f"{s['throughput_per_sec']:>10.2f}{s['utilization']:>8.2f}"
+                f"{s['max_queue_depth']:>8}{s['mean_queue_depth']:>8.2f}"
+            )
+        return "\n".join(lines)
+
+    def _feed(self, items: Iterable, count: List[int]) -> None:
+        """
+        Enqueue inputs for the first stage, blocking while it is full
+
+        Args:
+            items: Inputs for the first stage
+            count: Single-element list receiving the number of inputs
+        """
+        input_queue = self._queues[0]
+        try:
+            for index, item in enumerate(items):
+                input_queue.put((index, item))
+                count[0] = index + 1
+        except Exception as e:
+            # Re-raised by run() after the stages wind down
+            self._feed_error = e
+        finally:
+            for _ in range(self.stages[0][2]):
+                input_queue.put(_DONE)
+
+    def _stage_worker(self, index: int, func: Callable,
+                      remaining: List[int], remaining_lock: threading.Lock) -> None:
+        """
+        Process items of one stage until its input is exhausted
+
+        Args:
+            index: Stage index
+            func: Stage function
+            remaining: Single-element list counting live workers in the stage
+            remaining_lock: Lock guarding remaining
+        """
+        input_queue = self._queues[index]
+        output_queue = self._queues[index + 1]
+        stats = self._stats[index]
+        is_last = index == len(self.stages) - 1
+
+        while True:
+            stats.record_depth(input_queue.qsize())
+            entry = input_queue.get()
+            if entry is _DONE:
+                break
+
+            item_index, item = entry
+            started = time.perf_counter()
+            try:
+                value = func(item)
+            except Exception as e:
+                print(f"Error in stage '{stats.name}': {e}")
+                value = None
+            stats.record_item(time.perf_counter() - started, value is not None)
+
+            # Dropped items still reach the collector so ordering is kept
+            if value is None and not is_last:
+                self._queues[-1].put((item_index, None))
+            else:
+                output_queue.put((item_index, value))
+
+        # The last worker of a stage tells the next stage to finish
+        with remaining_lock:
+            remaining[0] -= 1
+            last_worker = remaining[0] == 0
+        if last_worker:
+            next_workers = 1 if is_last else self.stages[index + 1][2]
+            for _ in range(next_workers):
+                output_queue.put(_DONE)
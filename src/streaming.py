@@ -0,0 +1,286 @@
+"""
+Streaming Session Module
+Scores speech while it is being recorded, from incremental PCM chunks
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+try:
+    from src.config import AUDIO_CONFIG, STREAMING_CONFIG
+    from src.audio_processor import StreamingAudioStats, frame_energy_db
+    from src.document import AnalyzedDocument
+    from src.grammar_scorer import IncrementalGrammarScorer
+    from src.pipeline import ScoringPipeline
+except ImportError:
+    from config import AUDIO_CONFIG, STREAMING_CONFIG
+    from audio_processor import StreamingAudioStats, frame_energy_db
+    from document import AnalyzedDocument
+    from grammar_scorer import IncrementalGrammarScorer
+    from pipeline import ScoringPipeline
+
+
+# Frame used to find a quiet point to commit a window at (20 ms at 16 kHz)
+_CUT_FRAME_SECONDS = 0.02
+
+
+def pcm_to_float(chunk: Union[bytes, np.ndarray]) -> np.ndarray:
+    """
+    Convert a PCM chunk to mono float32 samples in [-1, 1]
+
+    Args:
+        chunk: 16-bit little-endian PCM bytes (a whole number of samples),
+               or an integer or float array
+
+    Returns:
+        Float32 samples
+    """
+    if isinstance(chunk, (bytes, bytearray, memoryview)):
+        chunk = np.frombuffer(chunk, dtype='<i2')
+    chunk = np.asarray(chunk).ravel()
+    if np.issubdtype(chunk.dtype, np.integer):
+        return chunk.astype(np.float32) / float(np.iinfo(chunk.dtype).max + 1)
+    return chunk.astype(np.float32, copy=False)
+
+
+class StreamingSession:
+    """Live scoring session fed with audio chunks as they are recorded"""
+
+    def __init__(self, sample_rate: int = None, pipeline: ScoringPipeline = None,
+                 update_interval: float = None, window_seconds: float = None,
+                 name: str = 'stream',
+                 on_update: Callable[[Dict], None] = None,
+                 logger: logging.Logger = None):
+        """
+        Initialize StreamingSession
+
+        Args:
+            sample_rate: Sample rate of the incoming chunks
+                         (default: AUDIO_CONFIG['sample_rate'])
+            pipeline: Warm pipeline providing ASR and scoring
+            update_interval: Seconds of audio between provisional scores
+                             (None = STREAMING_CONFIG)
+            window_seconds: Length the rolling ASR window grows to before its
+                            text is committed (None = STREAMING_CONFIG)
+            name: Reported as audio_file in results
+            on_update: Called with every provisional and final result
+            logger: Logger for session events (default: module logger)
+        """
+        self.sample_rate = sample_rate or AUDIO_CONFIG['sample_rate']
+        self.pipeline = pipeline or ScoringPipeline()
+        self.update_interval = update_interval or STREAMING_CONFIG['update_interval']
+        self.window_seconds = window_seconds or STREAMING_CONFIG['window_seconds']
+        self.name = name
+        self.on_update = on_update
+        self.logger = logger or logging.getLogger(__name__)
+        self.silence_threshold = AUDIO_CONFIG['silence_threshold']
+
+        trim_top_db = None
+        if AUDIO_CONFIG['remove_silence']:
+            trim_top_db = abs(self.silence_threshold)
+        self.stats = StreamingAudioStats(self.sample_rate, trim_top_db=trim_top_db)
+
+        self.updates = 0
+        self.closed = False
+        self.last_result: Optional[Dict] = None
+        self._pending: List[np.ndarray] = []
+        self._pending_samples = 0
+        # Trailing byte of a PCM chunk that split a sample
+        self._partial_sample = b''
+        self._committed_text: List[str] = []
+        self._committed_words = 0
+        self._pending_text = ''
+        self._pending_document = None
+        self._scorer = IncrementalGrammarScorer(self.pipeline.grammar_scorer)
+        self._since_update = 0
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio received so far"""
+        return self.stats.duration
+
+    @property
+    def transcript(self) -> str:
+        """Committed text followed by the current window's provisional text"""
+        return ' '.join(part for part in self._committed_text + [self._pending_text]
+                        if part)
+
+    @property
+    def word_count(self) -> int:
+        """Words transcribed so far"""
+        return self._committed_words + len(self._pending_text.split())
+
+    def feed(self, chunk: Union[bytes, np.ndarray]) -> Optional[Dict]:
+        """
+        Add the next chunk of audio
+
+        ASR and scoring run synchronously when an update is due, so feed
+        chunks from a worker rather than the audio capture callback.
+        Committed text is scored incrementally; only the rolling window
+        is re-analyzed on each update.
+
+        Args:
+            chunk: 16-bit PCM bytes or an array of mono samples; byte
+                   chunks may split a sample, whose first byte is kept
+                   for the next chunk
+
+        Returns:
+            Provisional result if update_interval seconds of audio arrived
+            since the last one, otherwise None
+        """
+        if self.closed:
+            raise RuntimeError("StreamingSession is already closed")
+
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = self._partial_sample + bytes(chunk)
+            whole = len(chunk) - len(chunk) % 2
+            chunk, self._partial_sample = chunk[:whole], chunk[whole:]
+
+        samples = pcm_to_float(chunk)
+        if not len(samples):
+            return None
+
+        self.stats.update(samples)
+        self._pending.append(samples)
+        self._pending_samples += len(samples)
+        self._since_update += len(samples)
+
+        if self._since_update < self.update_interval * self.sample_rate:
+            return None
+        self._since_update = 0
+        self._transcribe_window()
+        return self._emit(self.stats.snapshot(self.silence_threshold), final=False)
+
+    def close(self) -> Dict:
+        """
+        End the session and score the complete recording
+
+        Returns:
+            Final result
+        """
+        if self.closed:
+            return self.last_result
+
+        self.closed = True
+        self._transcribe_window(flush=True)
+        return self._emit(self.stats.finalize(self.silence_threshold), final=True)
+
+    def _transcribe_window(self, flush: bool = False) -> None:
+        """
+        Transcribe the rolling window, committing it once it is long enough
+
+        Args:
+            flush: Commit the whole window (end of stream)
+        """
+        if not self._pending_samples:
+            self._pending_text = ''
+            self._pending_document = None
+            return
+
+        audio = np.concatenate(self._pending)
+        window_samples = int(self.window_seconds * self.sample_rate)
+        if flush:
+            cut = len(audio)
+        elif len(audio) >= window_samples:
+            cut = self._find_cut(audio)
+        else:
+            cut = 0
+
+        if cut:
+            text = self._speech_to_text(audio[:cut])
+            if text:
+                # Committed text is analyzed once and kept in running totals
+                self._scorer.append(text, self._analyze(text))
+                self._committed_text.append(text)
+                self._committed_words += len(text.split())
+            audio = audio[cut:]
+            self._pending = [audio] if len(audio) else []
+            self._pending_samples = len(audio)
+
+        self._pending_text = self._speech_to_text(audio) if len(audio) else ''
+        self._pending_document = (self._analyze(self._pending_text)
+                                  if self._pending_text else None)
+
+    def _analyze(self, text: str) -> AnalyzedDocument:
+        """
+        Normalize, tokenize and tag text as the pipeline's scoring step does
+
+        Args:
+            text: Transcript text
+
+        Returns:
+            Tagged AnalyzedDocument
+        """
+        return self.pipeline.text_processor.preprocess_text(text)['document']
+
+    def _find_cut(self, audio: np.ndarray) -> int:
+        """
+        Pick the quietest point near the end of the window to commit at
+
+        Args:
+            audio: Rolling window samples
+
+        Returns:
+            Sample index to cut the window at
+        """
+        search = int(STREAMING_CONFIG['cut_search_seconds'] * self.sample_rate)
+        start = max(0, len(audio) - search)
+        frame = max(1, int(_CUT_FRAME_SECONDS * self.sample_rate))
+        energy_db = frame_energy_db(audio[start:], frame, frame)
+        if not len(energy_db):
+            return len(audio)
+        return min(len(audio), start + int(np.argmin(energy_db)) * frame)
+
+    def _speech_to_text(self, audio: np.ndarray) -> str:
+        """
+        Transcribe a window without caching it
+
+        Args:
+            audio: Mono samples at the session sample rate
+
+        Returns:
+            Stripped transcript
+        """
+        text = self.pipeline.text_processor.speech_to_text(
+            audio, sample_rate=self.sample_rate, use_cache=False
+        )
+        return (text or '').strip()
+
+    def _emit(self, audio_stats: Dict, final: bool) -> Dict:
+        """
+        Score the transcript so far and notify the listener
+
+        Args:
+            audio_stats: StreamingAudioStats snapshot or final summary
+            final: Whether this is the result of the closed session
+
+        Returns:
+            Scoring result with streaming fields added
+        """
+        duration = (audio_stats['trimmed_duration'] if AUDIO_CONFIG['remove_silence']
+                    else audio_stats['duration'])
+        item = {
+            'audio_path': self.name,
+            'transcript': self.transcript,
+            'duration': duration,
+            'pause_count': audio_stats['pause_count'],
+        }
+        # Error positions cover the whole transcript, so only the final
+        # result pays for them
+        scoring_result = self._scorer.score(duration, audio_stats['pause_count'],
+                                            self._pending_text,
+                                            self._pending_document,
+                                            positions=final)
+        result = self.pipeline.make_result(item, scoring_result)
+        result['provisional'] = not final
+        result['elapsed_seconds'] = round(self.duration, 2)
+        result['words_per_minute'] = (round(self.word_count / duration * 60, 1)
+                                      if duration > 0 else 0.0)
+
+        self.updates += 1
+        self.last_result = result
+        if self.on_update is not None:
+            self.on_update(result)
+        return result
@@ -3,73 +3,86 @@ Text Processing Module
 Handles speech-to-text conversion and text preprocessing
 """
 
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.tag import pos_tag
-from nltk.corpus import wordnet, stopwords
+import io
 import re
-from typing import List, Dict, Tuple
+import sqlite3
+from typing import List, Dict, Tuple, Union
 import numpy as np
 
 try:
     from src.config import NLP_CONFIG, ASR_CONFIG
+    from src.model_registry import ModelRegistry, get_registry
+    from src.transcript_cache import TranscriptCache, get_transcript_cache, hash_audio
+    from src.document import AnalyzedDocument, analyze_text, analyze_texts
+    from src.nlp_resources import (get_stopwords, sent_tokenize, tag_token_lists,
+                                   tag_tokens, word_tokenize)
 except ImportError:
     from config import NLP_CONFIG, ASR_CONFIG
+    from model_registry import ModelRegistry, get_registry
+    from transcript_cache import TranscriptCache, get_transcript_cache, hash_audio
+    from document import AnalyzedDocument, analyze_text, analyze_texts
+    from nlp_resources import (get_stopwords, sent_tokenize, tag_token_lists,
+                               tag_tokens, word_tokenize)
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('taggers/averaged_perceptron_tagger')
-except LookupError:
-    nltk.download('averaged_perceptron_tagger')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+# Whisper models operate on 16 kHz mono audio
+ASR_SAMPLE_RATE = 16000
 
 
 class TextProcessor:
     """Process text for grammar analysis"""
     
-    def __init__(self):
-        """Initialize TextProcessor"""
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(self, registry: ModelRegistry = None,
+                 cache: TranscriptCache = None):
+        """
+        Initialize TextProcessor
+        
+        Args:
+            registry: Model registry to take ASR models from
+                      (default: the process-wide registry)
+            cache: Transcript cache (default: the process-wide cache,
+                   if enabled in CACHE_CONFIG)
+        """
+        self.registry = registry or get_registry()
+        self.cache = cache if cache is not None else get_transcript_cache()
+    
+    @property
+    def stop_words(self) -> frozenset:
+        """English stopwords, loaded on first use"""
+        return get_stopwords()
     
-    def speech_to_text_whisper(self, audio_path: str) -> str:
+    def speech_to_text_whisper(self, audio: Union[str, np.ndarray],
+                               sample_rate: int = None) -> str:
         """
         Convert speech to text using OpenAI Whisper
         
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file or mono float audio signal
+            sample_rate: Sample rate of an in-memory signal
             
         Returns:
             Transcribed text
         """
         try:
-            import whisper
-            model = whisper.load_model(ASR_CONFIG['model_size'])
-            result = model.transcribe(audio_path, language=ASR_CONFIG['language'])
+            if isinstance(audio, np.ndarray):
+                audio = self._prepare_audio_array(audio, sample_rate)
+            model_size, device, dtype = self.registry.make_key()
+            model = self.registry.get_model(model_size, device, dtype)
+            result = model.transcribe(audio,
+                                      language=ASR_CONFIG['language'],
+                                      fp16=(dtype == 'float16'))
             return result['text']
         except Exception as e:
             print(f"Error in Whisper transcription: {e}")
             return ""
     
-    def speech_to_text_google(self, audio_path: str) -> str:
+    def speech_to_text_google(self, audio: Union[str, np.ndarray],
+                              sample_rate: int = None) -> str:
         """
         Convert speech to text using Google Speech Recognition
         
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file or mono float audio signal
+            sample_rate: Sample rate of an in-memory signal
             
         Returns:
             Transcribed text
@@ -78,34 +91,127 @@ class TextProcessor:
             from speech_recognition import Recognizer, AudioFile
             recognizer = Recognizer()
             
-            with AudioFile(audio_path) as source:
-                audio = recognizer.record(source)
+            if isinstance(audio, np.ndarray):
+                audio = self._audio_array_to_wav(audio, sample_rate)
+            
+            with AudioFile(audio) as source:
+                recorded = recognizer.record(source)
             
-            text = recognizer.recognize_google(audio)
+            text = recognizer.recognize_google(recorded)
             return text
         except Exception as e:
             print(f"Error in Google Speech Recognition: {e}")
             return ""
     
-    def speech_to_text(self, audio_path: str, engine: str = None) -> str:
+    def speech_to_text(self, audio: Union[str, np.ndarray], engine: str = None,
+                       sample_rate: int = None, use_cache: bool = True) -> str:
         """
         Convert speech to text using specified engine
         
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or the already decoded mono signal
+                   (e.g. the output of AudioProcessor.preprocess_audio) so
+                   the file is not decoded a second time
             engine: 'whisper' or 'google'
+            sample_rate: Sample rate of an in-memory signal
+                         (default: ASR sample rate)
+            use_cache: Look up and store the transcript in the cache
+                       (disable for audio that will not recur, e.g. live windows)
             
         Returns:
             Transcribed text
         """
         engine = engine or ASR_CONFIG['engine']
         
+        if engine not in ('whisper', 'google'):
+            raise ValueError(f"Unknown engine: {engine}")
+        
+        # Transcripts are cached by audio content, so reruns skip ASR
+        cache_key = self._cache_key(audio, engine, sample_rate) if use_cache else None
+        if cache_key is not None:
+            try:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            except sqlite3.Error as e:
+                print(f"Error reading transcript cache: {e}")
+        
         if engine == 'whisper':
-            return self.speech_to_text_whisper(audio_path)
-        elif engine == 'google':
-            return self.speech_to_text_google(audio_path)
+            text = self.speech_to_text_whisper(audio, sample_rate)
         else:
-            raise ValueError(f"Unknown engine: {engine}")
+            text = self.speech_to_text_google(audio, sample_rate)
+        
+        if cache_key is not None and text:
+            try:
+                self.cache.put(cache_key, text)
+            except sqlite3.Error as e:
+                print(f"Error writing transcript cache: {e}")
+        
+        return text
+    
+    def _cache_key(self, audio: Union[str, np.ndarray], engine: str,
+                   sample_rate: int = None) -> str:
+        """
+        Build the transcript cache key for an ASR request
+        
+        Args:
+            audio: Path to audio file or audio signal
+            engine: ASR engine name
+            sample_rate: Sample rate of an in-memory signal
+            
+        Returns:
+            Cache key, or None if caching is disabled or the audio is unreadable
+        """
+        if self.cache is None:
+            return None
+        try:
+            content_hash = hash_audio(audio, sample_rate)
+        except OSError as e:
+            print(f"Error hashing audio for transcript cache: {e}")
+            return None
+        return self.cache.make_key(content_hash, engine,
+                                   ASR_CONFIG['model_size'],
+                                   ASR_CONFIG['language'])
+    
+    def _prepare_audio_array(self, audio: np.ndarray,
+                             sample_rate: int = None) -> np.ndarray:
+        """
+        Bring an in-memory signal to the format ASR models expect
+        
+        Args:
+            audio: Mono audio signal
+            sample_rate: Sample rate of the signal
+            
+        Returns:
+            Contiguous float32 signal at the ASR sample rate
+        """
+        sample_rate = sample_rate or ASR_SAMPLE_RATE
+        audio = np.asarray(audio, dtype=np.float32)
+        if sample_rate != ASR_SAMPLE_RATE:
+            import librosa
+            audio = librosa.resample(audio, orig_sr=sample_rate,
+                                     target_sr=ASR_SAMPLE_RATE)
+        return np.ascontiguousarray(audio, dtype=np.float32)
+    
+    def _audio_array_to_wav(self, audio: np.ndarray,
+                            sample_rate: int = None) -> io.BytesIO:
+        """
+        Encode an in-memory signal as a WAV file object
+        
+        Args:
+            audio: Mono audio signal
+            sample_rate: Sample rate of the signal
+            
+        Returns:
+            In-memory 16-bit PCM WAV file
+        """
+        import soundfile as sf
+        
+        buffer = io.BytesIO()
+        sf.write(buffer, np.asarray(audio, dtype=np.float32),
+                 sample_rate or ASR_SAMPLE_RATE, format='WAV', subtype='PCM_16')
+        buffer.seek(0)
+        return buffer
     
     def clean_text(self, text: str) -> str:
         """
@@ -162,9 +268,45 @@ class TextProcessor:
             List of (word, pos_tag) tuples
         """
         words = self.tokenize_words(text)
-        pos_tags = pos_tag(words)
+        pos_tags = tag_tokens(words)
         return pos_tags
     
+    def get_pos_tags_batch(self, texts: List[str]) -> List[List[Tuple[str, str]]]:
+        """
+        Get Part-of-Speech tags for many texts with one tagger call
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            List of (word, pos_tag) lists, aligned with texts
+        """
+        return tag_token_lists([self.tokenize_words(text) for text in texts])
+    
+    def analyze_document(self, text: str) -> AnalyzedDocument:
+        """
+        Tokenize and POS-tag text once for all later stages
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            AnalyzedDocument with sentences, tokens, offsets and POS tags
+        """
+        return analyze_text(text)
+    
+    def analyze_documents(self, texts: List[str]) -> List[AnalyzedDocument]:
+        """
+        Tokenize many texts and POS-tag them all in one tagger call
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            AnalyzedDocument for each text, in input order
+        """
+        return analyze_texts(texts)
+    
     def remove_stopwords(self, words: List[str]) -> List[str]:
         """
         Remove stopwords from word list
@@ -187,6 +329,71 @@ class TextProcessor:
         Returns:
             Dictionary with processed text components
         """
+        normalized = self._normalize_text(text)
+        
+        # Tokenize and tag once; later stages reuse the document
+        text_data = self._build_text_data(self.analyze_document(normalized))
+        text_data['transcript_document'] = self._transcript_documents(
+            [text], [text_data['document']]
+        )[0]
+        return text_data
+    
+    def preprocess_texts(self, texts: List[str]) -> List[Dict]:
+        """
+        Preprocess many transcripts, POS-tagging them in one batch
+        
+        Args:
+            texts: Raw texts from ASR
+            
+        Returns:
+            List of preprocess_text() results, aligned with texts
+        """
+        documents = self.analyze_documents(
+            [self._normalize_text(text) for text in texts]
+        )
+        transcript_documents = self._transcript_documents(texts, documents)
+        
+        text_data = []
+        for document, transcript_document in zip(documents, transcript_documents):
+            data = self._build_text_data(document)
+            data['transcript_document'] = transcript_document
+            text_data.append(data)
+        return text_data
+    
+    def _transcript_documents(self, texts: List[str],
+                              documents: List[AnalyzedDocument]) -> List[AnalyzedDocument]:
+        """
+        Tokenize the raw transcripts for GrammarScorer.score_grammar
+        
+        Scoring counts words and sentences of the transcript itself, not
+        of the normalized text, so each transcript is tokenized here once
+        (untagged) unless normalizing left it unchanged.
+        
+        Args:
+            texts: Raw texts from ASR
+            documents: Analyzed normalized texts, aligned with texts
+            
+        Returns:
+            AnalyzedDocument of each raw text, aligned with texts
+        """
+        changed = [index for index, (text, document) in enumerate(zip(texts, documents))
+                   if document.text != text]
+        transcript_documents = list(documents)
+        tokenized = analyze_texts([texts[index] for index in changed], tag=False)
+        for index, document in zip(changed, tokenized):
+            transcript_documents[index] = document
+        return transcript_documents
+    
+    def _normalize_text(self, text: str) -> str:
+        """
+        Clean and optionally lowercase text before analysis
+        
+        Args:
+            text: Raw text
+            
+        Returns:
+            Normalized text
+        """
         # Clean
         text = self.clean_text(text)
         
@@ -194,12 +401,21 @@ class TextProcessor:
         if NLP_CONFIG['lowercase']:
             text = text.lower()
         
-        # Tokenize
-        sentences = self.tokenize_sentences(text)
-        words = self.tokenize_words(text)
+        return text
+    
+    def _build_text_data(self, document: AnalyzedDocument) -> Dict:
+        """
+        Collect the processed text components of an analyzed document
         
-        # POS tagging
-        pos_tags = self.get_pos_tags(text)
+        Args:
+            document: Analyzed, normalized text
+            
+        Returns:
+            Dictionary with processed text components
+        """
+        sentences = document.sentences
+        words = document.tokens
+        pos_tags = document.pos_tags
         
         # Remove stopwords if configured
         if NLP_CONFIG['remove_stopwords']:
@@ -208,13 +424,14 @@ class TextProcessor:
             words_filtered = words
         
         return {
-            'raw_text': text,
+            'raw_text': document.text,
             'sentences': sentences,
             'words': words,
             'words_filtered': words_filtered,
             'pos_tags': pos_tags,
             'num_sentences': len(sentences),
             'num_words': len(words),
+            'document': document,
         }
     
     def calculate_text_stats(self, text_data: Dict) -> Dict:
@@ -237,7 +454,10 @@ class TextProcessor:
         avg_word_length = np.mean([len(w) for w in words]) if words else 0
         
         # Sentence length std
-        sentence_lengths = [len(self.tokenize_words(s)) for s in sentences]
+        if 'document' in text_data:
+            sentence_lengths = text_data['document'].sentence_lengths
+        else:
+            sentence_lengths = [len(self.tokenize_words(s)) for s in sentences]
         sentence_length_std = np.std(sentence_lengths) if sentence_lengths else 0
         
         return {
@@ -247,6 +467,3 @@ class TextProcessor:
             'total_sentences': len(sentences),
             'total_words': len(words),
         }
-
-
-import numpy as np
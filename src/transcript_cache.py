@@ -0,0 +1,244 @@
+"""
+Transcript Cache Module
+Content-addressed on-disk cache of ASR transcripts
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional, Union
+
+import numpy as np
+
+try:
+    from src.config import CACHE_CONFIG, FILE_PATHS
+except ImportError:
+    from config import CACHE_CONFIG, FILE_PATHS
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    key TEXT PRIMARY KEY,
+    transcript TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transcripts_last_access
+    ON transcripts (last_access);
+"""
+
+# Bytes read at a time when hashing audio files
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def hash_audio(audio: Union[str, np.ndarray], sample_rate: int = None) -> str:
+    """
+    Hash audio content (not its path)
+
+    Args:
+        audio: Path to audio file or audio signal
+        sample_rate: Sample rate of an in-memory signal
+
+    Returns:
+        Hex digest identifying the audio content
+    """
+    digest = hashlib.blake2b(digest_size=20)
+
+    if isinstance(audio, np.ndarray):
+        digest.update(b'pcm:')
+        digest.update(str(sample_rate).encode())
+        digest.update(np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+    else:
+        digest.update(b'file:')
+        with open(audio, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """SQLite-backed LRU cache of transcripts keyed by audio content"""
+
+    def __init__(self, path: str = None, max_size_mb: float = None):
+        """
+        Initialize TranscriptCache
+
+        Args:
+            path: SQLite database file (default: <cache_dir>/transcripts.sqlite3)
+            max_size_mb: Size limit for stored transcripts (None = config)
+        """
+        self.path = path or os.path.join(FILE_PATHS['cache_dir'],
+                                         'transcripts.sqlite3')
+        max_size_mb = max_size_mb or CACHE_CONFIG['max_size_mb']
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._local = threading.local()
+
+    def make_key(self, content_hash: str, engine: str, model_size: str,
+                 language: str) -> str:
+        """
+        Build the cache key for a transcription request
+
+        Args:
+            content_hash: Output of hash_audio()
+            engine: ASR engine name
+            model_size: ASR model name
+            language: Transcription language
+
+        Returns:
+            Cache key
+        """
+        return f"{content_hash}:{engine}:{model_size}:{language}"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a transcript and mark it as recently used
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached transcript, or None on a miss
+        """
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT transcript FROM transcripts WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        with conn:
+            conn.execute(
+                "UPDATE transcripts SET last_access = ? WHERE key = ?",
+                (time.time(), key)
+            )
+        return row[0]
+
+    def put(self, key: str, transcript: str) -> None:
+        """
+        Store a transcript, evicting least recently used entries if needed
+
+        Args:
+            key: Cache key
+            transcript: Transcribed text
+        """
+        conn = self._connect()
+        now = time.time()
+        size = len(transcript.encode('utf-8')) + len(key)
+
+        # BEGIN IMMEDIATE serializes writers across threads and processes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO transcripts "
+                "(key, transcript, size, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, transcript, size, now, now)
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def size_bytes(self) -> int:
+        """
+        Get the total size of stored transcripts
+
+        Returns:
+            Size in bytes
+        """
+        row = self._connect().execute(
+            "SELECT COALESCE(SUM(size), 0) FROM transcripts"
+        ).fetchone()
+        return row[0]
+
+    def clear(self) -> None:
+        """Delete every cached transcript"""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM transcripts")
+
+    def close(self) -> None:
+        """Close this thread's database connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __len__(self) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM transcripts"
+        ).fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Drop least recently used entries until under the size limit
+
+        Args:
+            conn: Connection with an open write transaction
+        """
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM transcripts"
+        ).fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        excess = total - self.max_size_bytes
+        freed = 0
+        stale = []
+        for key, size in conn.execute(
+                "SELECT key, size FROM transcripts ORDER BY last_access"):
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM transcripts WHERE key = ?", stale)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get this thread's connection, opening it on first use
+
+        Returns:
+            SQLite connection
+        """
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not be shared across a fork
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+
+_CACHE: Optional[TranscriptCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_transcript_cache() -> Optional[TranscriptCache]:
+    """
+    Get the process-wide transcript cache
+
+    Returns:
+        Shared TranscriptCache, or None if caching is disabled
+    """
+    global _CACHE
+    if not CACHE_CONFIG['transcript_cache']:
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = TranscriptCache()
+    return _CACHE
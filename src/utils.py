@@ -5,10 +5,29 @@ Utility functions for Grammar Scoring Engine
 import os
 import json
 import logging
-import pandas as pd
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, Iterable, Any, Optional, Union
 from datetime import datetime
-import numpy as np
+
+try:
+    from src.aggregation import SCORE_FIELDS, ScoreAggregator
+    from src.reporting import (DETAILED_REPORT_COLUMNS, REPORT_COLUMNS,
+                               build_report, iter_result_chunks)
+    from src.result_model import as_dict
+    from src.results_store import ResultsStore, is_results_store
+    from src.run_manifest import read_jsonl
+except ImportError:
+    from aggregation import SCORE_FIELDS, ScoreAggregator
+    from reporting import (DETAILED_REPORT_COLUMNS, REPORT_COLUMNS,
+                           build_report, iter_result_chunks)
+    from result_model import as_dict
+    from results_store import ResultsStore, is_results_store
+    from run_manifest import read_jsonl
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def setup_logging(log_level: str = 'INFO', log_file: str = None) -> logging.Logger:
     """
     Setup logging configuration
     
@@ -22,6 +41,10 @@ import numpy as np
     logger = logging.getLogger(__name__)
     logger.setLevel(getattr(logging, log_level))
     
+    # Already configured by an earlier call (e.g. once per scored file)
+    if logger.handlers:
+        return logger
+    
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
@@ -56,17 +79,24 @@ def save_results(results: Dict[str, Any], output_path: str, format: str = 'json'
     Save results to file
     
     Args:
-        results: Results dictionary
+        results: Results dictionary or ScoringResult, or a list of them
         output_path: Output file path
         format: 'json' or 'csv'
     """
     ensure_directory(os.path.dirname(output_path))
     
+    if isinstance(results, list):
+        results = [as_dict(result) for result in results]
+    else:
+        results = as_dict(results)
+    
     if format == 'json':
         with open(output_path, 'w') as f:
             json.dump(results, f, indent=2, default=str)
     
     elif format == 'csv':
+        import pandas as pd
+        
         # Flatten results for CSV
         if isinstance(results, list):
             df = pd.DataFrame(results)
@@ -78,21 +108,34 @@ def save_results(results: Dict[str, Any], output_path: str, format: str = 'json'
     print(f"Results saved to {output_path}")
 
 
-def load_results(input_path: str) -> Dict[str, Any]:
+def load_results(input_path: str, chunksize: int = None) -> Any:
     """
     Load results from file
     
     Args:
-        input_path: Input file path
+        input_path: Input file path, or a results store directory
+        chunksize: Results per chunk; if given, an iterator of result
+                   lists is returned instead of loading the whole file
         
     Returns:
-        Results dictionary
+        Results dictionary (list of results for CSV, JSONL and stores),
+        or an iterator of result lists when chunksize is given
     """
-    if input_path.endswith('.json'):
+    if chunksize:
+        return iter_result_chunks(input_path, chunksize)
+    
+    if is_results_store(input_path):
+        return list(ResultsStore(input_path).iter_results())
+    
+    elif input_path.endswith('.jsonl'):
+        return list(read_jsonl(input_path))
+    
+    elif input_path.endswith('.json'):
         with open(input_path, 'r') as f:
             return json.load(f)
     
     elif input_path.endswith('.csv'):
+        import pandas as pd
         df = pd.read_csv(input_path)
         return df.to_dict('records')
     
@@ -100,37 +143,43 @@ def load_results(input_path: str) -> Dict[str, Any]:
         raise ValueError("Unsupported file format")
 
 
-def create_report(results: List[Dict], output_path: str = None) -> pd.DataFrame:
+def _open_store(results: Any) -> Optional[ResultsStore]:
+    """
+    Get the store behind results given as a ResultsStore or store directory
+    
+    Args:
+        results: List of result dictionaries, ResultsStore or store path
+        
+    Returns:
+        ResultsStore, or None if results is a list
+    """
+    if isinstance(results, ResultsStore):
+        return results
+    if isinstance(results, str) and is_results_store(results):
+        return ResultsStore(results)
+    return None
+
+
+def create_report(results: Union[Iterable[Dict], ResultsStore, str],
+                  output_path: str = None, chunksize: int = None) -> 'pd.DataFrame':
     """
     Create a report from multiple results
     
+    Results are flattened column-wise a chunk at a time; a results store
+    (or its directory) only has the report columns read.
+    
     Args:
-        results: List of result dictionaries
-        output_path: Optional output file path
+        results: Result dictionaries (list or any iterable), a results
+                 store, or a results file path (JSONL, JSON or CSV)
+        output_path: Optional output file path (.csv or .parquet)
+        chunksize: Results per chunk (None = RESULTS_CONFIG)
         
     Returns:
         Pandas DataFrame with results
     """
-    report_data = []
-    
-    for result in results:
-        row = {
-            'audio_file': result.get('audio_file', ''),
-            'grammar_score': result.get('final_score', 0),
-            'grammar_component': result.get('components', {}).get('grammar', 0),
-            'fluency_component': result.get('components', {}).get('fluency', 0),
-            'clarity_component': result.get('components', {}).get('clarity', 0),
-            'complexity_component': result.get('components', {}).get('complexity', 0),
-            'total_errors': result.get('errors', {}).get('total_errors', 0),
-            'total_words': result.get('statistics', {}).get('total_words', 0),
-        }
-        report_data.append(row)
-    
-    df = pd.DataFrame(report_data)
+    df = build_report(results, output_path, REPORT_COLUMNS, chunksize)
     
     if output_path:
-        ensure_directory(os.path.dirname(output_path))
-        df.to_csv(output_path, index=False)
         print(f"Report saved to {output_path}")
     
     return df
@@ -150,76 +199,100 @@ class ResultsProcessor:
     """Process and analyze results"""
     
     @staticmethod
-    def aggregate_scores(results: List[Dict]) -> Dict[str, Any]:
+    def aggregator(results: Union[Iterable[Dict], ResultsStore, str],
+                   bins: int = None) -> ScoreAggregator:
+        """
+        Aggregate results in one streaming pass
+        
+        Args:
+            results: Result dictionaries (list or any iterable, e.g.
+                     read_jsonl()), or a results store
+            bins: Histogram bins per score (None = AGGREGATION_CONFIG)
+            
+        Returns:
+            ScoreAggregator; partial aggregators can be merged
+        """
+        aggregator = ScoreAggregator(bins)
+        store = _open_store(results)
+        if store is None:
+            return aggregator.update_many(results)
+        
+        # Read the score columns batch by batch
+        columns = {'final_score': 'final_score'}
+        columns.update({name: f'components.{name}' for name in SCORE_FIELDS[1:]})
+        for batch in store.iter_batches(list(columns.values())):
+            aggregator.update_arrays({
+                name: batch.column(index).to_numpy(zero_copy_only=False)
+                for index, name in enumerate(columns)
+            })
+        return aggregator
+    
+    @staticmethod
+    def aggregate_scores(results: Union[Iterable[Dict], ResultsStore, str]) -> Dict[str, Any]:
         """
         Aggregate scores across multiple results
         
+        Memory stays constant however many results there are; the median
+        comes from a quantile sketch and is approximate for large inputs.
+        
         Args:
-            results: List of result dictionaries
+            results: Result dictionaries (list or any iterable), or a results store
             
         Returns:
-            Aggregated statistics
+            Aggregated statistics, with per-component summaries
         """
-        scores = [r.get('final_score', 0) for r in results]
+        summary = ResultsProcessor.aggregator(results).summary()
+        final = summary.pop('final_score')
         
         return {
-            'mean_score': np.mean(scores),
-            'std_score': np.std(scores),
-            'min_score': np.min(scores),
-            'max_score': np.max(scores),
-            'median_score': np.median(scores),
-            'total_samples': len(scores),
+            'mean_score': final['mean'],
+            'std_score': final['std'],
+            'min_score': final['min'],
+            'max_score': final['max'],
+            'median_score': final['median'],
+            'total_samples': final['count'],
+            'components': summary,
         }
     
     @staticmethod
-    def score_distribution(results: List[Dict], bins: int = 5) -> Dict:
+    def score_distribution(results: Union[Iterable[Dict], ResultsStore, str],
+                           bins: int = 5) -> Dict:
         """
         Get distribution of scores
         
+        Bins are fixed, equal-width intervals over the score range
+        (SCORING_CONFIG min_score to max_score), so distributions of
+        different batches line up and can be added.
+        
         Args:
-            results: List of result dictionaries
+            results: Result dictionaries (list or any iterable), or a results store
             bins: Number of bins for histogram
             
         Returns:
             Distribution dictionary
         """
-        scores = [r.get('final_score', 0) for r in results]
-        hist, bin_edges = np.histogram(scores, bins=bins)
-        
-        return {
-            'histogram': hist.tolist(),
-            'bin_edges': bin_edges.tolist(),
-            'distribution': dict(zip(range(len(hist)), hist.tolist()))
-        }
+        distribution = ResultsProcessor.aggregator(results, bins).histogram('final_score')
+        hist = distribution['histogram']
+        distribution['distribution'] = dict(zip(range(len(hist)), hist))
+        return distribution
     
     @staticmethod
-    def export_detailed_report(results: List[Dict], output_path: str) -> None:
+    def export_detailed_report(results: Union[Iterable[Dict], ResultsStore, str],
+                               output_path: str, chunksize: int = None) -> None:
         """
         Export detailed results with all components
         
+        The report is written a chunk at a time, so memory is bounded by
+        chunksize rather than the number of results.
+        
         Args:
-            results: List of result dictionaries
-            output_path: Output file path
+            results: Result dictionaries (list or any iterable), a results
+                     store, or a results file path (JSONL, JSON or CSV)
+            output_path: Output file path (.csv or .parquet)
+            chunksize: Results per chunk (None = RESULTS_CONFIG)
         """
-        ensure_directory(os.path.dirname(output_path))
-        
-        detailed_data = []
-        for result in results:
-            detailed_data.append({
-                'audio_file': result.get('audio_file', ''),
-                'final_score': result.get('final_score', 0),
-                'grammar_score': result.get('components', {}).get('grammar', 0),
-                'fluency_score': result.get('components', {}).get('fluency', 0),
-                'clarity_score': result.get('components', {}).get('clarity', 0),
-                'complexity_score': result.get('components', {}).get('complexity', 0),
-                'total_errors': result.get('errors', {}).get('total_errors', 0),
-                'total_words': result.get('statistics', {}).get('total_words', 0),
-                'total_sentences': result.get('statistics', {}).get('total_sentences', 0),
-                'transcript': result.get('transcript', ''),
-            })
-        
-        df = pd.DataFrame(detailed_data)
-        df.to_csv(output_path, index=False)
+        build_report(results, output_path, DETAILED_REPORT_COLUMNS, chunksize,
+                     return_frame=False)
         print(f"Detailed report saved to {output_path}")
 
 
@@ -0,0 +1,54 @@
+"""AsyncScorer timeouts"""
+
+import asyncio
+import time
+
+from src.async_api import AsyncScorer
+
+
+class SlowPipeline:
+    """Pipeline stand-in whose stages each take a fixed time"""
+
+    def __init__(self, stage_seconds: float):
+        self.stage_seconds = stage_seconds
+
+    def decode(self, audio_path):
+        time.sleep(self.stage_seconds)
+        return {'audio_file': audio_path}
+
+    def transcribe(self, item):
+        time.sleep(self.stage_seconds)
+        return item
+
+    def score(self, item, output_dir=None):
+        time.sleep(self.stage_seconds)
+        return {'audio_file': item['audio_file'], 'final_score': 50.0}
+
+
+def _score_many(scorer, paths, timeout):
+    async def run():
+        try:
+            return await scorer.score_many(paths, timeout=timeout,
+                                           return_exceptions=True)
+        finally:
+            scorer.close()
+    return asyncio.run(run())
+
+
+def test_queue_time_does_not_count_against_timeout():
+    # Each file takes ~0.15 s; the fourth waits ~0.45 s for its slot
+    scorer = AsyncScorer(SlowPipeline(0.05), max_concurrency=1, use_processes=False)
+    paths = [f'clip{index}.wav' for index in range(4)]
+
+    results = _score_many(scorer, paths, timeout=0.4)
+
+    assert [result['audio_file'] for result in results] == paths
+
+
+def test_slow_file_still_times_out():
+    scorer = AsyncScorer(SlowPipeline(0.2), max_concurrency=2, use_processes=False)
+
+    results = _score_many(scorer, ['slow.wav'], timeout=0.1)
+
+    assert isinstance(results[0], asyncio.TimeoutError)
+
@@ -0,0 +1,17 @@
+"""Import-time budget of the package and its entry points"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'benchmarks'))
+
+from check_import_time import BUDGETS_MS, check  # noqa: E402
+
+
+@pytest.mark.parametrize('module', sorted(BUDGETS_MS))
+def test_import_within_budget(module):
+    scale = float(os.environ.get('IMPORT_TIME_SCALE', '1.0'))
+    assert check({module: BUDGETS_MS[module]}, scale) == []
@@ -0,0 +1,91 @@
+"""IncrementalGrammarScorer running state"""
+
+import pytest
+
+from src.grammar_scorer import GrammarScorer, IncrementalGrammarScorer
+from src.text_processor import TextProcessor
+
+SENTENCES = [
+    "he go to the school.",
+    "I has a apple and a orange.",
+    "they was here yesterday, um, you know.",
+    "This is fine.",
+    "me and him goes there.",
+]
+
+
+@pytest.mark.parametrize('mode', ['full', 'compact', 'none'])
+def test_pending_text_scores_like_appended_text(mode):
+    provisional = IncrementalGrammarScorer(GrammarScorer(error_positions=mode))
+
+    for index, sentence in enumerate(SENTENCES):
+        pending = SENTENCES[(index + 1) % len(SENTENCES)]
+        provisional.append(sentence)
+
+        committed = IncrementalGrammarScorer(GrammarScorer(error_positions=mode))
+        for text in SENTENCES[:index + 1] + [pending]:
+            committed.append(text)
+
+        assert provisional.score(20.0, 2, pending_text=pending) == committed.score(20.0, 2)
+
+
+def test_full_positions_point_into_transcript():
+    scorer = IncrementalGrammarScorer(GrammarScorer(error_positions='full'))
+    for sentence in SENTENCES:
+        scorer.append(sentence)
+    pending = "she go home."
+    result = scorer.score(20.0, 2, pending_text=pending)
+
+    transcript = f'{scorer.text} {pending}'
+    positions = result['errors']['error_positions']
+    assert positions
+    assert sum(result['errors']['error_types'].values()) == len(positions)
+    for entry in positions:
+        assert transcript[entry['position']:].startswith(entry['text'])
+
+
+def test_earlier_results_are_not_changed_by_later_updates():
+    scorer = IncrementalGrammarScorer(GrammarScorer(error_positions='compact'))
+    scorer.append(SENTENCES[0])
+    first = scorer.score(10.0, 1, pending_text=SENTENCES[1])
+    snapshot = repr(first)
+
+    for sentence in SENTENCES[1:]:
+        scorer.append(sentence)
+        scorer.score(10.0, 1, pending_text=SENTENCES[0])
+
+    assert repr(first) == snapshot
+
+
+def test_final_score_matches_score_grammar():
+    text_processor = TextProcessor()
+    scorer = GrammarScorer()
+    pieces = [
+        "I don't think it's right.",
+        "We can't go, isn't it?",
+        'The results, which were "surprising", came in late; nobody expected them!',
+        "Um, so I was like going there... and then (you know) we left.",
+    ]
+    transcript = ' '.join(pieces)
+
+    incremental = IncrementalGrammarScorer(scorer)
+    for piece in pieces:
+        incremental.append(piece, text_processor.preprocess_text(piece)['document'])
+
+    text_data = text_processor.preprocess_text(transcript)
+    assert incremental.score(30.0, 4) == scorer.score_grammar(
+        transcript, 30.0, 4, text_data['pos_tags'],
+        document=text_data['transcript_document'])
+
+
+def test_positions_can_be_left_out():
+    scorer = IncrementalGrammarScorer(GrammarScorer(error_positions='full'))
+    for sentence in SENTENCES:
+        scorer.append(sentence)
+
+    result = scorer.score(20.0, 2, pending_text="she go home.", positions=False)
+    full = scorer.score(20.0, 2, pending_text="she go home.")
+
+    assert 'error_positions' not in result['errors']
+    del full['errors']['error_positions']
+    assert result == full
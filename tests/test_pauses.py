@@ -0,0 +1,99 @@
+"""The mel-spectrogram pause detector and the RMS detector checked against it"""
+
+import librosa
+import numpy as np
+import pytest
+
+from src.audio_processor import AudioProcessor, StreamingAudioStats
+
+SR = 16000
+HOP_SECONDS = 512 / SR
+
+
+def _clip(kind: str, seed: int, seconds: float = 8.0, noise_db: float = -80.0):
+    """Bursts of harmonic tone or white noise separated by quiet gaps"""
+    rng = np.random.default_rng(seed)
+    n = int(SR * seconds)
+    audio = np.zeros(n, dtype=np.float32)
+    t = int(0.3 * SR)
+    while t < n:
+        length = min(int(rng.uniform(0.4, 1.2) * SR), n - t)
+        times = np.arange(length) / SR
+        if kind == 'tonal':
+            f0 = rng.uniform(100, 220)
+            burst = sum(np.sin(2 * np.pi * f0 * k * times) / k for k in range(1, 20))
+        else:
+            burst = rng.standard_normal(length)
+        audio[t:t + length] = burst * rng.uniform(0.3, 1.0)
+        t += length + int(rng.uniform(0.3, 0.8) * SR)
+    audio += 10 ** (noise_db / 20) * rng.standard_normal(n)
+    return (audio / np.abs(audio).max()).astype(np.float32)
+
+
+def _assert_same_pauses(rms, mel):
+    assert rms['pause_count'] == mel['pause_count']
+    np.testing.assert_allclose(rms['pause_positions'], mel['pause_positions'],
+                               atol=HOP_SECONDS + 1e-9)
+    np.testing.assert_allclose(rms['pause_durations'], mel['pause_durations'],
+                               atol=2 * HOP_SECONDS + 1e-9)
+
+
+def _baseline_mel_pause_count(audio):
+    """Pause count of the original mel detector: mean band dB per frame"""
+    mel = librosa.feature.melspectrogram(y=audio, sr=SR, n_fft=2048,
+                                         hop_length=512, n_mels=128)
+    silent = np.mean(librosa.power_to_db(mel, ref=np.max), axis=0) < -40
+    return int(np.sum(np.diff(silent.astype(int)) == 1))
+
+
+@pytest.mark.parametrize('kind', ['tonal', 'noise'])
+@pytest.mark.parametrize('seed', range(4))
+def test_mel_detector_matches_baseline(kind, seed):
+    processor = AudioProcessor(SR)
+    audio = _clip(kind, seed)
+
+    expected = _baseline_mel_pause_count(audio)
+    assert processor.analyze(audio, SR).detect_pauses()['pause_count'] == expected
+    assert processor.get_pause_count(audio, SR, detector='mel') == expected
+
+
+@pytest.mark.parametrize('noise_db', [-80.0, -60.0])
+@pytest.mark.parametrize('seed', range(4))
+def test_rms_detector_matches_mel_on_broadband_audio(noise_db, seed):
+    processor = AudioProcessor(SR)
+    audio = _clip('noise', seed, noise_db=noise_db)
+
+    rms = processor.detect_pauses(audio, SR)
+    mel = processor.analyze(audio, SR).detect_pauses()
+
+    assert rms['pause_count'] >= 3
+    _assert_same_pauses(rms, mel)
+    assert (processor.get_pause_count(audio, SR, detector='rms')
+            == _baseline_mel_pause_count(audio))
+
+
+@pytest.mark.parametrize('audio', [
+    np.zeros(SR * 2, dtype=np.float32),
+    (1e-3 * np.random.default_rng(0).standard_normal(SR * 2)).astype(np.float32),
+], ids=['digital-silence', 'noise-floor'])
+def test_silent_clips_have_no_pauses(audio):
+    processor = AudioProcessor(SR)
+    rms = processor.detect_pauses(audio, SR)
+    mel = processor.analyze(audio, SR).detect_pauses()
+    assert rms['pause_count'] == mel['pause_count'] == 0
+
+
+@pytest.mark.parametrize('detector', ['rms', 'mel'])
+def test_streaming_and_batch_match_in_memory(detector):
+    processor = AudioProcessor(SR)
+    clips = [_clip('tonal', 10), _clip('noise', 11, seconds=5.0)]
+
+    batch = processor.extract_features_batch(clips, SR, detector=detector)
+    for index, audio in enumerate(clips):
+        expected = processor.get_pause_count(audio, SR, detector=detector)
+
+        stats = StreamingAudioStats(SR)
+        for start in range(0, len(audio), 3000):
+            stats.update(audio[start:start + 3000])
+        assert stats.finalize(detector=detector)['pause_count'] == expected
+        assert batch['pause_count'][index] == expected
@@ -0,0 +1,86 @@
+"""Report building from result lists and JSONL logs"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.reporting import DETAILED_REPORT_COLUMNS, REPORT_COLUMNS, build_report, flatten_results
+
+
+def _result(index, **overrides):
+    result = {
+        'audio_file': f'clip{index}.wav',
+        'transcript': f'transcript {index}',
+        'final_score': index + 0.5,
+        'components': {'grammar': 1.0, 'complexity': 2.0, 'fluency': 3.0, 'clarity': 4.0},
+        'errors': {'total_errors': index % 3, 'error_types': {},
+                   'error_positions': [{'rule': 'r', 'position': 0, 'text': 'x'}]},
+        'statistics': {'total_words': index * 2, 'total_sentences': 1,
+                       'avg_sentence_length': 2.0},
+        'content_hash': f'hash{index}',
+    }
+    result.update(overrides)
+    return result
+
+
+def _write_jsonl(path, records, torn_tail=''):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+        f.write(torn_tail)
+    return str(path)
+
+
+def test_none_values_get_column_defaults():
+    results = [
+        _result(0),
+        _result(1, audio_file=None, final_score=None,
+                errors={'total_errors': None}, statistics=None),
+        {},
+    ]
+    frame = flatten_results(results, DETAILED_REPORT_COLUMNS)
+
+    assert frame['audio_file'].tolist() == ['clip0.wav', '', '']
+    assert frame['final_score'].tolist() == [0.5, 0.0, 0.0]
+    assert frame['total_errors'].tolist() == [0, 0, 0]
+    assert frame['total_words'].tolist() == [0, 0, 0]
+    assert frame['total_errors'].dtype == np.int64
+
+
+@pytest.mark.parametrize('columns', [REPORT_COLUMNS, DETAILED_REPORT_COLUMNS])
+def test_jsonl_report_matches_list_report(tmp_path, columns):
+    results = [_result(index) for index in range(50)]
+    results[7] = _result(7, final_score=None, statistics={'total_words': None})
+    path = _write_jsonl(tmp_path / 'results.jsonl', results)
+
+    expected = build_report(results, columns=columns)
+    report = build_report(path, columns=columns, chunksize=8)
+
+    assert report.equals(expected)
+
+
+def test_jsonl_report_keeps_last_record_and_skips_torn_line(tmp_path):
+    records = [_result(index) for index in range(5)]
+    records.insert(3, _result(1, final_score=99.0))
+    path = _write_jsonl(tmp_path / 'results.jsonl', records,
+                        torn_tail='{"audio_file": "torn.wav", "final_')
+
+    report = build_report(path)
+
+    assert report['audio_file'].tolist() == ['clip0.wav', 'clip2.wav', 'clip1.wav',
+                                             'clip3.wav', 'clip4.wav']
+    assert report['grammar_score'].tolist() == [0.5, 2.5, 99.0, 3.5, 4.5]
+
+
+def test_jsonl_report_falls_back_on_types_arrow_rejects(tmp_path):
+    # Large enough that pyarrow parses it in several blocks, so the bad
+    # record is met after earlier chunks were already yielded
+    results = [_result(index) for index in range(12000)]
+    results[11000]['errors']['total_errors'] = 2.0
+    path = _write_jsonl(tmp_path / 'results.jsonl', results)
+
+    report = build_report(path, chunksize=1000)
+
+    assert report.equals(build_report(results))
+    assert report['total_errors'].tolist() == [index % 3 for index in range(12000)]
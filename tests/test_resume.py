@@ -0,0 +1,125 @@
+"""Batch runs killed mid-way resume with a complete results store"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scores files without audio models and, if KILL_AFTER is set, SIGKILLs the
+# process once that many files are scored (no finally blocks run)
+RUNNER = textwrap.dedent('''
+    import os
+    import signal
+    import sys
+
+    sys.path.insert(0, {root!r})
+    import inference
+    import config
+    import src.config
+    from result_model import ScoringResult
+
+    # Modules load the config both as config and as src.config
+    for module in (config, src.config):
+        module.RUN_CONFIG['fsync_every'] = 4
+        module.RESULTS_CONFIG['per_file_json'] = False
+    kill_after = int(os.environ.get('KILL_AFTER', 0))
+    scored = []
+
+    class Pipeline:
+        def warm_up(self):
+            pass
+
+    def score_audio_file(audio_path, output_dir=None, pipeline=None):
+        if kill_after and len(scored) == kill_after:
+            os.kill(os.getpid(), signal.SIGKILL)
+        scored.append(audio_path)
+        name = os.path.basename(audio_path)
+        return ScoringResult.from_dict({{'audio_file': name,
+                                         'final_score': float(name[5:8])}})
+
+    inference.batch_pipeline = lambda logger=None: Pipeline()
+    inference.score_audio_file = score_audio_file
+    inference.score_multiple_files(sys.argv[1], sys.argv[2], workers=1,
+                                   resume=sys.argv[3] == 'resume')
+    print(len(scored))
+''').format(root=REPO_ROOT)
+
+
+def _run(audio_dir, output_dir, mode, kill_after=0):
+    env = dict(os.environ, KILL_AFTER=str(kill_after))
+    return subprocess.run([sys.executable, '-c', RUNNER, str(audio_dir), str(output_dir), mode],
+                          capture_output=True, text=True, env=env, cwd=REPO_ROOT)
+
+
+def _store_scores(output_dir):
+    from src.results_store import ResultsStore
+    store = ResultsStore(os.path.join(output_dir, 'results_store'))
+    return sorted(store.read(['final_score'])['final_score'].tolist())
+
+
+@pytest.fixture
+def audio_dir(tmp_path):
+    directory = tmp_path / 'audio'
+    directory.mkdir()
+    for index in range(30):
+        (directory / f'clip-{index:03d}.wav').write_bytes(b'RIFF' + bytes([index]) * 64)
+    return directory
+
+
+def test_killed_run_resumes_with_every_row(audio_dir, tmp_path):
+    output_dir = tmp_path / 'results'
+
+    killed = _run(audio_dir, output_dir, 'resume', kill_after=13)
+    assert killed.returncode != 0
+    # Files were marked done, but no store part was published
+    assert _store_scores(output_dir) == []
+
+    resumed = _run(audio_dir, output_dir, 'resume')
+    assert resumed.returncode == 0, resumed.stderr
+    assert int(resumed.stdout.split()[-1]) < 30
+
+    assert _store_scores(output_dir) == [float(index) for index in range(30)]
+
+
+def test_resumed_run_keeps_published_parts(audio_dir, tmp_path):
+    output_dir = tmp_path / 'results'
+    assert _run(audio_dir, output_dir, 'resume').returncode == 0
+    parts = sorted(os.listdir(output_dir / 'results_store'))
+
+    # Appending only the missing rows leaves earlier parts untouched
+    (audio_dir / 'clip-030.wav').write_bytes(b'RIFF' + bytes([30]) * 64)
+    resumed = _run(audio_dir, output_dir, 'resume')
+    assert resumed.returncode == 0, resumed.stderr
+    assert int(resumed.stdout.split()[-1]) == 1
+
+    assert set(parts) < set(os.listdir(output_dir / 'results_store'))
+    assert _store_scores(output_dir) == [float(index) for index in range(31)]
+
+
+def test_duplicate_content_is_scored_once_and_logged(audio_dir, tmp_path):
+    output_dir = tmp_path / 'results'
+    (audio_dir / 'clip-100.wav').write_bytes((audio_dir / 'clip-007.wav').read_bytes())
+
+    result = _run(audio_dir, output_dir, 'resume')
+    assert result.returncode == 0, result.stderr
+    assert int(result.stdout.split()[-1]) == 30
+
+    assert 'clip-100.wav: same content as' in result.stdout + result.stderr
+    assert _store_scores(output_dir) == [float(index) for index in range(30)]
+
+
+def test_fresh_run_replaces_the_store(audio_dir, tmp_path):
+    output_dir = tmp_path / 'results'
+    assert _run(audio_dir, output_dir, 'resume').returncode == 0
+
+    fresh = _run(audio_dir, output_dir, 'fresh')
+    assert fresh.returncode == 0, fresh.stderr
+    assert int(fresh.stdout.split()[-1]) == 30
+
+    assert _store_scores(output_dir) == [float(index) for index in range(30)]
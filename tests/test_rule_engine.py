@@ -0,0 +1,48 @@
+"""RuleEngine.scan against plain re.finditer"""
+
+import re
+
+import pytest
+
+from src.grammar_scorer import GRAMMAR_RULES
+from src.rule_engine import RuleEngine, extract_keywords
+
+PATTERNS = [
+    r'\b(the)\s*\w+',
+    r'\b(a|an)\s?apple',
+    r"\b(is|are)\b|\bain'?t\b",
+    r'\b(so)\s{0,2}\w+',
+    r'\b(a|an)\s+\w+',
+    r'\b(he|she)\s(go|have)\b',
+] + [rule['pattern'] for rule in GRAMMAR_RULES.values()]
+
+TEXTS = [
+    "thecat sat on the mat and then the  dog ran",
+    "an apple, a apple, anapple and aapple",
+    "they is here, we are there and it ain't so, aint it",
+    "so   much, so\tgood, sofa and also so",
+    "She go home. he have two cat. Shego away",
+    "",
+]
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_scan_matches_finditer(pattern):
+    engine = RuleEngine()
+    engine.register('rule', pattern)
+
+    for text in TEXTS:
+        scan = engine.scan(text)
+        expected = [(match.start(), match.end())
+                    for match in re.finditer(pattern, text, re.IGNORECASE)]
+        assert list(zip(scan.starts[0], scan.ends[0])) == expected, text
+
+
+@pytest.mark.parametrize('pattern', [
+    r'\b(the)\s*\w+',
+    r'\b(a|an)\s?apple',
+    r'\b(so)\s{0,2}\w+',
+    r"\b(is|are)\b|\bain'?t\b",
+])
+def test_optional_space_or_alternation_is_not_keyword_dispatched(pattern):
+    assert extract_keywords(pattern) is None
@@ -0,0 +1,92 @@
+"""score_grammar gives the pre-refactor scores when handed a shared document"""
+
+import pytest
+
+from src import document as document_module
+from src import grammar_scorer
+from src.document import analyze_text
+from src.grammar_scorer import GrammarScorer
+from src.pipeline import ScoringPipeline
+from src.text_processor import TextProcessor
+
+
+# (transcript, final_score, total_words, total_sentences, avg_sentence_length)
+# as scored by the code before documents were shared, with duration 12.0 s
+# and 3 pauses
+BASELINE = [
+    ("I don't think it's right. We can't go, isn't it? Dr. Smith's dog barks.",
+     20.33, 24, 4, 6.0),
+    ("She go to school every day and he have two cat.",
+     18.42, 12, 1, 12.0),
+    ('The results, which were "surprising", came in late; nobody expected them!',
+     23.42, 17, 1, 17.0),
+    ("  Um,  so   I was like   going there... and then (you know) we left.  ",
+     25.42, 18, 1, 18.0),
+]
+
+
+@pytest.fixture(scope='module')
+def text_processor():
+    return TextProcessor()
+
+
+@pytest.fixture(scope='module')
+def scorer():
+    return GrammarScorer()
+
+
+@pytest.mark.parametrize('text,final_score,words,sentences,avg_length', BASELINE)
+def test_matches_baseline_with_preprocess_document(text_processor, scorer, text,
+                                                   final_score, words, sentences,
+                                                   avg_length):
+    text_data = text_processor.preprocess_text(text)
+    result = scorer.score_grammar(text, 12.0, 3, text_data['pos_tags'],
+                                  document=text_data['transcript_document'])
+
+    assert result['final_score'] == final_score
+    assert result['statistics'] == {
+        'total_words': words,
+        'total_sentences': sentences,
+        'avg_sentence_length': avg_length,
+    }
+    assert result == scorer.score_grammar(text, 12.0, 3, text_data['pos_tags'])
+
+
+def test_document_of_same_text_is_reused(scorer, monkeypatch):
+    text = "she go to school. he have two cat."
+    document = analyze_text(text)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('text was tokenized again')
+
+    monkeypatch.setattr(grammar_scorer, 'analyze_text', fail)
+    result = scorer.score_grammar(text, 5.0, 1, document.pos_tags, document=document)
+
+    assert result['statistics']['total_words'] == document.num_words
+
+
+def test_pipeline_tokenizes_each_text_once(monkeypatch):
+    transcripts = [text for text, *_ in BASELINE]
+    tokenized = []
+    tokenize = document_module._tokenize_document
+
+    def counting_tokenize(text):
+        tokenized.append(text)
+        return tokenize(text)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('score_grammar analyzed the transcript again')
+
+    monkeypatch.setattr(document_module, '_tokenize_document', counting_tokenize)
+    monkeypatch.setattr(grammar_scorer, 'analyze_text', fail)
+    pipeline = ScoringPipeline()
+    items = [{'audio_path': f'/audio/clip{index}.wav', 'transcript': text,
+              'duration': 12.0, 'pause_count': 3}
+             for index, text in enumerate(transcripts)]
+
+    results = [pipeline.score(dict(item)) for item in items]
+    results += pipeline.score_batch([dict(item) for item in items])
+
+    normalized = [pipeline.text_processor._normalize_text(text) for text in transcripts]
+    assert sorted(tokenized) == sorted(2 * (normalized + transcripts))
+    assert [result.final_score for result in results] == 2 * [row[1] for row in BASELINE]
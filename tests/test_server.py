@@ -0,0 +1,82 @@
+"""Scoring server request handling that needs no models"""
+
+import logging
+import socket
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.config import SERVER_CONFIG
+from src.server import ScoringServer
+
+
+@pytest.fixture
+def server():
+    service = SimpleNamespace(draining=False, logger=logging.getLogger(__name__),
+                              health=lambda: {'status': 'ok'})
+    server = ScoringServer(service, '127.0.0.1', 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
+
+
+def _exchange(server, request: bytes) -> bytes:
+    """Send raw bytes on one connection and read until the server closes it"""
+    with socket.create_connection(server.server_address[:2], timeout=5) as sock:
+        sock.sendall(request)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+
+
+def _post(path: str, body: bytes, length: int = None) -> bytes:
+    length = len(body) if length is None else length
+    return (f'POST {path} HTTP/1.1\r\nHost: test\r\n'
+            f'Content-Length: {length}\r\n\r\n').encode() + body
+
+
+# The body is itself a request; a server that kept the connection open
+# without reading the body would answer it as a second request
+SMUGGLED = b'GET /health HTTP/1.1\r\nHost: test\r\n\r\n'
+
+
+def test_unknown_path_closes_connection(server):
+    response = _exchange(server, _post('/nope', SMUGGLED))
+
+    assert response.startswith(b'HTTP/1.1 404')
+    assert b'Connection: close' in response
+    assert response.count(b'HTTP/1.1 ') == 1
+
+
+def test_draining_closes_connection(server):
+    server.service.draining = True
+    response = _exchange(server, _post('/score', SMUGGLED))
+
+    assert response.startswith(b'HTTP/1.1 503')
+    assert response.count(b'HTTP/1.1 ') == 1
+
+
+def test_oversized_upload_closes_connection(server):
+    too_large = SERVER_CONFIG['max_upload_mb'] * 1024 * 1024 + 1
+    response = _exchange(server, _post('/score', SMUGGLED, length=too_large))
+
+    assert response.startswith(b'HTTP/1.1 413')
+    assert response.count(b'HTTP/1.1 ') == 1
+
+
+def test_missing_length_closes_connection(server):
+    response = _exchange(server, _post('/score', SMUGGLED, length=0))
+
+    assert response.startswith(b'HTTP/1.1 411')
+    assert response.count(b'HTTP/1.1 ') == 1
+
+
+def test_file_paths_disabled_by_default():
+    assert SERVER_CONFIG['allow_file_paths'] is False
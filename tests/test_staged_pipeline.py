@@ -0,0 +1,37 @@
+"""Tests for StagedPipeline"""
+
+import threading
+
+from src.staged_pipeline import StagedPipeline
+
+
+def _double(item):
+    return item * 2
+
+
+def test_outputs_keep_input_order():
+    pipeline = StagedPipeline([('a', _double, 2), ('b', _double, 3)], queue_size=2)
+    assert pipeline.run(range(20)) == [item * 4 for item in range(20)]
+
+
+def test_input_error_is_raised_instead_of_hanging():
+    def items():
+        yield 1
+        yield 2
+        raise RuntimeError("listing failed")
+
+    pipeline = StagedPipeline([('a', _double, 2), ('b', _double, 1)])
+    outcome = {}
+
+    def run():
+        try:
+            pipeline.run(items())
+        except RuntimeError as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "run() hung after the input iterator raised"
+    assert str(outcome['error']) == "listing failed"
+    assert pipeline.stats()['a']['processed'] == 2
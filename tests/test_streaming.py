@@ -0,0 +1,48 @@
+"""StreamingSession input handling"""
+
+import numpy as np
+import pytest
+
+from src.pipeline import ScoringPipeline
+from src.streaming import StreamingSession, pcm_to_float
+
+
+@pytest.fixture(scope='module')
+def pipeline():
+    return ScoringPipeline()
+
+
+def _session(pipeline):
+    # Updates never fall due, so no ASR runs while feeding
+    return StreamingSession(16000, pipeline, update_interval=3600)
+
+
+def _fed_samples(session):
+    return np.concatenate(session._pending)
+
+
+def test_odd_length_pcm_chunks_are_reassembled(pipeline):
+    rng = np.random.default_rng(0)
+    pcm = rng.integers(-32768, 32767, 4001, dtype=np.int16).astype('<i2').tobytes()
+    session = _session(pipeline)
+
+    # Chunk sizes that split samples across chunk boundaries
+    offset = 0
+    for size in (1, 3, 2, 7, 1000, 1, 999, 2001, 1):
+        session.feed(pcm[offset:offset + size])
+        offset += size
+    session.feed(pcm[offset:])
+
+    np.testing.assert_array_equal(_fed_samples(session), pcm_to_float(pcm))
+    assert session.stats.n_samples == 4001
+
+
+def test_trailing_half_sample_waits_for_next_chunk(pipeline):
+    pcm = np.array([1000, -2000, 3000], dtype='<i2').tobytes()
+    session = _session(pipeline)
+
+    assert session.feed(pcm[:3]) is None
+    assert session.stats.n_samples == 1
+    session.feed(bytearray(pcm[3:]))
+
+    np.testing.assert_array_equal(_fed_samples(session), pcm_to_float(pcm))
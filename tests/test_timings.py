@@ -0,0 +1,67 @@
+"""Per-file stage timings"""
+
+import json
+import os
+
+import pytest
+
+from src import instrumentation
+from src.config import METRICS_CONFIG
+from src.instrumentation import MetricsSink
+from src.pipeline import ScoringPipeline
+
+
+class FileRecorder(MetricsSink):
+    """Sink keeping the per-file reports"""
+
+    def __init__(self):
+        self.files = []
+
+    def record_stage(self, stage, wall_seconds, cpu_seconds, ok):
+        pass
+
+    def record_file(self, audio_seconds, wall_seconds, real_time_factor):
+        self.files.append(wall_seconds)
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    monkeypatch.setitem(METRICS_CONFIG, 'enabled', True)
+    monkeypatch.setitem(METRICS_CONFIG, 'attach_timings', True)
+    sink = FileRecorder()
+    instrumentation.add_sink(sink)
+    yield sink
+    instrumentation.remove_sink(sink)
+
+
+def _transcribed_item():
+    return {
+        'audio_path': '/audio/clip.wav',
+        'transcript': 'he go to the school every day.',
+        'duration': 4.0,
+        'pause_count': 1,
+        'timings': instrumentation.new_timings(),
+    }
+
+
+def test_save_is_part_of_the_file_timings(metrics, tmp_path):
+    result = ScoringPipeline().score(_transcribed_item(), str(tmp_path))
+
+    stages = result.timings['stages']
+    assert 'save' in stages
+    assert result.timings['wall_s'] == pytest.approx(
+        sum(stage['wall_s'] for stage in stages.values()), abs=1e-5)
+    assert metrics.files == [pytest.approx(result.timings['wall_s'], abs=1e-5)]
+
+    # The saved file has the timings of the stages before its own write
+    with open(os.path.join(tmp_path, 'clip_results.json')) as f:
+        saved = json.load(f)
+    assert 'save' not in saved['timings']['stages']
+    assert 'rules' in saved['timings']['stages']
+
+
+def test_unsaved_result_is_reported_once(metrics):
+    result = ScoringPipeline().score(_transcribed_item())
+
+    assert 'save' not in result.timings['stages']
+    assert len(metrics.files) == 1